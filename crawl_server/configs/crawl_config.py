@@ -53,6 +53,12 @@ def load_crawl_config() -> CrawlConfig:
         VERSION_CHECK_URL=get_env("VERSION_CHECK_URL", "https://raw.githubusercontent.com/sansan0/TrendRadar/refs/heads/master/version"),
         SHOW_VERSION_UPDATE=get_bool_env("SHOW_VERSION_UPDATE", True),
         REQUEST_INTERVAL=get_int_env("REQUEST_INTERVAL", 1000),
+        CRAWL_CONCURRENCY=get_int_env("CRAWL_CONCURRENCY", 4),
+        FETCH_BACKEND=get_env("FETCH_BACKEND", "sync").lower(),
+        FETCH_HTTP2=get_bool_env("FETCH_HTTP2", False),
+        CIRCUIT_FAILURE_THRESHOLD=get_int_env("CIRCUIT_FAILURE_THRESHOLD", 3),
+        CIRCUIT_COOLDOWN_SECONDS=get_int_env("CIRCUIT_COOLDOWN_SECONDS", 600),
+        RETRY_BUDGET_SECONDS=get_int_env("RETRY_BUDGET_SECONDS", 30),
         REPORT_MODE=get_env("REPORT_MODE", "daily"),
         RANK_THRESHOLD=get_int_env("RANK_THRESHOLD", 5),
         SORT_BY_POSITION_FIRST=get_bool_env("SORT_BY_POSITION_FIRST", False),
@@ -70,6 +76,20 @@ def load_crawl_config() -> CrawlConfig:
         PUSH_WINDOW=push_window,
         WEIGHT_CONFIG=weight_config,
         SCHEDULE_MINUTES=get_int_env("SCHEDULE_MINUTES", 15),
+        SCHEDULER_MODE=get_env("SCHEDULER_MODE", "fixed").lower(),
+        SCHEDULER_MIN_MINUTES=get_int_env("SCHEDULER_MIN_MINUTES", 10),
+        SCHEDULER_MAX_MINUTES=get_int_env("SCHEDULER_MAX_MINUTES", 120),
+        SCHEDULER_MAX_REQUESTS_PER_HOUR=get_int_env("SCHEDULER_MAX_REQUESTS_PER_HOUR", 0),
+        PIPELINE_ENABLED=get_bool_env("PIPELINE_ENABLED", False),
+        PIPELINE_QUEUE_SIZE=get_int_env("PIPELINE_QUEUE_SIZE", 4),
+        CRAWL_SHARD_MODE=get_env("CRAWL_SHARD_MODE", "off").lower(),
+        CRAWL_SHARD_DEADLINE_SECONDS=get_int_env("CRAWL_SHARD_DEADLINE_SECONDS", 120),
+        CRAWL_LOCK_ENABLED=get_bool_env("CRAWL_LOCK_ENABLED", True),
+        CRAWL_LOCK_TTL_SECONDS=get_int_env("CRAWL_LOCK_TTL_SECONDS", 600),
+        CRAWL_LOCK_WAIT_SECONDS=get_int_env("CRAWL_LOCK_WAIT_SECONDS", 300),
+        SNAPSHOT_BACKEND=get_env("SNAPSHOT_BACKEND", "txt"),
+        COMPACT_AFTER_DAYS=get_int_env("COMPACT_AFTER_DAYS", 0),
+        HISTORY_DB_ENABLED=get_bool_env("HISTORY_DB_ENABLED", False),
         FEISHU_WEBHOOK_URL=get_env("FEISHU_WEBHOOK_URL", ""),
         DINGTALK_WEBHOOK_URL=get_env("DINGTALK_WEBHOOK_URL", ""),
         WEWORK_WEBHOOK_URL=get_env("WEWORK_WEBHOOK_URL", ""),
@@ -37,6 +37,12 @@ class CrawlConfig:
     VERSION_CHECK_URL: str = "https://raw.githubusercontent.com/sansan0/TrendRadar/refs/heads/master/version"
     SHOW_VERSION_UPDATE: bool = True
     REQUEST_INTERVAL: int = 1000
+    CRAWL_CONCURRENCY: int = 4
+    FETCH_BACKEND: str = "sync"
+    FETCH_HTTP2: bool = False
+    CIRCUIT_FAILURE_THRESHOLD: int = 3
+    CIRCUIT_COOLDOWN_SECONDS: int = 600
+    RETRY_BUDGET_SECONDS: int = 30
     REPORT_MODE: str = "daily"
     RANK_THRESHOLD: int = 5
     SORT_BY_POSITION_FIRST: bool = False
@@ -54,6 +60,20 @@ class CrawlConfig:
     PUSH_WINDOW: PushWindowConfig = field(default_factory=PushWindowConfig)
     WEIGHT_CONFIG: WeightConfig = field(default_factory=WeightConfig)
     SCHEDULE_MINUTES: int = 15
+    SCHEDULER_MODE: str = "fixed"
+    SCHEDULER_MIN_MINUTES: int = 10
+    SCHEDULER_MAX_MINUTES: int = 120
+    SCHEDULER_MAX_REQUESTS_PER_HOUR: int = 0
+    PIPELINE_ENABLED: bool = False
+    PIPELINE_QUEUE_SIZE: int = 4
+    CRAWL_SHARD_MODE: str = "off"
+    CRAWL_SHARD_DEADLINE_SECONDS: int = 120
+    CRAWL_LOCK_ENABLED: bool = True
+    CRAWL_LOCK_TTL_SECONDS: int = 600
+    CRAWL_LOCK_WAIT_SECONDS: int = 300
+    SNAPSHOT_BACKEND: str = "txt"
+    COMPACT_AFTER_DAYS: int = 0
+    HISTORY_DB_ENABLED: bool = False
     FEISHU_WEBHOOK_URL: str = ""
     DINGTALK_WEBHOOK_URL: str = ""
     WEWORK_WEBHOOK_URL: str = ""
@@ -9,6 +9,10 @@ import logging
 from typing import Optional, NamedTuple
 
 from crawl_server.configs import DatabaseConfig, CrawlConfig
+from crawl_server.core.analyzers.cycle_pipeline import shutdown_cycle_pipeline
+from crawl_server.core.data.async_fetcher import close_async_fetch_engine
+from crawl_server.core.data.compaction import shutdown_day_compactor
+from crawl_server.core.data.fetcher import close_http_session
 from crawl_server.resources.postgresql import DatabaseSession
 from crawl_server.resources.redis import RedisClient
 from crawl_server.resources.kafka import (
@@ -22,6 +26,7 @@ from crawl_server.repositories import (
     FrequencyCache,
     FrequencyDatabase,
     CrawlPipeline,
+    CrawlLockCache,
     PlatformCache,
     PlatformDatabase,
     CrawlResultDatabase,
@@ -120,10 +125,16 @@ def init_connections(db_config: DatabaseConfig, crawl_config: CrawlConfig) -> Co
         database_repo=platform_database_repo,
     )
     
+    crawl_lock_repo = CrawlLockCache(
+        redis_client=redis_client,
+        ttl_seconds=crawl_config.CRAWL_LOCK_TTL_SECONDS
+    )
+    
     crawl_service = CrawlService(
         pipeline_repo=pipeline_repo,
         crawl_config=crawl_config,
-        db_config=db_config
+        db_config=db_config,
+        lock_repo=crawl_lock_repo
     )
     
     # Data Repositories
@@ -210,6 +221,12 @@ def cleanup_connections(connections: Connections):
     """
     logger.info("🧹 正在清理连接...")
     
+    # 停止分片合并（不再产生新的处理任务），再排空抓取流水线，保证已抓取的数据完成落盘和发送
+    if connections.crawl_controller:
+        connections.crawl_controller.crawl_service.close()
+    shutdown_cycle_pipeline()
+    shutdown_day_compactor()
+    
     if connections.kafka_consumer:
         connections.kafka_consumer.stop()
     
@@ -219,5 +236,8 @@ def cleanup_connections(connections: Connections):
     if connections.db_session:
         connections.db_session.close()
     
+    close_async_fetch_engine()
+    close_http_session()
+    
     logger.info("✅ 所有连接已清理")
 
@@ -6,8 +6,13 @@
 处理抓取相关的事件
 """
 import logging
-from typing import Dict, Any, Optional
-from crawl_server.resources.kafka.events import OperationCrawlEvent
+from typing import Dict, Any, List, Optional
+from crawl_server.resources.kafka.events import (
+    OperationCrawlEvent,
+    OperationCrawlShardEvent,
+    OperationCrawlShardSessionEvent,
+    DataCrawlShardEvent,
+)
 from crawl_server.services import CrawlService, PlatformService, FrequencyService
 from crawl_server.configs import CrawlConfig, DatabaseConfig
 
@@ -65,7 +70,8 @@ class CrawlController:
     def handle_crawl(
         self,
         trigger: str = "scheduled",
-        count: int = 1
+        count: int = 1,
+        platform_ids: Optional[List[str]] = None,
     ):
         """
         执行抓取任务（定时服务调用）
@@ -73,6 +79,7 @@ class CrawlController:
         Args:
             trigger: 触发来源（manual, scheduled, api）
             count: 抓取次数，默认为1
+            platform_ids: 本次需要请求的平台ID（自适应调度使用，None 表示全部）
         """
         try:
             logger.info(f"🔄 开始执行抓取任务: trigger={trigger}, count={count}")
@@ -90,16 +97,72 @@ class CrawlController:
             word_groups, filter_words = self.frequency_service.get_frequency_words()
             logger.info(f"📝 从数据库加载频率词: {len(word_groups)} 个词组, {len(filter_words)} 个过滤词")
             
-            # 3. 调用 Service 处理业务逻辑，传递已获取的数据
+            # 3. 分片模式：下发各平台任务，由消费组内的副本分担抓取
+            #    （会话可能在任意副本合并，没有共享的上次结果可沿用，因此忽略 platform_ids、每次抓取全部平台）
+            if self.crawl_service.shard_enabled:
+                for _ in range(count):
+                    self.crawl_service.dispatch_shards(
+                        platforms=platforms,
+                        word_groups=word_groups,
+                        filter_words=filter_words,
+                        trigger=trigger,
+                    )
+                return
+            
+            # 4. 调用 Service 处理业务逻辑，传递已获取的数据
             self.crawl_service.execute_crawl(
                 platforms=platforms,
                 word_groups=word_groups,
                 filter_words=filter_words,
                 count=count,
-                trigger=trigger
+                trigger=trigger,
+                fetch_ids=platform_ids,
             )
             
         except Exception as e:
             logger.error(f"❌ 执行抓取任务失败: {e}", exc_info=True)
             raise
 
+    
+    def handle_event_crawl_shard(self, event_data: Dict[str, Any]):
+        """
+        处理 operation.crawl.shard 事件：抓取分配到本副本的单个平台
+        
+        Args:
+            event_data: 事件数据
+        """
+        try:
+            event = OperationCrawlShardEvent.from_dict(event_data)
+            logger.info(f"🧩 收到分片抓取任务: session={event.session_id}, platform={event.platform_id}")
+            self.crawl_service.execute_shard(event)
+        except Exception as e:
+            logger.error(f"❌ 处理 operation.crawl.shard 事件失败: {e}", exc_info=True)
+            raise
+    
+    def handle_event_crawl_shard_session(self, event_data: Dict[str, Any]):
+        """
+        处理 operation.crawl.shard.session 事件：开始合并一个分片抓取会话
+        
+        Args:
+            event_data: 事件数据
+        """
+        try:
+            event = OperationCrawlShardSessionEvent.from_dict(event_data)
+            self.crawl_service.open_shard_session(event)
+        except Exception as e:
+            logger.error(f"❌ 处理 operation.crawl.shard.session 事件失败: {e}", exc_info=True)
+            raise
+    
+    def handle_event_crawl_shard_result(self, event_data: Dict[str, Any]):
+        """
+        处理 data.crawl.shard 事件：记录单个平台的分片结果
+        
+        Args:
+            event_data: 事件数据
+        """
+        try:
+            event = DataCrawlShardEvent.from_dict(event_data)
+            self.crawl_service.add_shard_result(event)
+        except Exception as e:
+            logger.error(f"❌ 处理 data.crawl.shard 事件失败: {e}", exc_info=True)
+            raise
@@ -10,7 +10,8 @@ from .data_loader import DataLoader
 from .pipeline import AnalysisPipeline
 from .notifier import Notifier
 from .report_generator import ReportGenerator
-from .crawler import Crawler
+from .crawler import Crawler, CrawlCycle, new_session_id
+from .cycle_pipeline import CrawlCyclePipeline, get_cycle_pipeline, shutdown_cycle_pipeline
 from .mode_executor import ModeExecutor
 
 __all__ = [
@@ -22,6 +23,11 @@ __all__ = [
     "Notifier",
     "ReportGenerator",
     "Crawler",
+    "CrawlCycle",
+    "new_session_id",
+    "CrawlCyclePipeline",
+    "get_cycle_pipeline",
+    "shutdown_cycle_pipeline",
     "ModeExecutor",
 ]
 
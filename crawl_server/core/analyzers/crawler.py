@@ -4,21 +4,47 @@
 负责执行数据爬取
 """
 import uuid
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
 from crawl_server.configs import DatabaseConfig
-from crawl_server.core.utils import ensure_directory_exists
+from crawl_server.core.data import SnapshotHandle
+from crawl_server.core.utils import ensure_directory_exists, get_keyword_matcher, load_frequency_words
 from crawl_server.core.analyzers.data_loader import DataLoader
 from crawl_server.resources.kafka import send_fetched_data_to_kafka
 
+
+def new_session_id() -> str:
+    """生成抓取会话ID"""
+    return f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+@dataclass
+class CrawlCycle:
+    """一次抓取周期的结果及上下文（在流水线各阶段之间传递）"""
+    session_id: str
+    started_at: str
+    trigger_source: str
+    platforms: List[Dict]
+    results: Dict
+    id_to_name: Dict
+    failed_ids: List
+    word_groups: Optional[List[Dict]] = None
+    filter_words: Optional[List[str]] = None
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    unchanged_ids: List[str] = field(default_factory=list)
+    circuit_states: Dict[str, str] = field(default_factory=dict)
+    snapshot: Optional[SnapshotHandle] = None  # persist() 写入的快照
+
+
 class Crawler:
     """数据抓取器"""
-    
+
     def __init__(self, data_fetcher, request_interval: int, db_config: Optional[DatabaseConfig] = None):
         """
         初始化抓取器
-        
+
         Args:
             data_fetcher: 数据获取器
             request_interval: 请求间隔（毫秒）
@@ -28,34 +54,36 @@ class Crawler:
         self.request_interval = request_interval
         self.db_config = db_config
 
-    def crawl(
-        self, 
+    def fetch(
+        self,
         platforms: Optional[List[Dict]] = None,
         trigger_source: str = "scheduled",
         word_groups: Optional[List[Dict]] = None,
         filter_words: Optional[List[str]] = None,
-    ) -> Tuple[Dict, Dict, List]:
+        fetch_ids: Optional[List[str]] = None,
+    ) -> CrawlCycle:
         """
-        执行数据爬取
-        
+        抓取数据（不落盘、不发送）
+
         Args:
             platforms: 平台列表，格式: [{"id": "toutiao", "name": "今日头条"}, ...]
                       必须从数据库获取，不能为 None
             trigger_source: 触发来源（manual, scheduled, api）
             word_groups: 使用的频率词组列表
             filter_words: 使用的过滤词列表
-        
+            fetch_ids: 本次实际请求的平台ID（None 表示全部，其余平台沿用上次结果）
+
         Returns:
-            (results, id_to_name, failed_ids) 元组
+            CrawlCycle 抓取周期对象
         """
         # 使用传入的 platforms，必须从数据库获取
         if platforms is None:
             raise ValueError("platforms 参数不能为 None，必须从数据库获取")
-        
+
         # 生成会话ID和开始时间
-        session_id = f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        session_id = new_session_id()
         started_at = datetime.now().isoformat()
-        
+
         ids = []
         for platform in platforms:
             if "name" in platform:
@@ -71,29 +99,102 @@ class Crawler:
         ensure_directory_exists("output")
 
         results, id_to_name, failed_ids = self.data_fetcher.crawl_websites(
-            ids, self.request_interval
+            ids, self.request_interval, fetch_ids=fetch_ids
         )
 
-        # 保存数据
-        DataLoader.save_crawl_results(results, id_to_name, failed_ids)
+        return CrawlCycle(
+            session_id=session_id,
+            started_at=started_at,
+            trigger_source=trigger_source,
+            platforms=platforms,
+            results=results,
+            id_to_name=id_to_name,
+            failed_ids=failed_ids,
+            word_groups=word_groups,
+            filter_words=filter_words,
+            fingerprints=self.data_fetcher.last_fingerprints,
+            unchanged_ids=self.data_fetcher.last_unchanged_ids,
+            circuit_states=self.data_fetcher.last_circuit_states,
+        )
 
-        # 发送数据到 Kafka（通过 Pipeline Repository）
+    @staticmethod
+    def match(cycle: CrawlCycle) -> None:
+        """
+        对本周期的标题做一次词组匹配
+
+        结果缓存在词表对应的匹配器中，统计、Kafka 事件、通知和 HTML 渲染使用同一词表时直接复用；
+        未传入词表时从文件加载并写回 cycle，保证后续阶段使用同一份词表
+        """
+        if cycle.word_groups is None or cycle.filter_words is None:
+            cycle.word_groups, cycle.filter_words = load_frequency_words()
+        matcher = get_keyword_matcher(cycle.word_groups, cycle.filter_words)
+        total = sum(len(titles) for titles in cycle.results.values())
+        computed = matcher.warm(cycle.results)
+        print(f"🔤 词组匹配: {total} 条标题，新匹配 {computed} 条，其余复用缓存")
+
+    @staticmethod
+    def persist(cycle: CrawlCycle) -> SnapshotHandle:
+        """保存抓取结果到快照（句柄记录在 cycle.snapshot，后续阶段不再重复写入）"""
+        cycle.snapshot = DataLoader.save_crawl_results(
+            cycle.results, cycle.id_to_name, cycle.failed_ids, cycle.fingerprints
+        )
+        return cycle.snapshot
+
+    def publish(self, cycle: CrawlCycle) -> None:
+        """发送抓取结果到 Kafka"""
         # 注意：这里暂时保留原有逻辑，未来可以改为通过 Service 调用
         try:
             send_fetched_data_to_kafka(
-                results, 
-                id_to_name, 
-                failed_ids, 
+                cycle.results,
+                cycle.id_to_name,
+                cycle.failed_ids,
                 db_config=self.db_config,
-                session_id=session_id,
-                started_at=started_at,
-                trigger_source=trigger_source,
-                platforms=platforms,
-                word_groups=word_groups,
-                filter_words=filter_words
+                session_id=cycle.session_id,
+                started_at=cycle.started_at,
+                trigger_source=cycle.trigger_source,
+                platforms=cycle.platforms,
+                word_groups=cycle.word_groups,
+                filter_words=cycle.filter_words,
+                unchanged_ids=cycle.unchanged_ids,
+                circuit_states=cycle.circuit_states,
             )
         except Exception as e:
             print(f"⚠️  发送数据到 Kafka 时出错: {e}")
 
-        return results, id_to_name, failed_ids
+    def crawl(
+        self,
+        platforms: Optional[List[Dict]] = None,
+        trigger_source: str = "scheduled",
+        word_groups: Optional[List[Dict]] = None,
+        filter_words: Optional[List[str]] = None,
+        fetch_ids: Optional[List[str]] = None,
+    ) -> Tuple[Dict, Dict, List]:
+        """
+        执行数据爬取（抓取 + 保存 + 发送到 Kafka）
+
+        Args:
+            platforms: 平台列表，格式: [{"id": "toutiao", "name": "今日头条"}, ...]
+                      必须从数据库获取，不能为 None
+            trigger_source: 触发来源（manual, scheduled, api）
+            word_groups: 使用的频率词组列表
+            filter_words: 使用的过滤词列表
+            fetch_ids: 本次实际请求的平台ID（None 表示全部，其余平台沿用上次结果）
+
+        Returns:
+            (results, id_to_name, failed_ids) 元组
+        """
+        cycle = self.fetch(
+            platforms=platforms,
+            trigger_source=trigger_source,
+            word_groups=word_groups,
+            filter_words=filter_words,
+            fetch_ids=fetch_ids,
+        )
+
+        # 保存数据
+        self.persist(cycle)
+
+        # 发送数据到 Kafka（通过 Pipeline Repository）
+        self.publish(cycle)
 
+        return cycle.results, cycle.id_to_name, cycle.failed_ids
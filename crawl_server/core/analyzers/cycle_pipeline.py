@@ -0,0 +1,183 @@
+"""
+抓取周期流水线
+
+将一次抓取周期拆分为多个阶段，阶段之间通过有界队列衔接：
+
+    抓取（调用方线程） → process（落盘 + 分析/渲染） → publish（Kafka）
+                                                  → notify（通知推送）
+
+- 抓取在调用方线程完成后即返回，下一周期的抓取可与本周期的分析、推送重叠
+- 落盘与分析放在同一个有序阶段：分析依赖磁盘上的最新快照，必须在下一周期落盘前完成
+- process / publish 队列满时阻塞提交方（背压，数据不丢失）
+- notify 队列满时把新通知合并进队列中同类型的待推送任务（新增标题合并、统计取最新），
+  不丢弃任何一次的新增标题；没有可合并的任务时阻塞提交方（背压）
+"""
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from crawl_server.configs import CrawlConfig
+
+
+class StageWorker:
+    """单个流水线阶段：一个后台线程按顺序消费有界队列中的任务"""
+
+    def __init__(self, name: str, maxsize: int, merge_pending: bool = False):
+        """
+        初始化阶段
+
+        Args:
+            name: 阶段名称
+            maxsize: 队列容量
+            merge_pending: 队列满时是否把新任务合并进同类待执行任务（任务需提供 merge_key / merge），
+                否则阻塞提交方
+        """
+        self.name = name
+        self.merge_pending = merge_pending
+        self.processed = 0
+        self.failed = 0
+        self.merged = 0
+        self._stats_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Callable[[], None]]]" = queue.Queue(maxsize=max(1, maxsize))
+        self._thread = threading.Thread(target=self._run, name=f"cycle-{name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """当前排队任务数"""
+        return self._queue.qsize()
+
+    def submit(self, task: Callable[[], None]) -> None:
+        """提交任务（队列满时合并进同类待执行任务，无法合并时阻塞）"""
+        if self.merge_pending and self._merge_into_pending(task):
+            return
+        self._queue.put(task)
+
+    def _merge_into_pending(self, task) -> bool:
+        """队列已满时把任务合并进最新的同类待执行任务，成功返回 True"""
+        merge_key = getattr(task, "merge_key", None)
+        if merge_key is None:
+            return False
+        with self._queue.mutex:
+            if self._queue.maxsize <= 0 or len(self._queue.queue) < self._queue.maxsize:
+                return False
+            pending = self._queue.queue
+            for index in range(len(pending) - 1, -1, -1):
+                if getattr(pending[index], "merge_key", None) == merge_key:
+                    pending[index] = pending[index].merge(task)
+                    break
+            else:
+                return False
+        with self._stats_lock:
+            self.merged += 1
+            merged = self.merged
+        print(f"⚠️ 流水线阶段 {self.name} 队列已满，已合并到待执行任务（累计合并 {merged}）")
+        return True
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                task()
+                with self._stats_lock:
+                    self.processed += 1
+            except Exception as e:
+                with self._stats_lock:
+                    self.failed += 1
+                print(f"❌ 流水线阶段 {self.name} 执行出错: {e}")
+            finally:
+                self._queue.task_done()
+
+    def get_stats(self) -> Dict[str, int]:
+        """队列深度和处理计数"""
+        with self._stats_lock:
+            return {
+                "depth": self.depth,
+                "processed": self.processed,
+                "failed": self.failed,
+                "merged": self.merged,
+            }
+
+    def join(self) -> None:
+        """等待队列中的任务全部完成"""
+        self._queue.join()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """处理完剩余任务后停止线程"""
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+
+class CrawlCyclePipeline:
+    """抓取周期流水线（进程内共享，跨抓取周期存活）"""
+
+    STAGES = ("process", "publish", "notify")
+
+    def __init__(self, queue_size: int = 4):
+        """
+        初始化流水线
+
+        Args:
+            queue_size: 每个阶段的队列容量
+        """
+        self.stages: Dict[str, StageWorker] = {
+            "process": StageWorker("process", queue_size),
+            "publish": StageWorker("publish", queue_size),
+            "notify": StageWorker("notify", queue_size, merge_pending=True),
+        }
+
+    def submit(self, stage: str, task: Callable[[], None]) -> None:
+        """向指定阶段提交任务"""
+        self.stages[stage].submit(task)
+
+    def get_queue_depths(self) -> Dict[str, int]:
+        """各阶段当前队列深度"""
+        return {name: worker.depth for name, worker in self.stages.items()}
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """各阶段的队列深度和处理计数"""
+        return {name: worker.get_stats() for name, worker in self.stages.items()}
+
+    def drain(self) -> None:
+        """按阶段顺序等待所有已提交任务完成"""
+        for name in self.STAGES:
+            self.stages[name].join()
+
+    def shutdown(self, timeout: float = 60) -> None:
+        """排空队列并停止所有阶段线程"""
+        deadline = time.monotonic() + timeout
+        for name in self.STAGES:
+            self.stages[name].stop(timeout=max(0.0, deadline - time.monotonic()))
+
+
+# 全局流水线实例
+_cycle_pipeline: Optional[CrawlCyclePipeline] = None
+_cycle_pipeline_lock = threading.Lock()
+
+
+def get_cycle_pipeline(crawl_config: Optional[CrawlConfig] = None) -> Optional[CrawlCyclePipeline]:
+    """
+    获取全局抓取周期流水线
+
+    未启用（PIPELINE_ENABLED=False）时返回 None，调用方按原有串行流程执行
+    """
+    global _cycle_pipeline
+    if not crawl_config or not crawl_config.PIPELINE_ENABLED:
+        return None
+    with _cycle_pipeline_lock:
+        if _cycle_pipeline is None:
+            _cycle_pipeline = CrawlCyclePipeline(crawl_config.PIPELINE_QUEUE_SIZE)
+        return _cycle_pipeline
+
+
+def shutdown_cycle_pipeline(timeout: float = 60) -> None:
+    """排空并关闭全局流水线"""
+    global _cycle_pipeline
+    with _cycle_pipeline_lock:
+        if _cycle_pipeline is not None:
+            print("⏳ 等待抓取流水线排空...")
+            _cycle_pipeline.shutdown(timeout=timeout)
+            _cycle_pipeline = None
@@ -3,15 +3,17 @@
 
 负责数据加载和预处理
 """
-from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from crawl_server.core.data import (
+    DayRevision,
+    SnapshotHandle,
     detect_latest_new_titles,
+    get_day_revision,
+    get_snapshot_store,
     read_all_today_titles,
-    save_titles_to_file,
 )
-from crawl_server.core.utils import load_frequency_words
+from crawl_server.core.utils import format_date_folder, load_frequency_words
 
 
 class DataLoader:
@@ -66,6 +68,11 @@ class DataLoader:
             print(f"数据加载失败: {e}")
             return None
 
+    @staticmethod
+    def day_revision() -> Optional[DayRevision]:
+        """当前线程最近一次 load_analysis_data 读到的当日聚合版本（用于增量统计）"""
+        return get_day_revision(format_date_folder())
+
     @staticmethod
     def prepare_current_title_info(results: Dict, time_info: str) -> Dict:
         """从当前抓取结果构建标题信息"""
@@ -88,14 +95,13 @@ class DataLoader:
         return title_info
 
     @staticmethod
-    def save_crawl_results(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-        """保存抓取结果并返回文件路径"""
-        title_file = save_titles_to_file(results, id_to_name, failed_ids)
-        print(f"标题已保存到: {title_file}")
-        return title_file
-
-    @staticmethod
-    def get_time_info_from_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-        """从保存的文件中获取时间信息"""
-        return Path(save_titles_to_file(results, id_to_name, failed_ids)).stem
-
+    def save_crawl_results(
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        fingerprints: Optional[Dict[str, str]] = None,
+    ) -> SnapshotHandle:
+        """保存抓取结果（每周期只写入一次），返回快照句柄"""
+        snapshot = get_snapshot_store().write(results, id_to_name, failed_ids, fingerprints)
+        print(f"标题已保存到: {snapshot.path}")
+        return snapshot
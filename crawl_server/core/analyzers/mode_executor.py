@@ -5,15 +5,15 @@
 """
 import webbrowser
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from crawl_server.configs import CrawlConfig
-from crawl_server.core.data import detect_latest_new_titles
+from crawl_server.core.data import SnapshotHandle, detect_latest_new_titles
 from crawl_server.core.analyzers.data_loader import DataLoader
 from crawl_server.core.analyzers.pipeline import AnalysisPipeline
 from crawl_server.core.analyzers.notifier import Notifier
 from crawl_server.core.analyzers.report_generator import ReportGenerator
-from crawl_server.core.utils import load_frequency_words
+from crawl_server.core.utils import format_time_filename, is_first_crawl_today, load_frequency_words
 
 
 class ModeExecutor:
@@ -28,6 +28,7 @@ class ModeExecutor:
         should_open_browser: bool = False,
         is_docker_container: bool = False,
         crawl_config: Optional[CrawlConfig] = None,
+        notify_dispatcher: Optional[Callable[[Callable[[], None]], None]] = None,
     ):
         """
         初始化模式执行器
@@ -40,14 +41,22 @@ class ModeExecutor:
             should_open_browser: 是否应该打开浏览器
             is_docker_container: 是否在Docker容器中
             crawl_config: 爬虫配置对象
+            notify_dispatcher: 通知任务分发器（流水线模式下异步推送），为 None 时同步发送
         """
         self.crawl_config = crawl_config
         self.report_mode = report_mode
         self.update_info = update_info
         self.pipeline = AnalysisPipeline(rank_threshold, update_info, crawl_config=crawl_config)
-        self.notifier = Notifier(report_mode, proxy_url, crawl_config=crawl_config)
+        self.notifier = Notifier(
+            report_mode, proxy_url, crawl_config=crawl_config, dispatcher=notify_dispatcher
+        )
         self.report_generator = ReportGenerator(
-            report_mode, rank_threshold, update_info, proxy_url
+            report_mode,
+            rank_threshold,
+            update_info,
+            proxy_url,
+            notifier=self.notifier,
+            crawl_config=crawl_config,
         )
         self.should_open_browser = should_open_browser
         self.is_docker_container = is_docker_container
@@ -60,7 +69,10 @@ class ModeExecutor:
         failed_ids: List,
         platforms=None,
         word_groups=None,
-        filter_words=None
+        filter_words=None,
+        fingerprints: Optional[Dict[str, str]] = None,
+        unchanged_ids: Optional[List[str]] = None,
+        snapshot: Optional[SnapshotHandle] = None,
     ) -> Optional[str]:
         """
         执行模式特定逻辑
@@ -73,6 +85,9 @@ class ModeExecutor:
             platforms: 平台列表（如果为None，则从CONFIG获取，向后兼容）
             word_groups: 频率词组列表（如果为None，则从文件加载，向后兼容）
             filter_words: 过滤词列表（如果为None，则从文件加载，向后兼容）
+            fingerprints: 平台内容指纹（用于复用未变化平台的快照内容）
+            unchanged_ids: 内容与上一周期相同的平台ID列表
+            snapshot: 本周期已写入的快照（取其时间标签，不再重复写入）
         """
         # 获取当前监控平台ID列表
         if platforms is None:
@@ -81,12 +96,16 @@ class ModeExecutor:
         current_platform_ids = [platform["id"] for platform in platforms]
 
         new_titles = detect_latest_new_titles(current_platform_ids)
-        time_info = DataLoader.get_time_info_from_file(results, id_to_name, failed_ids)
+        time_info = snapshot.time_info if snapshot else format_time_filename()
         
         # 如果没有传入，则从文件加载（向后兼容）
         if word_groups is None or filter_words is None:
             word_groups, filter_words = load_frequency_words()
 
+        # 增量模式下所有平台内容均未变化时不可能有新增新闻，跳过分析和实时推送
+        all_unchanged = bool(results) and set(unchanged_ids or []) >= set(results.keys())
+        html_file = None
+
         # current模式下，实时推送需要使用完整的历史数据来保证统计信息的完整性
         if self.report_mode == "current":
             # 加载完整的历史数据（已按当前平台过滤）
@@ -132,10 +151,14 @@ class ModeExecutor:
                         new_titles=historical_new_titles,
                         id_to_name=combined_id_to_name,
                         html_file_path=html_file,
+                        word_groups=word_groups,
+                        filter_words=filter_words,
                     )
             else:
                 print("❌ 严重错误：无法读取刚保存的数据文件")
                 raise RuntimeError("数据一致性检查失败：保存后立即读取失败")
+        elif self.report_mode == "incremental" and all_unchanged and not is_first_crawl_today():
+            print("增量模式：所有平台内容与上一周期相同，跳过分析和实时推送")
         else:
             title_info = DataLoader.prepare_current_title_info(results, time_info)
             stats, html_file = self.pipeline.run(
@@ -162,6 +185,8 @@ class ModeExecutor:
                     new_titles=new_titles,
                     id_to_name=id_to_name,
                     html_file_path=html_file,
+                    word_groups=word_groups,
+                    filter_words=filter_words,
                 )
 
         # 生成汇总报告（如果需要）
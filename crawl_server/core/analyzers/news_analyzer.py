@@ -5,10 +5,12 @@
 """
 from typing import Optional
 from crawl_server.configs import CrawlConfig, DatabaseConfig
+from crawl_server.core.data import get_snapshot_store
 from crawl_server.core.utils import get_beijing_time
 from crawl_server.core.analyzers.base import NewsAnalyzerBase
 from crawl_server.core.analyzers.config_checker import ConfigChecker
-from crawl_server.core.analyzers.crawler import Crawler
+from crawl_server.core.analyzers.crawler import Crawler, CrawlCycle
+from crawl_server.core.analyzers.cycle_pipeline import get_cycle_pipeline
 from crawl_server.core.analyzers.mode_executor import ModeExecutor
 
 
@@ -25,6 +27,13 @@ class NewsAnalyzer(NewsAnalyzerBase):
         """
         super().__init__(crawl_config=crawl_config)
         self.crawler = Crawler(self.data_fetcher, self.request_interval, db_config=db_config)
+        # 快照存储跨周期共享，按配置选择写入后端
+        get_snapshot_store(crawl_config)
+        # 流水线模式：抓取完成即返回，落盘/分析、Kafka 发送、通知推送在后台阶段执行
+        self.cycle_pipeline = get_cycle_pipeline(crawl_config)
+        notify_dispatcher = None
+        if self.cycle_pipeline:
+            notify_dispatcher = lambda task: self.cycle_pipeline.submit("notify", task)
         self.mode_executor = ModeExecutor(
             self.report_mode,
             self.rank_threshold,
@@ -33,6 +42,7 @@ class NewsAnalyzer(NewsAnalyzerBase):
             self._should_open_browser(),
             self.is_docker_container,
             crawl_config=crawl_config,
+            notify_dispatcher=notify_dispatcher,
         )
 
     def _initialize_and_check_config(self) -> None:
@@ -61,7 +71,8 @@ class NewsAnalyzer(NewsAnalyzerBase):
         platforms=None, 
         word_groups=None, 
         filter_words=None,
-        trigger_source: str = "scheduled"
+        trigger_source: str = "scheduled",
+        fetch_ids=None,
     ) -> None:
         """
         执行分析流程
@@ -71,29 +82,78 @@ class NewsAnalyzer(NewsAnalyzerBase):
             word_groups: 频率词组列表
             filter_words: 过滤词列表
             trigger_source: 触发来源（manual, scheduled, api）
+            fetch_ids: 本次实际请求的平台ID（None 表示全部，其余平台沿用上次结果）
         """
         try:
             self._initialize_and_check_config()
 
             mode_strategy = ConfigChecker.get_mode_strategy(self.report_mode)
 
-            results, id_to_name, failed_ids = self.crawler.crawl(
+            cycle = self.crawler.fetch(
                 platforms=platforms,
                 trigger_source=trigger_source,
                 word_groups=word_groups,
-                filter_words=filter_words
+                filter_words=filter_words,
+                fetch_ids=fetch_ids,
             )
 
-            self.mode_executor.execute(
-                mode_strategy, 
-                results, 
-                id_to_name, 
-                failed_ids,
-                platforms=platforms,
-                word_groups=word_groups,
-                filter_words=filter_words
-            )
+            if self.cycle_pipeline:
+                self.cycle_pipeline.submit(
+                    "process", lambda: self._process_cycle(cycle, mode_strategy)
+                )
+                print(f"抓取完成，已提交流水线，队列深度: {self.cycle_pipeline.get_queue_depths()}")
+                return
+
+            # 落盘（只写一次快照）、发送并分析
+            self._process_cycle(cycle, mode_strategy)
 
         except Exception as e:
             print(f"分析流程执行出错: {e}")
             raise
+
+    def run_cycle(self, cycle: CrawlCycle) -> None:
+        """
+        对已组装好的抓取周期执行落盘、发送和分析（分片抓取合并后调用，不再请求接口）
+
+        Args:
+            cycle: 抓取周期对象
+        """
+        try:
+            self._initialize_and_check_config()
+
+            mode_strategy = ConfigChecker.get_mode_strategy(self.report_mode)
+
+            if self.cycle_pipeline:
+                self.cycle_pipeline.submit(
+                    "process", lambda: self._process_cycle(cycle, mode_strategy)
+                )
+                print(f"合并结果已提交流水线，队列深度: {self.cycle_pipeline.get_queue_depths()}")
+                return
+
+            self._process_cycle(cycle, mode_strategy)
+
+        except Exception as e:
+            print(f"分析流程执行出错: {e}")
+            raise
+
+    def _process_cycle(self, cycle: CrawlCycle, mode_strategy) -> None:
+        """落盘、词组匹配、Kafka 发送、分析并生成报告（流水线模式下发送和通知交给对应阶段）"""
+        self.crawler.persist(cycle)
+        self.crawler.match(cycle)
+        if self.cycle_pipeline:
+            self.cycle_pipeline.submit("publish", lambda: self.crawler.publish(cycle))
+        else:
+            self.crawler.publish(cycle)
+
+        self.mode_executor.execute(
+            mode_strategy,
+            cycle.results,
+            cycle.id_to_name,
+            cycle.failed_ids,
+            platforms=cycle.platforms,
+            word_groups=cycle.word_groups,
+            filter_words=cycle.filter_words,
+            fingerprints=cycle.fingerprints,
+            unchanged_ids=cycle.unchanged_ids,
+            snapshot=cycle.snapshot,
+        )
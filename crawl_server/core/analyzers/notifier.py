@@ -3,17 +3,83 @@
 
 负责通知发送逻辑
 """
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from crawl_server.configs import CrawlConfig
 from crawl_server.core.connections import send_to_notifications
 from crawl_server.core.analyzers.config_checker import ConfigChecker
 
 
+def _merge_new_titles(older: Optional[Dict], newer: Optional[Dict]) -> Optional[Dict]:
+    """合并两次推送的新增标题（{source_id: {title: title_data}}，同一标题取较新的数据）"""
+    if not older:
+        return newer
+    merged = {source_id: dict(titles) for source_id, titles in older.items()}
+    for source_id, titles in (newer or {}).items():
+        merged.setdefault(source_id, {}).update(titles)
+    return merged
+
+
+def _merge_stats(older: List[Dict], newer: List[Dict]) -> List[Dict]:
+    """合并两次增量推送的词组统计（每次只含本周期新增的匹配标题，合并后不遗漏任何一次的标题）"""
+    merged = {stat["word"]: dict(stat, titles=list(stat["titles"])) for stat in newer}
+    order = [stat["word"] for stat in newer]
+    for stat in older:
+        target = merged.get(stat["word"])
+        if target is None:
+            merged[stat["word"]] = dict(stat, titles=list(stat["titles"]))
+            order.append(stat["word"])
+            continue
+        seen = {(title["source_name"], title["title"]) for title in target["titles"]}
+        extra = [title for title in stat["titles"] if (title["source_name"], title["title"]) not in seen]
+        target["titles"].extend(extra)
+        target["count"] += stat["count"] - (len(stat["titles"]) - len(extra))
+    return [merged[word] for word in order]
+
+
+class NotifyTask:
+    """
+    一次通知推送任务（流水线 notify 阶段执行）
+
+    notify 队列已满时，新任务与队列中同类型（报告类型、模式相同）的待推送任务合并为一次推送：
+    新增标题合并，统计、失败平台、报告路径等取较新的一次（增量模式下统计只含本周期新增，一并合并），
+    慢速通知渠道只会减少推送次数，不会丢失任何一次的新增标题
+    """
+
+    def __init__(self, notifier: "Notifier", **kwargs):
+        self.notifier = notifier
+        self.kwargs = kwargs
+
+    @property
+    def merge_key(self):
+        """可合并的任务键（报告类型与模式相同才合并）"""
+        return (self.kwargs["report_type"], self.kwargs["mode"])
+
+    def merge(self, newer: "NotifyTask") -> "NotifyTask":
+        """与较新的任务合并为一个任务"""
+        kwargs = dict(newer.kwargs)
+        kwargs["new_titles"] = _merge_new_titles(self.kwargs.get("new_titles"), newer.kwargs.get("new_titles"))
+        id_to_name = dict(self.kwargs.get("id_to_name") or {})
+        id_to_name.update(newer.kwargs.get("id_to_name") or {})
+        kwargs["id_to_name"] = id_to_name
+        if self.notifier.report_mode == "incremental":
+            kwargs["stats"] = _merge_stats(self.kwargs["stats"], newer.kwargs["stats"])
+        return NotifyTask(newer.notifier, **kwargs)
+
+    def __call__(self) -> None:
+        self.notifier.send_now(**self.kwargs)
+
+
 class Notifier:
     """通知发送器"""
     
-    def __init__(self, report_mode: str, proxy_url: Optional[str] = None, crawl_config: Optional[CrawlConfig] = None):
+    def __init__(
+        self,
+        report_mode: str,
+        proxy_url: Optional[str] = None,
+        crawl_config: Optional[CrawlConfig] = None,
+        dispatcher: Optional[Callable[[Callable[[], None]], None]] = None,
+    ):
         """
         初始化通知发送器
         
@@ -21,10 +87,12 @@ class Notifier:
             report_mode: 报告模式
             proxy_url: 代理URL
             crawl_config: 爬虫配置对象
+            dispatcher: 通知任务分发器（如流水线 notify 阶段），为 None 时同步发送
         """
         self.report_mode = report_mode
         self.proxy_url = proxy_url
         self.crawl_config = crawl_config
+        self.dispatcher = dispatcher
 
     def send_if_needed(
         self,
@@ -36,8 +104,10 @@ class Notifier:
         new_titles: Optional[Dict] = None,
         id_to_name: Optional[Dict] = None,
         html_file_path: Optional[str] = None,
+        word_groups: Optional[List[Dict]] = None,
+        filter_words: Optional[List[str]] = None,
     ) -> bool:
-        """统一的通知发送逻辑，包含所有判断条件"""
+        """统一的通知发送逻辑，包含所有判断条件（word_groups/filter_words 用于筛选新增新闻）"""
         if not self.crawl_config:
             raise RuntimeError("CrawlConfig 未提供，无法发送通知")
         
@@ -48,18 +118,24 @@ class Notifier:
             and has_notification
             and ConfigChecker.has_valid_content(self.report_mode, stats, new_titles)
         ):
-            send_to_notifications(
-                stats,
-                failed_ids or [],
-                report_type,
-                new_titles,
-                id_to_name,
-                update_info,
-                self.proxy_url,
+            send = NotifyTask(
+                self,
+                stats=stats,
+                failed_ids=failed_ids or [],
+                report_type=report_type,
+                new_titles=new_titles,
+                id_to_name=id_to_name,
+                update_info=update_info,
                 mode=mode,
                 html_file_path=html_file_path,
-                crawl_config=self.crawl_config,
+                word_groups=word_groups,
+                filter_words=filter_words,
             )
+
+            if self.dispatcher:
+                self.dispatcher(send)
+            else:
+                send()
             return True
         elif self.crawl_config.ENABLE_NOTIFICATION and not has_notification:
             print("⚠️ 警告：通知功能已启用但未配置任何通知渠道，将跳过通知发送")
@@ -82,3 +158,32 @@ class Notifier:
 
         return False
 
+    def send_now(
+        self,
+        stats: List[Dict],
+        failed_ids: List,
+        report_type: str,
+        new_titles: Optional[Dict],
+        id_to_name: Optional[Dict],
+        update_info: Optional[Dict],
+        mode: str,
+        html_file_path: Optional[str],
+        word_groups: Optional[List[Dict]],
+        filter_words: Optional[List[str]],
+    ) -> None:
+        """立即发送通知"""
+        send_to_notifications(
+            stats,
+            failed_ids,
+            report_type,
+            new_titles,
+            id_to_name,
+            update_info,
+            self.proxy_url,
+            mode=mode,
+            html_file_path=html_file_path,
+            crawl_config=self.crawl_config,
+            word_groups=word_groups,
+            filter_words=filter_words,
+        )
+
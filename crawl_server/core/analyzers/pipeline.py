@@ -36,8 +36,13 @@ class AnalysisPipeline:
         id_to_name: Dict,
         failed_ids: Optional[List] = None,
         is_daily_summary: bool = False,
+        day_revision=None,
     ) -> Tuple[List[Dict], str]:
-        """统一的分析流水线：数据处理 → 统计计算 → HTML生成"""
+        """
+        统一的分析流水线：数据处理 → 统计计算 → HTML生成
+
+        day_revision: data_source 对应的当日聚合版本（DataLoader.day_revision()），daily 模式下用于增量统计
+        """
 
         # 统计计算
         if not self.crawl_config:
@@ -52,6 +57,7 @@ class AnalysisPipeline:
             new_titles,
             mode=mode,
             crawl_config=self.crawl_config,
+            day_revision=day_revision,
         )
 
         # HTML生成
@@ -65,6 +71,8 @@ class AnalysisPipeline:
             is_daily_summary=is_daily_summary,
             update_info=self.update_info if (self.crawl_config and self.crawl_config.SHOW_VERSION_UPDATE) else None,
             crawl_config=self.crawl_config,
+            word_groups=word_groups,
+            filter_words=filter_words,
         )
 
         return stats, html_file
@@ -5,6 +5,7 @@
 """
 from typing import Dict, List, Optional
 
+from crawl_server.configs import CrawlConfig
 from crawl_server.core.analyzers.config_checker import ConfigChecker
 from crawl_server.core.analyzers.data_loader import DataLoader
 from crawl_server.core.analyzers.pipeline import AnalysisPipeline
@@ -20,6 +21,8 @@ class ReportGenerator:
         rank_threshold: int,
         update_info: Optional[dict] = None,
         proxy_url: Optional[str] = None,
+        notifier: Optional[Notifier] = None,
+        crawl_config: Optional[CrawlConfig] = None,
     ):
         """
         初始化报告生成器
@@ -29,10 +32,12 @@ class ReportGenerator:
             rank_threshold: 排名阈值
             update_info: 版本更新信息
             proxy_url: 代理URL
+            notifier: 共享的通知发送器（为 None 时自行创建）
+            crawl_config: 爬虫配置对象
         """
         self.report_mode = report_mode
-        self.pipeline = AnalysisPipeline(rank_threshold, update_info)
-        self.notifier = Notifier(report_mode, proxy_url)
+        self.pipeline = AnalysisPipeline(rank_threshold, update_info, crawl_config=crawl_config)
+        self.notifier = notifier or Notifier(report_mode, proxy_url, crawl_config=crawl_config)
         self.update_info = update_info
 
     def generate_summary_report(self, mode_strategy: Dict, platforms=None, word_groups=None, filter_words=None) -> Optional[str]:
@@ -61,6 +66,7 @@ class ReportGenerator:
             filter_words,
             id_to_name,
             is_daily_summary=True,
+            day_revision=DataLoader.day_revision(),
         )
 
         print(f"{summary_type}报告已生成: {html_file}")
@@ -75,6 +81,8 @@ class ReportGenerator:
             new_titles=new_titles,
             id_to_name=id_to_name,
             html_file_path=html_file,
+            word_groups=word_groups,
+            filter_words=filter_words,
         )
 
         return html_file
@@ -103,6 +111,7 @@ class ReportGenerator:
             filter_words,
             id_to_name,
             is_daily_summary=True,
+            day_revision=DataLoader.day_revision(),
         )
 
         print(f"{summary_type}HTML已生成: {html_file}")
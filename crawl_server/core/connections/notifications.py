@@ -27,12 +27,16 @@ def send_to_notifications(
     mode: str = "daily",
     html_file_path: Optional[str] = None,
     crawl_config: Optional[CrawlConfig] = None,
+    word_groups: Optional[List[Dict]] = None,
+    filter_words: Optional[List[str]] = None,
 ) -> Dict[str, bool]:
     """
     发送数据到多个通知平台
     
     Args:
         crawl_config: 爬虫配置对象
+        word_groups: 频率词组列表（为 None 时从文件加载）
+        filter_words: 过滤词列表（为 None 时从文件加载）
     """
     if not crawl_config:
         raise RuntimeError("CrawlConfig 未提供，无法发送通知")
@@ -58,7 +62,10 @@ def send_to_notifications(
             else:
                 print(f"推送窗口控制：今天首次推送")
 
-    report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode, crawl_config=crawl_config)
+    report_data = prepare_report_data(
+        stats, failed_ids, new_titles, id_to_name, mode,
+        crawl_config=crawl_config, word_groups=word_groups, filter_words=filter_words,
+    )
 
     feishu_url = crawl_config.FEISHU_WEBHOOK_URL
     dingtalk_url = crawl_config.DINGTALK_WEBHOOK_URL
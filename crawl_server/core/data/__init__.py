@@ -3,19 +3,65 @@
 
 负责数据获取、存储和解析
 """
+from .compaction import compact_day, compact_old_days, start_day_compactor, shutdown_day_compactor
 from .fetcher import DataFetcher
+from .day_aggregate import DayAggregate, DayRevision, detect_day_new_titles, get_day_revision, load_day_aggregate
+from .history_store import HistoryStore, get_history_store, start_history_backfill
+from .fingerprint import FingerprintStore, compute_fingerprint, get_fingerprint_store
 from .parser import (
     detect_latest_new_titles,
     parse_file_titles,
     process_source_data,
     read_all_today_titles,
 )
+from .snapshot_parser import SnapshotRecord, iter_snapshot_records, parse_snapshot_text
+from .shard_merger import ShardMerger, ShardSession
+from .snapshot_store import (
+    SnapshotBackend,
+    SnapshotHandle,
+    SnapshotStore,
+    convert_snapshots,
+    get_snapshot_store,
+    list_snapshot_files,
+    read_snapshot_text,
+    register_snapshot_backend,
+    snapshot_time_label,
+)
 from .storage import save_titles_to_file
 
 __all__ = [
+    "compact_day",
+    "compact_old_days",
+    "start_day_compactor",
+    "shutdown_day_compactor",
     "DataFetcher",
+    "DayAggregate",
+    "DayRevision",
+    "load_day_aggregate",
+    "detect_day_new_titles",
+    "get_day_revision",
+    "FingerprintStore",
+    "compute_fingerprint",
+    "get_fingerprint_store",
+    "HistoryStore",
+    "get_history_store",
+    "start_history_backfill",
+    "ShardMerger",
+    "ShardSession",
+    "SnapshotBackend",
+    "SnapshotHandle",
+    "SnapshotStore",
+    "convert_snapshots",
+    "get_snapshot_store",
+    "list_snapshot_files",
+    "read_snapshot_text",
+    "register_snapshot_backend",
+    "snapshot_time_label",
     "save_titles_to_file",
     "parse_file_titles",
+    "parse_snapshot_text",
+    "iter_snapshot_records",
+    "SnapshotRecord",
     "read_all_today_titles",
     "process_source_data",
     "detect_latest_new_titles",
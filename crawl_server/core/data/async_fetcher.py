@@ -0,0 +1,245 @@
+"""
+异步抓取引擎
+
+基于 httpx 的原生 asyncio 抓取引擎：在后台线程中运行独立事件循环，
+跨抓取周期复用同一个 AsyncClient（连接池 + keep-alive，可选 HTTP/2），
+替代"每个平台一个线程 + 一次性连接"的同步抓取方式
+"""
+import asyncio
+import threading
+from typing import Dict, List, Optional, Set
+
+from crawl_server.core.data.circuit_breaker import RetryBudget
+from crawl_server.core.data.newsnow_client import (
+    API_URL_TEMPLATE,
+    HEADERS,
+    HostRateLimiter,
+    calculate_retry_wait,
+    check_response_status,
+)
+from crawl_server.core.utils import json_loads
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class AsyncFetchEngine:
+    """异步抓取引擎（进程内长期存活，线程安全的同步调用入口）"""
+
+    def __init__(
+        self,
+        proxy_url: Optional[str] = None,
+        http2: bool = False,
+        max_connections: int = 10,
+        timeout: float = 10.0,
+    ):
+        """
+        初始化异步抓取引擎
+
+        Args:
+            proxy_url: 代理URL
+            http2: 是否启用 HTTP/2（需安装 h2）
+            max_connections: 连接池最大连接数
+            timeout: 单次请求超时（秒）
+        """
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx 未安装，无法使用异步抓取引擎")
+
+        self.proxy_url = proxy_url
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="async-fetcher", daemon=True
+        )
+        self._thread.start()
+        self._client = self._submit(self._create_client())
+
+    def _run_loop(self) -> None:
+        """后台线程：运行事件循环"""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _submit(self, coro):
+        """将协程提交到后台事件循环并阻塞等待结果"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _create_client(self) -> "httpx.AsyncClient":
+        """在事件循环内创建共享客户端"""
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=120.0,
+        )
+        client_kwargs = {
+            "headers": HEADERS,
+            "limits": limits,
+            "timeout": self.timeout,
+            "http2": self.http2,
+        }
+        if self.proxy_url:
+            client_kwargs["proxy"] = self.proxy_url
+        return httpx.AsyncClient(**client_kwargs)
+
+    async def _fetch_one(
+        self,
+        id_value: str,
+        rate_limiter: HostRateLimiter,
+        semaphore: asyncio.Semaphore,
+        max_retries: int,
+        min_retry_wait: int,
+        max_retry_wait: int,
+        retry_budget: Optional[RetryBudget] = None,
+    ) -> Optional[Dict]:
+        """抓取单个平台，行为与 DataFetcher.fetch_data 一致"""
+        url = API_URL_TEMPLATE.format(id_value=id_value)
+
+        retries = 0
+        while retries <= max_retries:
+            try:
+                async with semaphore:
+                    wait_time = rate_limiter.reserve()
+                    if wait_time > 0:
+                        await asyncio.sleep(wait_time)
+                    response = await self._client.get(url)
+                response.raise_for_status()
+
+                data_json = json_loads(response.content)
+                status_info = check_response_status(data_json)
+                print(f"获取 {id_value} 成功（{status_info}）")
+                return data_json
+
+            except Exception as e:
+                retries += 1
+                if retries <= max_retries:
+                    wait_time = calculate_retry_wait(retries, min_retry_wait, max_retry_wait)
+                    if retry_budget is None or retry_budget.try_consume(wait_time):
+                        print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    print(f"请求 {id_value} 失败: {e}. 本次抓取重试预算已用尽，不再重试")
+                else:
+                    print(f"请求 {id_value} 失败: {e}")
+                return None
+        return None
+
+    async def _crawl(
+        self,
+        id_values: List[str],
+        rate_limiter: HostRateLimiter,
+        max_in_flight: int,
+        max_retries: int,
+        min_retry_wait: int,
+        max_retry_wait: int,
+        retry_budget: Optional[RetryBudget],
+        no_retry_ids: Set[str],
+    ) -> List[Optional[Dict]]:
+        semaphore = asyncio.Semaphore(max(1, max_in_flight))
+        tasks = [
+            self._fetch_one(
+                id_value, rate_limiter, semaphore,
+                0 if id_value in no_retry_ids else max_retries,
+                min_retry_wait, max_retry_wait, retry_budget,
+            )
+            for id_value in id_values
+        ]
+        return await asyncio.gather(*tasks)
+
+    def crawl(
+        self,
+        id_values: List[str],
+        rate_limiter: HostRateLimiter,
+        max_in_flight: int = 4,
+        max_retries: int = 2,
+        min_retry_wait: int = 3,
+        max_retry_wait: int = 5,
+        retry_budget: Optional[RetryBudget] = None,
+        no_retry_ids: Optional[Set[str]] = None,
+    ) -> List[Optional[Dict]]:
+        """
+        抓取多个平台（同步入口）
+
+        Args:
+            id_values: 平台ID列表
+            rate_limiter: 主机限速器（每次请求前预约时间槽，包括重试）
+            max_in_flight: 同时进行中的最大请求数
+            retry_budget: 本次抓取共享的重试预算，耗尽后不再重试
+            no_retry_ids: 只请求一次、不重试的平台ID（熔断半开探测）
+
+        Returns:
+            与 id_values 顺序一致的解码后响应数据列表，失败项为 None
+        """
+        return self._submit(
+            self._crawl(
+                id_values, rate_limiter, max_in_flight,
+                max_retries, min_retry_wait, max_retry_wait,
+                retry_budget, no_retry_ids or set(),
+            )
+        )
+
+    def close(self) -> None:
+        """关闭客户端并停止事件循环"""
+        if not self._loop.is_running():
+            return
+        try:
+            self._submit(self._client.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+
+
+# 全局引擎实例（跨抓取周期复用连接池）
+_engine: Optional[AsyncFetchEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_async_fetch_engine(
+    proxy_url: Optional[str] = None,
+    http2: bool = False,
+    max_connections: int = 10,
+) -> Optional[AsyncFetchEngine]:
+    """
+    获取全局异步抓取引擎
+
+    httpx 未安装时返回 None（调用方回退到同步抓取）；
+    代理或 HTTP/2 配置变化时重建引擎
+    """
+    global _engine
+    if not HTTPX_AVAILABLE:
+        print("⚠️ httpx 未安装，FETCH_BACKEND=async 回退为同步抓取")
+        return None
+
+    with _engine_lock:
+        if _engine is not None and (
+            _engine.proxy_url != proxy_url
+            or _engine.http2 != (http2 and HTTP2_AVAILABLE)
+            or _engine.max_connections < max_connections
+        ):
+            _engine.close()
+            _engine = None
+        if _engine is None:
+            _engine = AsyncFetchEngine(
+                proxy_url=proxy_url, http2=http2, max_connections=max_connections
+            )
+        return _engine
+
+
+def close_async_fetch_engine() -> None:
+    """关闭全局异步抓取引擎"""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.close()
+            _engine = None
@@ -0,0 +1,148 @@
+"""
+平台熔断器与重试预算
+
+按平台ID维护熔断状态：连续失败达到阈值后熔断（open），冷却期内直接跳过该平台；
+冷却结束后进入半开（half_open），仅允许一次探测请求，成功则恢复（closed）。
+重试预算限制单次抓取中所有平台重试等待的总时长
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """单平台熔断器（线程安全）"""
+
+    def __init__(self, failure_threshold: int = 3, cooldown_seconds: float = 600):
+        """
+        初始化熔断器
+
+        Args:
+            failure_threshold: 连续失败多少次后熔断
+            cooldown_seconds: 熔断冷却时间（秒）
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """当前状态（冷却结束的 open 视为 half_open）"""
+        with self._lock:
+            return self._current_state()
+
+    @property
+    def consecutive_failures(self) -> int:
+        """连续失败次数"""
+        with self._lock:
+            return self._consecutive_failures
+
+    def _current_state(self) -> str:
+        if (
+            self._state == STATE_OPEN
+            and self._opened_at is not None
+            and time.monotonic() - self._opened_at >= self.cooldown_seconds
+        ):
+            self._state = STATE_HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """是否允许发起请求（open 状态下拒绝）"""
+        with self._lock:
+            return self._current_state() != STATE_OPEN
+
+    def record_success(self) -> None:
+        """记录一次成功，恢复为 closed"""
+        with self._lock:
+            self._state = STATE_CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        """记录一次失败（半开探测失败或连续失败达到阈值时熔断）"""
+        with self._lock:
+            self._consecutive_failures += 1
+            if (
+                self._current_state() == STATE_HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            ):
+                self._state = STATE_OPEN
+                self._opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry:
+    """平台熔断器注册表（进程内跨抓取周期共享）"""
+
+    def __init__(self, failure_threshold: int = 3, cooldown_seconds: float = 600):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, platform_id: str) -> CircuitBreaker:
+        """获取（或创建）平台熔断器"""
+        with self._lock:
+            breaker = self._breakers.get(platform_id)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.cooldown_seconds)
+                self._breakers[platform_id] = breaker
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        """所有平台的熔断状态"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {platform_id: breaker.state for platform_id, breaker in breakers.items()}
+
+
+class RetryBudget:
+    """单次抓取的重试等待时间预算（线程安全）"""
+
+    def __init__(self, budget_seconds: float):
+        """
+        初始化重试预算
+
+        Args:
+            budget_seconds: 本次抓取允许用于重试等待的总秒数（<=0 表示不允许重试等待）
+        """
+        self.budget_seconds = budget_seconds
+        self._lock = threading.Lock()
+        self._spent = 0.0
+
+    @property
+    def remaining(self) -> float:
+        """剩余预算（秒）"""
+        with self._lock:
+            return max(0.0, self.budget_seconds - self._spent)
+
+    def try_consume(self, wait_time: float) -> bool:
+        """尝试扣除一次重试等待时间，预算不足时返回 False"""
+        with self._lock:
+            if self._spent + wait_time > self.budget_seconds:
+                return False
+            self._spent += wait_time
+            return True
+
+
+# 全局熔断器注册表
+_registry: Optional[CircuitBreakerRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker_registry(
+    failure_threshold: int = 3,
+    cooldown_seconds: float = 600,
+) -> CircuitBreakerRegistry:
+    """获取全局熔断器注册表（首次调用时按参数创建）"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = CircuitBreakerRegistry(failure_threshold, cooldown_seconds)
+        return _registry
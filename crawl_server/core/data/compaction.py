@@ -0,0 +1,258 @@
+"""
+历史日期目录压缩归档
+
+超过保留天数的日期目录，把 txt/ 与 html/ 下的文件分别合并为 txt.pack / html.pack
+（单文件、成员独立压缩、带偏移索引，见 core.utils.day_archive），然后删除原目录，
+减少文件数与磁盘占用。读取方按原路径透明读取归档中的成员
+
+后台线程定期检查（COMPACT_AFTER_DAYS > 0 时启用）。每个副本都会启动归档线程：
+- 压缩一个日期前先获取该日期的文件锁（output/.locks/compact-<日期>.lock），已被其他进程持有时跳过该日期
+- 归档写入唯一命名的临时文件后重命名发布
+- 删除原文件前重新读取已发布的归档，逐个成员校验解压结果与原文件一致，只删除校验通过的文件
+"""
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+from crawl_server.configs import CrawlConfig
+from crawl_server.core.utils import get_beijing_time
+from crawl_server.core.utils.day_archive import (
+    archive_path_for,
+    list_members,
+    member_info,
+    read_archive_member,
+    read_member_bytes,
+    write_archive,
+)
+from crawl_server.core.utils.manifest import (
+    MANIFEST_FILENAME,
+    OutputManifest,
+    date_folder_to_str,
+)
+
+# 后台检查间隔（秒）
+COMPACT_CHECK_INTERVAL = 6 * 3600
+
+# 归档的子目录
+COMPACT_SUBDIRS = ("txt", "html")
+
+
+def _iter_members(directory: Path, names: List[str]) -> Iterator[Tuple[str, bytes, int]]:
+    """逐个读取待归档成员（目录中的文件与已有归档中的成员合并）"""
+    for name in names:
+        path = directory / name
+        _, mtime_ns = member_info(path)
+        yield name, read_member_bytes(path), mtime_ns
+
+
+def _verify_and_remove(directory: Path, names: List[str]) -> None:
+    """
+    逐个校验已发布归档中的成员与目录中的原文件一致，校验通过后删除原文件
+
+    只删除参与本次归档的文件；目录中不再有文件时删除目录
+
+    Raises:
+        RuntimeError: 归档缺少成员或成员内容与原文件不一致（此时不删除任何文件）
+    """
+    archive_path = archive_path_for(directory)
+    sources = [directory / name for name in names if (directory / name).is_file()]
+    for path in sources:
+        with open(path, "rb") as f:
+            raw = f.read()
+        if read_archive_member(archive_path, path.name) != raw:
+            raise RuntimeError(f"归档校验失败，成员缺失或内容不一致: {path.name}")
+
+    for path in sources:
+        path.unlink()
+    try:
+        directory.rmdir()
+    except OSError:
+        # 归档期间又写入了文件：保留目录，下次归档时合并
+        pass
+
+
+def compact_directory(directory: Path) -> int:
+    """
+    将目录归档为同级的 .pack 文件并删除原文件（校验通过后）
+
+    目录与归档同时存在（上次压缩中断或归档后又写入了文件）时合并两者
+
+    Returns:
+        归档成员数（目录不存在或为空时为 0）
+    """
+    if not directory.is_dir():
+        return 0
+
+    members = sorted(
+        path.name for path in list_members(directory, lambda name: not name.endswith(".tmp"))
+    )
+    if members:
+        index = write_archive(archive_path_for(directory), _iter_members(directory, members))
+        missing = set(members) - set(index)
+        if missing:
+            raise RuntimeError(f"归档校验失败，缺少成员: {sorted(missing)}")
+        _verify_and_remove(directory, members)
+    else:
+        shutil.rmtree(directory, ignore_errors=True)
+    return len(members)
+
+
+def _try_lock_day(day_dir: Path) -> Optional[int]:
+    """获取日期归档锁（不阻塞），成功返回文件描述符，已被其他进程持有时返回 None"""
+    lock_dir = day_dir.parent / ".locks"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_dir / f"compact-{day_dir.name}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+    if not FCNTL_AVAILABLE:
+        return fd
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd
+    except OSError:
+        os.close(fd)
+        return None
+
+
+def _unlock_day(fd: int) -> None:
+    try:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def compact_day(day_dir: Path) -> int:
+    """
+    压缩归档一个日期目录（持有该日期的归档锁；其他进程正在归档时跳过）
+
+    Returns:
+        归档的文件数
+    """
+    lock_fd = _try_lock_day(day_dir)
+    if lock_fd is None:
+        print(f"🗜️ {day_dir.name} 正由其他进程归档，跳过")
+        return 0
+    try:
+        return _compact_day_locked(day_dir)
+    finally:
+        _unlock_day(lock_fd)
+
+
+def _compact_day_locked(day_dir: Path) -> int:
+    archived = 0
+    for subdir in COMPACT_SUBDIRS:
+        archived += compact_directory(day_dir / subdir)
+
+    if archived:
+        # 聚合状态只服务于当天，历史日期不再需要
+        shutil.rmtree(day_dir / ".state", ignore_errors=True)
+        # 清单中的文件大小改为归档后的大小
+        manifest = OutputManifest(day_dir.parent)
+        try:
+            (day_dir / MANIFEST_FILENAME).unlink()
+        except FileNotFoundError:
+            pass
+        manifest.load_day(day_dir.name)
+    return archived
+
+
+def compact_old_days(output_dir: Path, keep_days: int, today: Optional[datetime] = None) -> List[str]:
+    """
+    压缩归档超过保留天数的日期目录
+
+    Args:
+        output_dir: 输出根目录
+        keep_days: 保留天数（早于今天 keep_days 天以上的日期被归档）
+        today: 当前日期，默认北京时间
+
+    Returns:
+        本次归档的日期文件夹名
+    """
+    if not output_dir.is_dir():
+        return []
+    today_date = (today or get_beijing_time()).date()
+
+    compacted = []
+    for day_dir in sorted(output_dir.iterdir()):
+        date_str = date_folder_to_str(day_dir.name)
+        if not date_str or not day_dir.is_dir():
+            continue
+        age = (today_date - datetime.strptime(date_str, "%Y%m%d").date()).days
+        if age <= keep_days:
+            continue
+        if not any((day_dir / subdir).is_dir() for subdir in COMPACT_SUBDIRS):
+            continue
+        try:
+            archived = compact_day(day_dir)
+            if archived:
+                print(f"🗜️ 已归档 {day_dir.name}: {archived} 个文件")
+                compacted.append(day_dir.name)
+        except Exception as e:
+            print(f"❌ 归档 {day_dir.name} 失败: {e}")
+    return compacted
+
+
+class DayCompactor:
+    """后台归档线程"""
+
+    def __init__(self, keep_days: int, output_dir: Optional[Path] = None, interval: float = COMPACT_CHECK_INTERVAL):
+        """
+        初始化归档线程
+
+        Args:
+            keep_days: 保留天数
+            output_dir: 输出根目录，默认 output
+            interval: 检查间隔（秒）
+        """
+        self.keep_days = keep_days
+        self.output_dir = output_dir or Path("output")
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="day-compactor", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                compact_old_days(self.output_dir, self.keep_days)
+            except Exception as e:
+                print(f"❌ 历史归档出错: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """停止线程（正在归档的日期会完成）"""
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+
+
+# 全局归档线程
+_day_compactor: Optional[DayCompactor] = None
+_day_compactor_lock = threading.Lock()
+
+
+def start_day_compactor(crawl_config: CrawlConfig) -> Optional[DayCompactor]:
+    """启动全局归档线程（COMPACT_AFTER_DAYS <= 0 时不启用）"""
+    global _day_compactor
+    if crawl_config.COMPACT_AFTER_DAYS <= 0:
+        return None
+    with _day_compactor_lock:
+        if _day_compactor is None:
+            _day_compactor = DayCompactor(crawl_config.COMPACT_AFTER_DAYS)
+        return _day_compactor
+
+
+def shutdown_day_compactor(timeout: float = 60) -> None:
+    """停止全局归档线程"""
+    global _day_compactor
+    with _day_compactor_lock:
+        if _day_compactor is not None:
+            _day_compactor.stop(timeout=timeout)
+            _day_compactor = None
@@ -0,0 +1,223 @@
+"""
+当日增量聚合状态
+
+将当天所有快照的合并结果（all_results / id_to_name / title_info）持久化为
+output/<日期>/.state/aggregate.pkl（pickle 二进制），读取时只解析尚未合并的新快照：
+
+- 已合并快照记录为 [(文件名, 大小, 修改时间), ...]，磁盘上的快照列表以其为前缀时增量合并新文件
+- 状态文件缺失、损坏、版本不符，或已合并的快照被改写/删除时，从 txt 快照完整重建
+- 合并每个快照前先与已有标题（即当日已见标题索引）比对，记录最新快照的新增标题，
+  新增标题检测无需重新扫描当天历史；同一批快照的检测结果在进程内缓存，同一周期内各调用方共享
+- 记录最近 TOUCHED_LOG_SIZE 个快照各自涉及的标题，作为聚合版本（DayRevision）供增量统计
+  只重算变化的标题
+"""
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from crawl_server.core.data.parser import parse_file_titles, process_source_data
+from crawl_server.core.data.snapshot_store import list_snapshot_files, snapshot_time_label
+from crawl_server.core.utils.day_archive import member_info
+
+# 状态格式版本（结构变化时递增，旧状态自动重建）
+AGGREGATE_VERSION = 3
+
+# 保留各自涉及标题的最近快照数（更早的快照只记 None）
+TOUCHED_LOG_SIZE = 16
+
+# 新增标题检测结果缓存 {txt 目录: (已合并快照列表, 新增标题)}
+_new_titles_memo: Dict[str, Tuple[Tuple, Dict]] = {}
+_new_titles_memo_lock = threading.Lock()
+
+
+class DayRevision(NamedTuple):
+    """当日聚合版本：已合并的快照及最近快照涉及的标题"""
+    date_folder: str
+    files: Tuple[Tuple[str, int, int], ...]
+    # 与 files 对齐：{source_id: (title, ...)}，超出 TOUCHED_LOG_SIZE 的早期快照为 None
+    touched: Tuple[Optional[Dict[str, Tuple[str, ...]]], ...]
+
+    def changes_since(self, files: Tuple) -> Optional[List[Tuple[str, str]]]:
+        """
+        自 files（更早的聚合版本）以来涉及的 (source_id, title)，按合并顺序排列
+
+        files 不是当前版本的前缀，或中间快照的记录已丢弃时返回 None
+        """
+        if self.files[:len(files)] != tuple(files):
+            return None
+        changes = []
+        for touched in self.touched[len(files):]:
+            if touched is None:
+                return None
+            for source_id, titles in touched.items():
+                changes.extend((source_id, title) for title in titles)
+        return changes
+
+
+# 各线程最近一次同步得到的聚合版本 {txt 目录: DayRevision}（按线程记录，与该线程读到的数据一致）
+_thread_revisions = threading.local()
+
+
+class DayAggregate:
+    """单日聚合状态"""
+
+    def __init__(self, date_folder: str, output_dir: Optional[Path] = None):
+        """
+        初始化聚合状态
+
+        Args:
+            date_folder: 日期文件夹名（format_date_folder()）
+            output_dir: 输出根目录，默认 output
+        """
+        day_dir = (output_dir or Path("output")) / date_folder
+        self.txt_dir = day_dir / "txt"
+        self.state_file = day_dir / ".state" / "aggregate.pkl"
+
+    def _snapshot_files(self) -> List[Tuple[str, int, int]]:
+        """当天的快照文件（按时间标签排序）及其大小、修改时间"""
+        files = []
+        for path in list_snapshot_files(self.txt_dir):
+            size, mtime_ns = member_info(path)
+            files.append((path.name, size, mtime_ns))
+        return files
+
+    def _read_state(self) -> Optional[Dict]:
+        """读取持久化状态（缺失、损坏或版本不符时返回 None）"""
+        if not self.state_file.exists():
+            return None
+        try:
+            with open(self.state_file, "rb") as f:
+                state = pickle.load(f)
+            if isinstance(state, dict) and state.get("version") == AGGREGATE_VERSION:
+                return state
+        except Exception as e:
+            print(f"读取当日聚合状态失败，将从快照重建: {e}")
+        return None
+
+    def _write_state(self, state: Dict) -> None:
+        """写入状态（唯一临时文件 + 重命名，多个进程同时写入时互不覆盖临时文件）"""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.state_file.parent, prefix=f".{self.state_file.name}.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, self.state_file)
+            except BaseException:
+                try:
+                    os.remove(tmp_name)
+                except OSError:
+                    pass
+                raise
+        except Exception as e:
+            print(f"保存当日聚合状态失败: {e}")
+
+    def load(self) -> Tuple[Dict, Dict, Dict]:
+        """
+        加载当日聚合结果（增量合并新快照后返回）
+
+        Returns:
+            (all_results, id_to_name, title_info) 元组，未按平台过滤
+        """
+        state = self._sync(self._snapshot_files())
+        return state["all_results"], state["id_to_name"], state["title_info"]
+
+    def latest_new_titles(self) -> Dict:
+        """
+        最新快照相对当天更早快照的新增标题（当天不足两个快照时为空）
+
+        Returns:
+            {source_id: {title: {ranks, url, mobileUrl}}}，未按平台过滤
+        """
+        files = self._snapshot_files()
+        memo_key = str(self.txt_dir)
+        with _new_titles_memo_lock:
+            memo = _new_titles_memo.get(memo_key)
+        if memo and memo[0] == tuple(files):
+            return memo[1]
+
+        state = self._sync(files)
+        return state["latest_new_titles"] if len(state["files"]) >= 2 else {}
+
+    def revision(self) -> Optional[DayRevision]:
+        """当前线程最近一次加载（load）时的聚合版本，未加载过时返回 None"""
+        return getattr(_thread_revisions, "by_dir", {}).get(str(self.txt_dir))
+
+    def _sync(self, files: List[Tuple[str, int, int]]) -> Dict:
+        """读取状态并合并尚未合并的快照，有变化时写回"""
+        state = self._read_state()
+        applied = state["files"] if state else None
+
+        if applied is None or files[:len(applied)] != applied:
+            if applied is not None:
+                print("当日快照与聚合状态不一致，从快照重建")
+            state = {
+                "version": AGGREGATE_VERSION,
+                "files": [],
+                "all_results": {},
+                "id_to_name": {},
+                "title_info": {},
+                "latest_new_titles": {},
+                "touched": [],
+            }
+
+        pending = files[len(state["files"]):]
+        for file_name, size, mtime_ns in pending:
+            titles_by_id, file_id_to_name = parse_file_titles(self.txt_dir / file_name)
+            state["id_to_name"].update(file_id_to_name)
+            time_info = snapshot_time_label(file_name)
+            all_results = state["all_results"]
+
+            # 合并前比对已见标题，得到该快照的新增标题
+            new_titles = {}
+            for source_id, title_data in titles_by_id.items():
+                seen_titles = all_results.get(source_id, {})
+                source_new_titles = {
+                    title: data for title, data in title_data.items() if title not in seen_titles
+                }
+                if source_new_titles:
+                    new_titles[source_id] = source_new_titles
+            state["latest_new_titles"] = new_titles
+
+            for source_id, title_data in titles_by_id.items():
+                process_source_data(
+                    source_id, title_data, time_info, all_results, state["title_info"]
+                )
+            state["files"].append((file_name, size, mtime_ns))
+            touched = state["touched"]
+            touched.append({source_id: tuple(title_data) for source_id, title_data in titles_by_id.items()})
+            if len(touched) > TOUCHED_LOG_SIZE:
+                touched[-TOUCHED_LOG_SIZE - 1] = None
+
+        if pending:
+            self._write_state(state)
+
+        latest_new_titles = state["latest_new_titles"] if len(state["files"]) >= 2 else {}
+        with _new_titles_memo_lock:
+            _new_titles_memo[str(self.txt_dir)] = (tuple(state["files"]), latest_new_titles)
+        if not hasattr(_thread_revisions, "by_dir"):
+            _thread_revisions.by_dir = {}
+        _thread_revisions.by_dir[str(self.txt_dir)] = DayRevision(
+            self.txt_dir.parent.name, tuple(state["files"]), tuple(state["touched"])
+        )
+        return state
+
+
+def load_day_aggregate(date_folder: str, output_dir: Optional[Path] = None) -> Tuple[Dict, Dict, Dict]:
+    """加载指定日期的聚合结果（all_results, id_to_name, title_info）"""
+    return DayAggregate(date_folder, output_dir).load()
+
+
+def get_day_revision(date_folder: str, output_dir: Optional[Path] = None) -> Optional[DayRevision]:
+    """指定日期在当前线程最近一次加载时的聚合版本"""
+    return DayAggregate(date_folder, output_dir).revision()
+
+
+def detect_day_new_titles(date_folder: str, output_dir: Optional[Path] = None) -> Dict:
+    """检测指定日期最新快照的新增标题"""
+    return DayAggregate(date_folder, output_dir).latest_new_titles()
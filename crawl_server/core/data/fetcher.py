@@ -3,23 +3,55 @@
 
 负责从API获取新闻数据
 """
-import json
-import random
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional, Union
 
 import requests
 
 from crawl_server.configs import CrawlConfig
+from crawl_server.core.utils import json_loads
+from crawl_server.core.data.circuit_breaker import (
+    STATE_HALF_OPEN,
+    CircuitBreaker,
+    RetryBudget,
+    get_circuit_breaker_registry,
+)
+from crawl_server.core.data.fingerprint import get_fingerprint_store
+from crawl_server.core.data.records import TitleRecord
+from crawl_server.core.data.newsnow_client import (
+    HostRateLimiter,
+    create_http_session,
+    request_platform_json,
+)
+
+# 进程内共享的 HTTP 会话（连接池 + keep-alive），避免每个平台重新握手
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session(pool_size: int = 10) -> requests.Session:
+    """获取进程内共享的 requests 会话（首次调用时创建）"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_http_session(pool_size)
+        return _session
+
+
+def close_http_session() -> None:
+    """关闭共享的 requests 会话"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+# 各平台最近一次成功抓取的解析结果（调度器跳过的平台沿用）
+_last_results: Dict[str, Dict] = {}
+_last_results_lock = threading.Lock()
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
-    "Accept": "*/*",
-    "Referer": "https://newsnow.busiyi.world/",
-    "Connection": "keep-alive",
-    "DNT": "1",
-    "X-Requested-With": "XMLHttpRequest",
-}
 
 class DataFetcher:
     """数据获取器"""
@@ -34,6 +66,28 @@ class DataFetcher:
         """
         self.proxy_url = proxy_url
         self.crawl_config = crawl_config
+        # 最近一次 crawl_websites 的平台指纹及未变化的平台（供下游跳过重复处理）
+        self.last_fingerprints: Dict[str, str] = {}
+        self.last_unchanged_ids: List[str] = []
+        # 最近一次 crawl_websites 中失败平台的熔断状态 {platform_id: state}
+        self.last_circuit_states: Dict[str, str] = {}
+
+    def _get_breaker(self, id_value: str) -> CircuitBreaker:
+        """获取平台熔断器（进程内跨抓取周期共享）"""
+        if self.crawl_config:
+            registry = get_circuit_breaker_registry(
+                self.crawl_config.CIRCUIT_FAILURE_THRESHOLD,
+                self.crawl_config.CIRCUIT_COOLDOWN_SECONDS,
+            )
+        else:
+            registry = get_circuit_breaker_registry()
+        return registry.get(id_value)
+
+    def _new_retry_budget(self) -> Optional[RetryBudget]:
+        """创建本次抓取的重试预算（未配置时不限制）"""
+        if not self.crawl_config or self.crawl_config.RETRY_BUDGET_SECONDS < 0:
+            return None
+        return RetryBudget(self.crawl_config.RETRY_BUDGET_SECONDS)
 
     def fetch_data(
         self,
@@ -41,112 +95,272 @@ class DataFetcher:
         max_retries: int = 2,
         min_retry_wait: int = 3,
         max_retry_wait: int = 5,
-    ) -> Tuple[Optional[str], str, str]:
-        """获取指定ID数据，支持重试"""
+        rate_limiter: Optional[HostRateLimiter] = None,
+        retry_budget: Optional[RetryBudget] = None,
+    ) -> Tuple[Optional[Dict], str, str]:
+        """
+        获取指定ID数据，支持重试（响应只解码一次）
+        
+        Args:
+            id_info: 平台ID 或 (平台ID, 名称)
+            max_retries: 最大重试次数
+            min_retry_wait: 最小重试等待（秒）
+            max_retry_wait: 最大重试等待（秒）
+            rate_limiter: 主机限速器（每次请求前获取时间槽，包括重试）
+            retry_budget: 本次抓取共享的重试预算，耗尽后不再重试
+
+        Returns:
+            (解码后的响应数据, 平台ID, 别名)，失败时响应数据为 None
+        """
         if isinstance(id_info, tuple):
             id_value, alias = id_info
         else:
             id_value = id_info
             alias = id_value
 
-        url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
+        breaker = self._get_breaker(id_value)
+        if not breaker.allow_request():
+            print(f"⚡ {id_value} 处于熔断状态（连续失败 {breaker.consecutive_failures} 次），跳过请求")
+            return None, id_value, alias
+        if breaker.state == STATE_HALF_OPEN:
+            # 半开状态只做一次探测请求，不重试
+            print(f"⚡ {id_value} 熔断冷却结束，发起探测请求")
+            max_retries = 0
 
+        pool_size = self.crawl_config.CRAWL_CONCURRENCY if self.crawl_config else 1
         proxies = None
         if self.proxy_url:
             proxies = {"http": self.proxy_url, "https": self.proxy_url}
 
-        retries = 0
-        while retries <= max_retries:
-            try:
-                response = requests.get(
-                    url, proxies=proxies, headers=HEADERS, timeout=10
-                )
-                response.raise_for_status()
-
-                data_text = response.text
-                data_json = json.loads(data_text)
-
-                status = data_json.get("status", "未知")
-                if status not in ["success", "cache"]:
-                    raise ValueError(f"响应状态异常: {status}")
-
-                status_info = "最新数据" if status == "success" else "缓存数据"
-                print(f"获取 {id_value} 成功（{status_info}）")
-                return data_text, id_value, alias
-
-            except Exception as e:
-                retries += 1
-                if retries <= max_retries:
-                    base_wait = random.uniform(min_retry_wait, max_retry_wait)
-                    additional_wait = (retries - 1) * random.uniform(1, 2)
-                    wait_time = base_wait + additional_wait
-                    print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
-                    time.sleep(wait_time)
+        data_json = request_platform_json(
+            get_http_session(pool_size),
+            id_value,
+            max_retries=max_retries,
+            min_retry_wait=min_retry_wait,
+            max_retry_wait=max_retry_wait,
+            rate_limiter=rate_limiter,
+            proxies=proxies,
+            allow_retry=retry_budget.try_consume if retry_budget is not None else None,
+            loads=json_loads,
+        )
+        if data_json is None:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return data_json, id_value, alias
+
+    def _parse_response(self, id_value: str, data_json: Dict) -> Optional[Dict[str, TitleRecord]]:
+        """将解码后的响应规范化为 {title: TitleRecord}，失败返回 None"""
+        try:
+            titles = {}
+            for index, item in enumerate(data_json.get("items", []), 1):
+                title = item.get("title")
+                # 跳过无效标题（None、float、空字符串）
+                if title is None or isinstance(title, float) or not str(title).strip():
+                    continue
+                title = str(title).strip()
+
+                record = titles.get(title)
+                if record is not None:
+                    record.ranks.append(index)
                 else:
-                    print(f"请求 {id_value} 失败: {e}")
-                    return None, id_value, alias
-        return None, id_value, alias
+                    titles[title] = TitleRecord(
+                        id_value,
+                        title,
+                        [index],
+                        item.get("url", ""),
+                        item.get("mobileUrl", ""),
+                    )
+            return titles
+        except Exception as e:
+            print(f"处理 {id_value} 数据出错: {e}")
+        return None
+
+    def _fetch_and_parse(
+        self,
+        id_info: Union[str, Tuple[str, str]],
+        rate_limiter: HostRateLimiter,
+        retry_budget: Optional[RetryBudget] = None,
+    ) -> Optional[Dict]:
+        """获取并解析单个平台数据（供顺序和并发模式共用）"""
+        data_json, id_value, _ = self.fetch_data(
+            id_info, rate_limiter=rate_limiter, retry_budget=retry_budget
+        )
+        if data_json is None:
+            return None
+        return self._parse_response(id_value, data_json)
+
+    def _get_async_engine(self):
+        """按 FETCH_BACKEND 配置获取共享的异步抓取引擎，未启用或不可用时返回 None"""
+        if not self.crawl_config or self.crawl_config.FETCH_BACKEND != "async":
+            return None
+
+        # 延迟导入，避免循环导入
+        from crawl_server.core.data.async_fetcher import get_async_fetch_engine
+
+        return get_async_fetch_engine(
+            proxy_url=self.proxy_url,
+            http2=self.crawl_config.FETCH_HTTP2,
+            max_connections=self.crawl_config.CRAWL_CONCURRENCY,
+        )
+
+    def _crawl_async(
+        self,
+        engine,
+        id_values: List[str],
+        rate_limiter: HostRateLimiter,
+        retry_budget: Optional[RetryBudget],
+        max_workers: int,
+    ) -> List[Optional[Dict]]:
+        """通过异步引擎抓取并解析，熔断判断与结果记录与同步路径一致"""
+        breakers = {id_value: self._get_breaker(id_value) for id_value in id_values}
+        request_ids = []
+        probe_ids = set()
+        for id_value, breaker in breakers.items():
+            if not breaker.allow_request():
+                print(f"⚡ {id_value} 处于熔断状态（连续失败 {breaker.consecutive_failures} 次），跳过请求")
+                continue
+            if breaker.state == STATE_HALF_OPEN:
+                print(f"⚡ {id_value} 熔断冷却结束，发起探测请求")
+                probe_ids.add(id_value)
+            request_ids.append(id_value)
+
+        responses = dict(zip(
+            request_ids,
+            engine.crawl(
+                request_ids,
+                rate_limiter,
+                max_in_flight=max_workers,
+                retry_budget=retry_budget,
+                no_retry_ids=probe_ids,
+            ),
+        ))
+
+        parsed_list = []
+        for id_value in id_values:
+            if id_value not in responses:
+                parsed_list.append(None)
+                continue
+            if responses[id_value] is not None:
+                breakers[id_value].record_success()
+                parsed_list.append(self._parse_response(id_value, responses[id_value]))
+            else:
+                breakers[id_value].record_failure()
+                parsed_list.append(None)
+        return parsed_list
 
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
         request_interval: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        fetch_ids: Optional[List[str]] = None,
+        track_changes: bool = True,
     ) -> Tuple[Dict, Dict, List]:
-        """爬取多个网站数据"""
+        """
+        爬取多个网站数据
+        
+        Args:
+            ids_list: 平台列表，元素为平台ID 或 (平台ID, 名称)
+            request_interval: 请求间隔（毫秒），对共享的 newsnow 主机全局生效
+            max_workers: 最大并发请求数，1 表示顺序抓取（默认读取 CRAWL_CONCURRENCY）
+            fetch_ids: 本次实际请求的平台ID（None 表示全部）；其余平台沿用上次抓取结果，
+                       保证快照始终包含所有监控平台（没有历史结果的平台仍会请求）
+            track_changes: 是否更新平台指纹（分片抓取时由合并方统一比对，执行方传 False）
+        
+        Returns:
+            (results, id_to_name, failed_ids) 元组，平台顺序与 ids_list 一致
+        """
         if request_interval is None:
             if not self.crawl_config:
                 raise RuntimeError("CrawlConfig 未提供，无法确定请求间隔")
             request_interval = self.crawl_config.REQUEST_INTERVAL
+        if max_workers is None:
+            max_workers = self.crawl_config.CRAWL_CONCURRENCY if self.crawl_config else 1
+
         results = {}
         id_to_name = {}
         failed_ids = []
+        id_values = []
 
-        for i, id_info in enumerate(ids_list):
+        for id_info in ids_list:
             if isinstance(id_info, tuple):
                 id_value, name = id_info
             else:
                 id_value = id_info
                 name = id_value
-
             id_to_name[id_value] = name
-            response, _, _ = self.fetch_data(id_info)
-
-            if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item.get("title")
-                        # 跳过无效标题（None、float、空字符串）
-                        if title is None or isinstance(title, float) or not str(title).strip():
-                            continue
-                        title = str(title).strip()
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
-                except json.JSONDecodeError:
-                    print(f"解析 {id_value} 响应失败")
-                    failed_ids.append(id_value)
-                except Exception as e:
-                    print(f"处理 {id_value} 数据出错: {e}")
-                    failed_ids.append(id_value)
-            else:
+            id_values.append(id_value)
+
+        # 未到抓取时间的平台沿用上次结果
+        carried = {}
+        if fetch_ids is not None:
+            fetch_set = set(fetch_ids)
+            with _last_results_lock:
+                for id_value in id_values:
+                    if id_value not in fetch_set and id_value in _last_results:
+                        carried[id_value] = _last_results[id_value]
+            if carried:
+                print(f"沿用上次抓取结果的平台: {list(carried.keys())}")
+
+        fetch_list = [
+            id_info for id_info, id_value in zip(ids_list, id_values)
+            if id_value not in carried
+        ]
+        fetch_values = [id_value for id_value in id_values if id_value not in carried]
+        max_workers = max(1, min(max_workers, len(fetch_list)))
+
+        rate_limiter = HostRateLimiter(request_interval)
+        retry_budget = self._new_retry_budget()
+        engine = self._get_async_engine()
+
+        if not fetch_list:
+            parsed_list = []
+        elif engine:
+            print(f"异步抓取 {len(fetch_list)} 个平台，最大并发数 {max_workers}")
+            parsed_list = self._crawl_async(engine, fetch_values, rate_limiter, retry_budget, max_workers)
+        elif max_workers == 1:
+            parsed_list = [
+                self._fetch_and_parse(id_info, rate_limiter, retry_budget) for id_info in fetch_list
+            ]
+        else:
+            print(f"并发抓取 {len(fetch_list)} 个平台，最大并发数 {max_workers}")
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetcher") as executor:
+                parsed_list = list(
+                    executor.map(
+                        lambda id_info: self._fetch_and_parse(id_info, rate_limiter, retry_budget),
+                        fetch_list,
+                    )
+                )
+
+        # 按输入顺序汇总，保证输出与顺序抓取一致
+        parsed_by_id = dict(zip(fetch_values, parsed_list))
+        for id_value in id_values:
+            parsed = carried[id_value] if id_value in carried else parsed_by_id.get(id_value)
+            if parsed is None:
                 failed_ids.append(id_value)
+            else:
+                results[id_value] = parsed
+
+        with _last_results_lock:
+            for id_value in fetch_values:
+                if parsed_by_id.get(id_value) is not None:
+                    _last_results[id_value] = parsed_by_id[id_value]
+
+        if track_changes:
+            fingerprint_store = get_fingerprint_store()
+            self.last_fingerprints = fingerprint_store.update(results)
+            self.last_unchanged_ids = fingerprint_store.unchanged_ids(list(results.keys()))
 
-            if i < len(ids_list) - 1:
-                actual_interval = request_interval + random.randint(-10, 20)
-                actual_interval = max(50, actual_interval)
-                time.sleep(actual_interval / 1000)
+        self.last_circuit_states = {
+            id_value: self._get_breaker(id_value).state for id_value in failed_ids
+        }
 
         print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
+        if failed_ids:
+            print(f"失败平台熔断状态: {self.last_circuit_states}")
+        if self.last_unchanged_ids:
+            print(f"内容未变化的平台: {self.last_unchanged_ids}")
         return results, id_to_name, failed_ids
 
 
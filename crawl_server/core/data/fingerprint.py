@@ -0,0 +1,145 @@
+"""
+平台内容指纹
+
+记录每个平台热榜内容的指纹（有序标题/链接列表的哈希），
+用于识别与上一周期完全相同的平台，下游可跳过或复用已有处理结果
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from crawl_server.core.data.records import title_fields
+from crawl_server.core.utils import get_beijing_time
+
+
+def compute_fingerprint(title_data: Dict) -> str:
+    """
+    计算单个平台数据的内容指纹
+
+    Args:
+        title_data: {title: TitleRecord 或 {ranks, url, mobileUrl}}，按接口返回顺序排列
+
+    Returns:
+        指纹字符串（sha1 十六进制）
+    """
+    digest = hashlib.sha1()
+    for title, info in title_data.items():
+        ranks, url, mobile_url = title_fields(info)
+        digest.update(
+            f"{title}\x1f{','.join(map(str, ranks))}\x1f{url}\x1f{mobile_url}\x1e".encode("utf-8")
+        )
+    return digest.hexdigest()
+
+
+class FingerprintStore:
+    """平台指纹存储（持久化到 output/.crawl_state/fingerprints.json）"""
+
+    def __init__(self, state_dir: Optional[Path] = None):
+        """
+        初始化指纹存储
+
+        Args:
+            state_dir: 状态目录，默认 output/.crawl_state
+        """
+        self.state_dir = state_dir or Path("output") / ".crawl_state"
+        self.state_file = self.state_dir / "fingerprints.json"
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """读取持久化的指纹记录"""
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception as e:
+            print(f"读取平台指纹失败: {e}")
+            return {}
+
+    def _save(self) -> None:
+        """写入指纹记录（临时文件 + 重命名）"""
+        try:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(".json.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self._records, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"保存平台指纹失败: {e}")
+
+    def update(self, results: Dict) -> Dict[str, str]:
+        """
+        比对并更新本周期各平台指纹
+
+        同一平台指纹与上次一致、且上次检查也在今天时视为未变化
+        （跨天后的首次抓取总是视为变化，保证当天数据完整）
+
+        Args:
+            results: 抓取结果 {platform_id: {title: {...}}}
+
+        Returns:
+            {platform_id: fingerprint}，可通过 is_unchanged 查询比对结果
+        """
+        now = get_beijing_time()
+        now_str = now.strftime("%Y-%m-%d %H:%M:%S")
+        today = now.strftime("%Y-%m-%d")
+        fingerprints = {}
+
+        with self._lock:
+            for platform_id, title_data in results.items():
+                fingerprint = compute_fingerprint(title_data)
+                fingerprints[platform_id] = fingerprint
+
+                record = self._records.get(platform_id, {})
+                unchanged = (
+                    record.get("hash") == fingerprint
+                    and record.get("checked_at", "").startswith(today)
+                )
+                self._records[platform_id] = {
+                    "hash": fingerprint,
+                    "checked_at": now_str,
+                    "changed_at": record.get("changed_at", now_str) if unchanged else now_str,
+                    "unchanged": unchanged,
+                }
+            self._save()
+
+        return fingerprints
+
+    def is_unchanged(self, platform_id: str) -> bool:
+        """最近一次比对中该平台是否未变化"""
+        with self._lock:
+            return bool(self._records.get(platform_id, {}).get("unchanged"))
+
+    def unchanged_ids(self, platform_ids: List[str]) -> List[str]:
+        """筛选最近一次比对中未变化的平台ID"""
+        with self._lock:
+            return [
+                platform_id
+                for platform_id in platform_ids
+                if self._records.get(platform_id, {}).get("unchanged")
+            ]
+
+    def get_record(self, platform_id: str) -> Optional[Dict]:
+        """获取平台指纹记录（hash, checked_at, changed_at）"""
+        with self._lock:
+            record = self._records.get(platform_id)
+            return dict(record) if record else None
+
+
+# 全局指纹存储实例（跨抓取周期复用）
+_fingerprint_store: Optional[FingerprintStore] = None
+_fingerprint_store_lock = threading.Lock()
+
+
+def get_fingerprint_store() -> FingerprintStore:
+    """获取全局指纹存储实例"""
+    global _fingerprint_store
+    with _fingerprint_store_lock:
+        if _fingerprint_store is None:
+            _fingerprint_store = FingerprintStore()
+        return _fingerprint_store
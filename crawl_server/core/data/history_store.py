@@ -0,0 +1,279 @@
+"""
+本地历史库（SQLite）
+
+未启用 PostgreSQL 时，MCP / Web 服务查询历史数据需要逐个解析 output/<日期>/txt/ 下的快照。
+启用 HISTORY_DB_ENABLED 后，每次快照提交时同步写入 output/history.db：
+
+- platforms：平台ID与名称
+- titles：按 (平台, 标题) 去重的标题，URL 取首次出现的值
+- snapshots：每个快照的日期、时间标签、文件名、修改时间和内容哈希
+- observations：每个快照中每条标题的位置与排名（URL 与 titles 不同时单独记录）
+- titles_fts：标题的 FTS5 全文索引（trigram 分词，支持中文子串检索；SQLite 不支持时不建立）
+
+读取方（mcp_server / web_server）只读打开，并与清单核对快照是否齐全，不齐全时回退为解析文件。
+已有的 output/ 历史由 backfill 补录（启动时后台执行，也可运行 crawl_server.scripts.backfill_history）
+"""
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from crawl_server.configs import CrawlConfig
+from crawl_server.core.data.snapshot_parser import parse_snapshot_text
+from crawl_server.core.utils.day_archive import member_info
+from crawl_server.core.utils.manifest import date_folder_to_str
+
+HISTORY_DB_FILENAME = "history.db"
+HISTORY_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS platforms (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS titles (
+    id INTEGER PRIMARY KEY,
+    platform_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    mobile_url TEXT NOT NULL DEFAULT '',
+    first_date TEXT NOT NULL,
+    UNIQUE (platform_id, title)
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    file TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    UNIQUE (date, time)
+);
+CREATE TABLE IF NOT EXISTS observations (
+    snapshot_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    title_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    url TEXT,
+    mobile_url TEXT,
+    PRIMARY KEY (snapshot_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_observations_title ON observations (title_id);
+"""
+
+_FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS titles_fts USING fts5(title, content='titles', content_rowid='id', tokenize='trigram')"
+
+
+def _detect_fts5() -> bool:
+    """当前 SQLite 是否支持 FTS5 trigram 分词（3.34+）"""
+    try:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(x, tokenize='trigram')")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+FTS5_AVAILABLE = _detect_fts5()
+
+
+def date_folder_to_iso(date_folder: str) -> Optional[str]:
+    """日期文件夹名（YYYY年MM月DD日）转为 YYYY-MM-DD，格式无效时返回 None"""
+    date_str = date_folder_to_str(date_folder)
+    if not date_str:
+        return None
+    return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
+
+
+class HistoryStore:
+    """本地历史库（写入端）"""
+
+    def __init__(self, db_path: Path):
+        """
+        初始化历史库（不存在时建表）
+
+        Args:
+            db_path: 数据库路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            if FTS5_AVAILABLE:
+                self._conn.execute(_FTS_SCHEMA)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("schema_version", str(HISTORY_SCHEMA_VERSION)), ("fts", "1" if FTS5_AVAILABLE else "0")],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def record_snapshot(self, path, content: str, content_hash: Optional[str] = None) -> bool:
+        """
+        写入一个快照（同一日期与时间已存在时覆盖）
+
+        Args:
+            path: 快照路径（output/<日期>/txt/<时间><后缀>）
+            content: 快照文本
+            content_hash: 快照文本的 sha1，默认按内容计算
+
+        Returns:
+            是否写入（内容未变化时为 False）
+        """
+        with self._lock, self._conn:
+            return self._record(Path(path), content, content_hash)
+
+    def _record(self, path: Path, content: str, content_hash: Optional[str] = None) -> bool:
+        """写入一个快照（调用方持有锁并处于事务中）"""
+        from crawl_server.core.data.snapshot_store import snapshot_time_label
+
+        date = date_folder_to_iso(path.parent.parent.name)
+        if not date:
+            return False
+        time_info = snapshot_time_label(path)
+        content_hash = content_hash or hashlib.sha1(content.encode("utf-8")).hexdigest()
+        mtime = member_info(path)[1] / 1e9
+
+        conn = self._conn
+        row = conn.execute("SELECT id, content_hash FROM snapshots WHERE date = ? AND time = ?", (date, time_info)).fetchone()
+        if row and row[1] == content_hash:
+            conn.execute("UPDATE snapshots SET file = ?, mtime = ? WHERE id = ?", (path.name, mtime, row[0]))
+            return False
+        if row:
+            snapshot_id = row[0]
+            conn.execute("DELETE FROM observations WHERE snapshot_id = ?", (snapshot_id,))
+            conn.execute(
+                "UPDATE snapshots SET file = ?, mtime = ?, content_hash = ? WHERE id = ?",
+                (path.name, mtime, content_hash, snapshot_id),
+            )
+        else:
+            snapshot_id = conn.execute(
+                "INSERT INTO snapshots (date, time, file, mtime, content_hash) VALUES (?, ?, ?, ?, ?)",
+                (date, time_info, path.name, mtime, content_hash),
+            ).lastrowid
+
+        titles_by_id, id_to_name = parse_snapshot_text(content)
+        conn.executemany("INSERT OR REPLACE INTO platforms (id, name) VALUES (?, ?)", id_to_name.items())
+
+        observations = []
+        for platform_id, titles in titles_by_id.items():
+            for title, info in titles.items():
+                url, mobile_url = info.get("url", ""), info.get("mobileUrl", "")
+                title_id, known_url, known_mobile_url = self._title_id(platform_id, title, url, mobile_url, date)
+                observations.append((
+                    snapshot_id,
+                    len(observations),
+                    title_id,
+                    info["ranks"][0],
+                    url if url != known_url else None,
+                    mobile_url if mobile_url != known_mobile_url else None,
+                ))
+        conn.executemany(
+            "INSERT INTO observations (snapshot_id, seq, title_id, rank, url, mobile_url) VALUES (?, ?, ?, ?, ?, ?)",
+            observations,
+        )
+        return True
+
+    def _title_id(self, platform_id: str, title: str, url: str, mobile_url: str, date: str) -> Tuple[int, str, str]:
+        """标题ID及其记录的 URL（不存在时新增并写入全文索引）"""
+        row = self._conn.execute(
+            "SELECT id, url, mobile_url FROM titles WHERE platform_id = ? AND title = ?", (platform_id, title)
+        ).fetchone()
+        if row:
+            return row
+        title_id = self._conn.execute(
+            "INSERT INTO titles (platform_id, title, url, mobile_url, first_date) VALUES (?, ?, ?, ?, ?)",
+            (platform_id, title, url, mobile_url, date),
+        ).lastrowid
+        if FTS5_AVAILABLE:
+            self._conn.execute("INSERT INTO titles_fts (rowid, title) VALUES (?, ?)", (title_id, title))
+        return title_id, url, mobile_url
+
+    def backfill(self, output_dir: Path) -> int:
+        """
+        补录 output/ 下尚未写入（或修改时间已变化）的快照，每个日期一个事务
+
+        Returns:
+            写入的快照数
+        """
+        from crawl_server.core.data.snapshot_store import list_snapshot_files, read_snapshot_text, snapshot_time_label
+
+        output_dir = Path(output_dir)
+        if not output_dir.is_dir():
+            return 0
+
+        total = 0
+        for day_dir in sorted(output_dir.iterdir()):
+            date = date_folder_to_iso(day_dir.name)
+            if not date or not day_dir.is_dir():
+                continue
+            with self._lock:
+                known = dict(self._conn.execute("SELECT time, mtime FROM snapshots WHERE date = ?", (date,)))
+            pending = []
+            for path in list_snapshot_files(day_dir / "txt"):
+                try:
+                    if known.get(snapshot_time_label(path)) != member_info(path)[1] / 1e9:
+                        pending.append(path)
+                except OSError:
+                    continue
+            if not pending:
+                continue
+
+            written = 0
+            with self._lock, self._conn:
+                for path in pending:
+                    try:
+                        content = read_snapshot_text(path)
+                    except (OSError, ValueError, EOFError) as e:
+                        print(f"Warning: 读取快照 {path} 失败: {e}")
+                        continue
+                    written += self._record(path, content)
+            if written:
+                print(f"🗃️ 历史库补录 {day_dir.name}: {written} 个快照")
+            total += written
+        return total
+
+
+# 全局历史库实例
+_history_store: Optional[HistoryStore] = None
+_history_store_lock = threading.Lock()
+
+
+def get_history_store(output_dir: Optional[Path] = None) -> HistoryStore:
+    """获取全局历史库实例（output/history.db）"""
+    global _history_store
+    with _history_store_lock:
+        if _history_store is None:
+            _history_store = HistoryStore(Path(output_dir or "output") / HISTORY_DB_FILENAME)
+        return _history_store
+
+
+def start_history_backfill(crawl_config: CrawlConfig) -> Optional[threading.Thread]:
+    """后台补录已有历史（HISTORY_DB_ENABLED 关闭时不执行）"""
+    if not crawl_config.HISTORY_DB_ENABLED:
+        return None
+
+    def _run() -> None:
+        try:
+            total = get_history_store().backfill(Path("output"))
+            print(f"🗃️ 历史库补录完成，共写入 {total} 个快照")
+        except Exception as e:
+            print(f"❌ 历史库补录失败: {e}")
+
+    thread = threading.Thread(target=_run, name="history-backfill", daemon=True)
+    thread.start()
+    return thread
@@ -6,78 +6,18 @@
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from crawl_server.core.utils import clean_title, format_date_folder
+from crawl_server.core.data.snapshot_parser import parse_snapshot_text
+from crawl_server.core.data.snapshot_store import read_snapshot_bytes
+from crawl_server.core.utils import format_date_folder
 
 def parse_file_titles(file_path: Path) -> Tuple[Dict, Dict]:
-    """解析单个txt文件的标题数据，返回(titles_by_id, id_to_name)"""
-    titles_by_id = {}
-    id_to_name = {}
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-        sections = content.split("\n\n")
-
-        for section in sections:
-            if not section.strip() or "==== 以下ID请求失败 ====" in section:
-                continue
-
-            lines = section.strip().split("\n")
-            if len(lines) < 2:
-                continue
-
-            # id | name 或 id
-            header_line = lines[0].strip()
-            if " | " in header_line:
-                parts = header_line.split(" | ", 1)
-                source_id = parts[0].strip()
-                name = parts[1].strip()
-                id_to_name[source_id] = name
-            else:
-                source_id = header_line
-                id_to_name[source_id] = source_id
-
-            titles_by_id[source_id] = {}
-
-            for line in lines[1:]:
-                if line.strip():
-                    try:
-                        title_part = line.strip()
-                        rank = None
-
-                        # 提取排名
-                        if ". " in title_part and title_part.split(". ")[0].isdigit():
-                            rank_str, title_part = title_part.split(". ", 1)
-                            rank = int(rank_str)
-
-                        # 提取 MOBILE URL
-                        mobile_url = ""
-                        if " [MOBILE:" in title_part:
-                            title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
-                            if mobile_part.endswith("]"):
-                                mobile_url = mobile_part[:-1]
-
-                        # 提取 URL
-                        url = ""
-                        if " [URL:" in title_part:
-                            title_part, url_part = title_part.rsplit(" [URL:", 1)
-                            if url_part.endswith("]"):
-                                url = url_part[:-1]
-
-                        title = clean_title(title_part.strip())
-                        ranks = [rank] if rank is not None else [1]
-
-                        titles_by_id[source_id][title] = {
-                            "ranks": ranks,
-                            "url": url,
-                            "mobileUrl": mobile_url,
-                        }
-
-                    except Exception as e:
-                        print(f"解析标题行出错: {line}, 错误: {e}")
-
-    return titles_by_id, id_to_name
-
-
+    """解析单个快照文件的标题数据，返回(titles_by_id, id_to_name)"""
+    backend, data = read_snapshot_bytes(file_path)
+    # 二进制列式快照直接解码，无需逐行解析文本
+    decoded = backend.decode_titles(data)
+    if decoded is not None:
+        return decoded
+    return parse_snapshot_text(backend.decode(data))
 
 
 def process_source_data(
@@ -134,9 +74,11 @@ def process_source_data(
                 existing_mobile_url = existing_data.get("mobileUrl", "")
 
                 merged_ranks = existing_ranks.copy()
+                seen_ranks = set(merged_ranks)
                 for rank in ranks:
-                    if rank not in merged_ranks:
+                    if rank not in seen_ranks:
                         merged_ranks.append(rank)
+                        seen_ranks.add(rank)
 
                 all_results[source_id][title] = {
                     "ranks": merged_ranks,
@@ -158,104 +100,41 @@ def process_source_data(
 def read_all_today_titles(
     current_platform_ids: Optional[List[str]] = None,
 ) -> Tuple[Dict, Dict, Dict]:
-    """读取当天所有标题文件，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+    """
+    读取当天所有标题数据，支持按当前监控平台过滤
 
-    if not txt_dir.exists():
-        return {}, {}, {}
+    从当日增量聚合状态加载（只解析尚未合并的新快照），状态缺失或损坏时从 txt 快照重建
+    """
+    # 延迟导入，避免循环导入
+    from crawl_server.core.data.day_aggregate import load_day_aggregate
 
-    all_results = {}
-    final_id_to_name = {}
-    title_info = {}
+    all_results, id_to_name, title_info = load_day_aggregate(format_date_folder())
 
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-
-    for file_path in files:
-        time_info = file_path.stem
-
-        titles_by_id, file_id_to_name = parse_file_titles(file_path)
-
-        if current_platform_ids is not None:
-            filtered_titles_by_id = {}
-            filtered_id_to_name = {}
-
-            for source_id, title_data in titles_by_id.items():
-                if source_id in current_platform_ids:
-                    filtered_titles_by_id[source_id] = title_data
-                    if source_id in file_id_to_name:
-                        filtered_id_to_name[source_id] = file_id_to_name[source_id]
-
-            titles_by_id = filtered_titles_by_id
-            file_id_to_name = filtered_id_to_name
-
-        final_id_to_name.update(file_id_to_name)
-
-        for source_id, title_data in titles_by_id.items():
-            process_source_data(
-                source_id, title_data, time_info, all_results, title_info
-            )
+    if current_platform_ids is not None:
+        platform_set = set(current_platform_ids)
+        all_results = {k: v for k, v in all_results.items() if k in platform_set}
+        id_to_name = {k: v for k, v in id_to_name.items() if k in platform_set}
+        title_info = {k: v for k, v in title_info.items() if k in platform_set}
 
-    return all_results, final_id_to_name, title_info
+    return all_results, id_to_name, title_info
 
 
 
 
 def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
-    """检测当日最新批次的新增标题，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+    """
+    检测当日最新批次的新增标题，支持按当前监控平台过滤
 
-    if not txt_dir.exists():
-        return {}
+    基于当日聚合状态中的已见标题比对（不重新扫描当天历史快照），同一批快照的结果在进程内复用
+    """
+    # 延迟导入，避免循环导入
+    from crawl_server.core.data.day_aggregate import detect_day_new_titles
 
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-    if len(files) < 2:
-        return {}
+    new_titles = detect_day_new_titles(format_date_folder())
 
-    # 解析最新文件
-    latest_file = files[-1]
-    latest_titles, _ = parse_file_titles(latest_file)
-
-    # 如果指定了当前平台列表，过滤最新文件数据
     if current_platform_ids is not None:
-        filtered_latest_titles = {}
-        for source_id, title_data in latest_titles.items():
-            if source_id in current_platform_ids:
-                filtered_latest_titles[source_id] = title_data
-        latest_titles = filtered_latest_titles
-
-    # 汇总历史标题（按平台过滤）
-    historical_titles = {}
-    for file_path in files[:-1]:
-        historical_data, _ = parse_file_titles(file_path)
-
-        # 过滤历史数据
-        if current_platform_ids is not None:
-            filtered_historical_data = {}
-            for source_id, title_data in historical_data.items():
-                if source_id in current_platform_ids:
-                    filtered_historical_data[source_id] = title_data
-            historical_data = filtered_historical_data
-
-        for source_id, titles_data in historical_data.items():
-            if source_id not in historical_titles:
-                historical_titles[source_id] = set()
-            for title in titles_data.keys():
-                historical_titles[source_id].add(title)
-
-    # 找出新增标题
-    new_titles = {}
-    for source_id, latest_source_titles in latest_titles.items():
-        historical_set = historical_titles.get(source_id, set())
-        source_new_titles = {}
-
-        for title, title_data in latest_source_titles.items():
-            if title not in historical_set:
-                source_new_titles[title] = title_data
-
-        if source_new_titles:
-            new_titles[source_id] = source_new_titles
+        platform_set = set(current_platform_ids)
+        new_titles = {k: v for k, v in new_titles.items() if k in platform_set}
 
     return new_titles
 
@@ -0,0 +1,67 @@
+"""
+抓取记录结构
+
+抓取层将接口响应直接规范化为紧凑的 TitleRecord（__slots__，无逐条字典），
+同时实现只读 Mapping 接口（"ranks" / "url" / "mobileUrl" 键），
+现有按字典读取 {title: {ranks, url, mobileUrl}} 的代码无需修改即可使用
+"""
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Mapping 键 → 属性名
+_FIELD_KEYS = {"ranks": "ranks", "url": "url", "mobileUrl": "mobile_url"}
+
+
+class TitleRecord(Mapping):
+    """单条标题记录：平台、标题、排名列表、链接、移动端链接"""
+
+    __slots__ = ("platform_id", "title", "ranks", "url", "mobile_url")
+
+    def __init__(
+        self,
+        platform_id: str,
+        title: str,
+        ranks: Optional[List[int]] = None,
+        url: str = "",
+        mobile_url: str = "",
+    ):
+        self.platform_id = platform_id
+        self.title = title
+        self.ranks = ranks if ranks is not None else []
+        self.url = url
+        self.mobile_url = mobile_url
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, _FIELD_KEYS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FIELD_KEYS)
+
+    def __len__(self) -> int:
+        return len(_FIELD_KEYS)
+
+    def __repr__(self) -> str:
+        return (
+            f"TitleRecord({self.platform_id!r}, {self.title!r}, ranks={self.ranks!r}, "
+            f"url={self.url!r}, mobile_url={self.mobile_url!r})"
+        )
+
+    def to_dict(self) -> Dict:
+        """转换为原有的 {ranks, url, mobileUrl} 字典"""
+        return {"ranks": list(self.ranks), "url": self.url, "mobileUrl": self.mobile_url}
+
+
+def title_fields(info: Any) -> Tuple[List[int], str, str]:
+    """
+    读取标题数据的 (ranks, url, mobile_url)
+
+    兼容 TitleRecord（属性快速路径）、{ranks, url, mobileUrl} 字典和旧格式的排名列表
+    """
+    if isinstance(info, TitleRecord):
+        return info.ranks, info.url, info.mobile_url
+    if isinstance(info, Mapping):
+        return info.get("ranks", []), info.get("url", ""), info.get("mobileUrl", "")
+    return (info if isinstance(info, list) else []), "", ""
@@ -0,0 +1,230 @@
+"""
+分片抓取结果合并
+
+多副本分片抓取时，协调方为每个平台下发一条抓取任务，各副本把单平台结果发回合并方。
+合并方按会话收集分片结果，全部上报或截止时间到达后组装成完整的
+(results, id_to_name, failed_ids)，交给原有的落盘/分析/发送流程
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional
+
+from crawl_server.core.data.records import TitleRecord
+
+
+@dataclass
+class ShardSession:
+    """一个分片抓取会话的合并状态"""
+    session_id: str
+    trigger_source: str
+    started_at: str
+    deadline: float  # 截止时间（time.time()）
+    platforms: List[Dict]
+    shard_ids: List[str]  # 需要等待上报的平台ID
+    word_groups: List[Dict] = field(default_factory=list)
+    filter_words: List[str] = field(default_factory=list)
+    received: Dict[str, Optional[Dict]] = field(default_factory=dict)  # {platform_id: 标题数据，失败为 None}
+    circuit_states: Dict[str, str] = field(default_factory=dict)  # 失败平台在执行方的熔断状态
+    # 以下字段在会话完成时填充
+    results: Dict = field(default_factory=dict)
+    id_to_name: Dict = field(default_factory=dict)
+    failed_ids: List[str] = field(default_factory=list)
+    missing_ids: List[str] = field(default_factory=list)  # 截止时仍未上报的平台
+    timed_out: bool = False
+
+    @property
+    def is_complete(self) -> bool:
+        """所有分片是否均已上报"""
+        return all(platform_id in self.received for platform_id in self.shard_ids)
+
+
+class ShardMerger:
+    """分片结果合并器（合并方副本内共享）"""
+
+    def __init__(
+        self,
+        on_complete: Callable[[ShardSession], None],
+        poll_interval: float = 1.0,
+        closed_history: int = 64,
+    ):
+        """
+        初始化合并器
+
+        Args:
+            on_complete: 会话完成（全部上报或超时）后的回调，在锁外、在 Kafka 消费线程或截止时间检查线程上调用，
+                耗时的处理应交给其他线程（CrawlService 交给单个后台线程按顺序处理）
+            poll_interval: 截止时间检查间隔（秒）
+            closed_history: 记录已完成会话ID的数量（用于识别迟到的分片）
+        """
+        self.on_complete = on_complete
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, ShardSession] = {}
+        self._closed: Deque[str] = deque(maxlen=closed_history)
+        self._timer: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def open_session(
+        self,
+        session_id: str,
+        trigger_source: str,
+        started_at: str,
+        deadline: str,
+        platforms: List[Dict],
+        shard_ids: Optional[List[str]] = None,
+        word_groups: Optional[List[Dict]] = None,
+        filter_words: Optional[List[str]] = None,
+    ) -> None:
+        """
+        开始等待一个会话的分片结果
+
+        Args:
+            deadline: 截止时间（ISO 格式）
+            shard_ids: 已下发抓取任务的平台ID（None 表示全部平台）
+        """
+        try:
+            deadline_ts = datetime.fromisoformat(deadline).timestamp()
+        except (TypeError, ValueError):
+            deadline_ts = time.time()
+
+        session = ShardSession(
+            session_id=session_id,
+            trigger_source=trigger_source,
+            started_at=started_at,
+            deadline=deadline_ts,
+            platforms=platforms,
+            shard_ids=list(shard_ids) if shard_ids is not None else [p["id"] for p in platforms],
+            word_groups=word_groups or [],
+            filter_words=filter_words or [],
+        )
+        with self._lock:
+            if session_id in self._sessions or session_id in self._closed:
+                print(f"⚠️ 分片会话 {session_id} 已存在，忽略重复的会话开始事件")
+                return
+            self._sessions[session_id] = session
+        print(f"🧩 等待分片会话 {session_id}: {len(session.shard_ids)} 个平台")
+        self._ensure_timer()
+
+        if not session.shard_ids:
+            self._complete(session_id)
+
+    def add_result(
+        self,
+        session_id: str,
+        platform_id: str,
+        is_success: bool,
+        titles: Optional[Dict] = None,
+        circuit_state: str = "",
+    ) -> bool:
+        """
+        记录一个分片结果
+
+        Args:
+            titles: 按排名顺序的标题数据 {title: {ranks, url, mobileUrl}}
+            circuit_state: 失败时执行方该平台的熔断状态
+
+        Returns:
+            是否被接受（未知会话、重复上报的分片返回 False）
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                state = "已完成" if session_id in self._closed else "未知"
+                print(f"⚠️ 收到{state}会话 {session_id} 的分片结果（{platform_id}），已忽略")
+                return False
+            if platform_id in session.received:
+                return False
+
+            if is_success:
+                session.received[platform_id] = {
+                    title: TitleRecord(
+                        platform_id,
+                        title,
+                        list(info.get("ranks", [])),
+                        info.get("url", ""),
+                        info.get("mobileUrl", ""),
+                    )
+                    for title, info in (titles or {}).items()
+                }
+            else:
+                session.received[platform_id] = None
+                if circuit_state:
+                    session.circuit_states[platform_id] = circuit_state
+            complete = session.is_complete
+
+        if complete:
+            self._complete(session_id)
+        return True
+
+    def expire_due(self, now: Optional[float] = None) -> List[str]:
+        """完成所有已过截止时间的会话，返回这些会话ID"""
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [
+                session_id for session_id, session in self._sessions.items()
+                if session.deadline <= now
+            ]
+        for session_id in expired:
+            self._complete(session_id, timed_out=True)
+        return expired
+
+    def pending_sessions(self) -> List[str]:
+        """等待中的会话ID"""
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def _complete(self, session_id: str, timed_out: bool = False) -> None:
+        """组装会话结果并调用回调"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return
+            self._closed.append(session_id)
+
+            shard_set = set(session.shard_ids)
+            for platform in session.platforms:
+                platform_id = platform["id"]
+                session.id_to_name[platform_id] = platform.get("name", platform_id)
+
+                # 未下发任务的平台按失败处理：会话可能在任意副本合并，本副本的上次结果未必是最新的
+                title_data = session.received.get(platform_id) if platform_id in shard_set else None
+                if platform_id in shard_set and platform_id not in session.received:
+                    session.missing_ids.append(platform_id)
+
+                if title_data is None:
+                    session.failed_ids.append(platform_id)
+                else:
+                    session.results[platform_id] = title_data
+            session.timed_out = timed_out
+
+        if session.missing_ids:
+            print(f"⏱️ 分片会话 {session_id} 已到截止时间，未上报的平台按失败处理: {session.missing_ids}")
+        print(
+            f"🧩 分片会话 {session_id} 合并完成: 成功 {len(session.results)}, 失败 {len(session.failed_ids)}"
+        )
+        try:
+            self.on_complete(session)
+        except Exception as e:
+            print(f"❌ 处理分片会话 {session_id} 合并结果出错: {e}")
+
+    def _ensure_timer(self) -> None:
+        """启动截止时间检查线程（首次开启会话时）"""
+        with self._lock:
+            if self._timer is not None and self._timer.is_alive():
+                return
+            self._stop_event.clear()
+            self._timer = threading.Thread(target=self._run_timer, name="shard-merger", daemon=True)
+            self._timer.start()
+
+    def _run_timer(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            self.expire_due()
+
+    def stop(self) -> None:
+        """停止截止时间检查线程"""
+        self._stop_event.set()
+        if self._timer is not None:
+            self._timer.join(timeout=self.poll_interval * 2)
@@ -0,0 +1,264 @@
+"""
+二进制列式快照格式
+
+把快照文本按列存储，读取时整段解码，无需逐行字符串切分：
+
+    头部: 魔数 b"NFXS" | 版本 u8 | 标志 u8 | 正文长度 u32
+    正文（标志含 FLAG_ZLIB 时为 zlib 压缩）:
+        平台表: 平台数 u32 | 平台ID 字符串列 | 平台名称 字符串列（名称与ID相同或缺省时为空串）
+        标题行: 行数 u32 | 平台下标列 (u32[]) | 排名列 (u32[]，0 表示无排名) |
+                标题 / URL / 移动端 URL 字符串列
+        失败平台: 字符串列
+
+    字符串列: 个数 u32 | 字符偏移 (u32[个数+1]) | UTF-8 字节长度 u32 | 拼接后的 UTF-8 字节
+    （整列一次解码后按字符偏移切片）
+
+编码时校验还原文本与原文本一致、且解码结果与文本解析一致；否则（非标准格式的行）
+改为整体保存原文本（FLAG_RAW），保证无损
+"""
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from crawl_server.core.data.snapshot_parser import clean_title, split_title_line
+
+MAGIC = b"NFXS"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+FLAG_RAW = 0x02
+
+_HEADER = struct.Struct("<4sBBI")
+_U32 = struct.Struct("<I")
+_FAILED_SECTION_HEADER = "==== 以下ID请求失败 ===="
+
+
+class _Columns:
+    """快照的列式表示"""
+
+    __slots__ = ("platform_ids", "platform_names", "row_platform", "ranks", "titles", "urls", "mobile_urls", "failed_ids")
+
+    def __init__(self):
+        self.platform_ids: List[str] = []
+        self.platform_names: List[str] = []
+        self.row_platform = array("I")
+        self.ranks = array("I")
+        self.titles: List[str] = []
+        self.urls: List[str] = []
+        self.mobile_urls: List[str] = []
+        self.failed_ids: List[str] = []
+
+
+def _text_to_columns(content: str) -> _Columns:
+    """快照文本转为列"""
+    columns = _Columns()
+    for section in content.split("\n\n"):
+        lines = [line for line in section.strip().split("\n") if line.strip()]
+        if not lines:
+            continue
+        if _FAILED_SECTION_HEADER in lines[0]:
+            columns.failed_ids.extend(line.strip() for line in lines[1:])
+            continue
+
+        header = lines[0].strip()
+        if " | " in header:
+            platform_id, name = (part.strip() for part in header.split(" | ", 1))
+        else:
+            platform_id, name = header, ""
+        platform_index = len(columns.platform_ids)
+        columns.platform_ids.append(platform_id)
+        columns.platform_names.append(name)
+
+        for line in lines[1:]:
+            rank, title, url, mobile_url = split_title_line(line.strip())
+            columns.row_platform.append(platform_index)
+            columns.ranks.append(rank or 0)
+            columns.titles.append(title)
+            columns.urls.append(url)
+            columns.mobile_urls.append(mobile_url)
+    return columns
+
+
+def _columns_to_text(columns: _Columns) -> str:
+    """列还原为快照文本（与 storage.render_snapshot_content 的格式一致）"""
+    rows_by_platform: List[List[int]] = [[] for _ in columns.platform_ids]
+    for row, platform_index in enumerate(columns.row_platform):
+        rows_by_platform[platform_index].append(row)
+
+    parts = []
+    for platform_index, platform_id in enumerate(columns.platform_ids):
+        name = columns.platform_names[platform_index]
+        parts.append(f"{platform_id} | {name}\n" if name else f"{platform_id}\n")
+        for row in rows_by_platform[platform_index]:
+            rank = columns.ranks[row]
+            line = f"{rank}. {columns.titles[row]}" if rank else columns.titles[row]
+            if columns.urls[row]:
+                line += f" [URL:{columns.urls[row]}]"
+            if columns.mobile_urls[row]:
+                line += f" [MOBILE:{columns.mobile_urls[row]}]"
+            parts.append(line + "\n")
+        parts.append("\n")
+
+    if columns.failed_ids:
+        parts.append(f"{_FAILED_SECTION_HEADER}\n")
+        for failed_id in columns.failed_ids:
+            parts.append(f"{failed_id}\n")
+    return "".join(parts)
+
+
+def _u32_array_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pack_strings(values: List[str]) -> bytes:
+    """字符串列编码"""
+    offsets = array("I", [0])
+    position = 0
+    for value in values:
+        position += len(value)
+        offsets.append(position)
+    blob = "".join(values).encode("utf-8")
+    return b"".join((
+        _U32.pack(len(values)),
+        _u32_array_bytes(offsets),
+        _U32.pack(len(blob)),
+        blob,
+    ))
+
+
+class _Reader:
+    """正文顺序读取器"""
+
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def u32(self) -> int:
+        value = _U32.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def u32_array(self, count: int) -> array:
+        values = array("I")
+        values.frombytes(self.data[self.pos:self.pos + count * 4])
+        if sys.byteorder != "little":
+            values.byteswap()
+        self.pos += count * 4
+        return values
+
+    def strings(self) -> List[str]:
+        count = self.u32()
+        offsets = self.u32_array(count + 1)
+        length = self.u32()
+        text = str(self.data[self.pos:self.pos + length], "utf-8")
+        self.pos += length
+        return [text[offsets[i]:offsets[i + 1]] for i in range(count)]
+
+
+def _encode_columns(columns: _Columns) -> bytes:
+    return b"".join((
+        _U32.pack(len(columns.platform_ids)),
+        _pack_strings(columns.platform_ids),
+        _pack_strings(columns.platform_names),
+        _U32.pack(len(columns.titles)),
+        _u32_array_bytes(columns.row_platform),
+        _u32_array_bytes(columns.ranks),
+        _pack_strings(columns.titles),
+        _pack_strings(columns.urls),
+        _pack_strings(columns.mobile_urls),
+        _pack_strings(columns.failed_ids),
+    ))
+
+
+def _decode_columns(body: bytes) -> _Columns:
+    reader = _Reader(body)
+    columns = _Columns()
+    reader.u32()
+    columns.platform_ids = reader.strings()
+    columns.platform_names = reader.strings()
+    row_count = reader.u32()
+    columns.row_platform = reader.u32_array(row_count)
+    columns.ranks = reader.u32_array(row_count)
+    columns.titles = reader.strings()
+    columns.urls = reader.strings()
+    columns.mobile_urls = reader.strings()
+    columns.failed_ids = reader.strings()
+    return columns
+
+
+def encode_snapshot(content: str, compress: bool = True) -> bytes:
+    """
+    快照文本编码为二进制列式格式（无损）
+
+    Args:
+        content: 快照文本
+        compress: 是否 zlib 压缩正文
+    """
+    columns = _text_to_columns(content)
+    lossless = _columns_to_text(columns) == content and all(
+        clean_title(title) == title and _FAILED_SECTION_HEADER not in title for title in columns.titles
+    )
+    if lossless:
+        flags, body = 0, _encode_columns(columns)
+    else:
+        flags, body = FLAG_RAW, content.encode("utf-8")
+    if compress:
+        flags |= FLAG_ZLIB
+        body = zlib.compress(body, 6)
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(body)) + body
+
+
+def _read_body(data: bytes) -> Tuple[int, bytes]:
+    magic, version, flags, length = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("不是有效的二进制快照")
+    body = bytes(data[_HEADER.size:_HEADER.size + length])
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+    return flags, body
+
+
+def decode_snapshot_text(data: bytes) -> str:
+    """二进制快照还原为快照文本"""
+    flags, body = _read_body(data)
+    if flags & FLAG_RAW:
+        return body.decode("utf-8")
+    return _columns_to_text(_decode_columns(body))
+
+
+def decode_snapshot_titles(data: bytes) -> Optional[Tuple[Dict, Dict]]:
+    """
+    二进制快照直接解码为标题数据（与 parse_file_titles 的结果一致）
+
+    Returns:
+        (titles_by_id, id_to_name)；保存的是原文本（FLAG_RAW）时返回 None，由调用方解析文本
+    """
+    flags, body = _read_body(data)
+    if flags & FLAG_RAW:
+        return None
+    columns = _decode_columns(body)
+
+    titles_by_id: Dict[str, Dict] = {}
+    id_to_name: Dict[str, str] = {}
+    platform_ids = columns.platform_ids
+    platform_names = columns.platform_names
+    titles, urls, mobile_urls, ranks = columns.titles, columns.urls, columns.mobile_urls, columns.ranks
+    for row, platform_index in enumerate(columns.row_platform):
+        platform_id = platform_ids[platform_index]
+        platform_titles = titles_by_id.get(platform_id)
+        if platform_titles is None:
+            # 与文本解析一致：只有标题的平台才出现在结果中
+            platform_titles = titles_by_id[platform_id] = {}
+            id_to_name[platform_id] = platform_names[platform_index] or platform_id
+        platform_titles[titles[row]] = {
+            "ranks": [ranks[row] or 1],
+            "url": urls[row],
+            "mobileUrl": mobile_urls[row],
+        }
+    return titles_by_id, id_to_name
@@ -0,0 +1,149 @@
+"""
+快照文本解析
+
+crawl_server 与 mcp_server 共用的快照文本解析实现。两个服务分别打包，本文件在
+crawl_server/core/data/snapshot_parser.py 与 mcp_server/utils/snapshot_parser.py 各有一份，内容完全相同，
+修改时同步两处。快照文本格式：
+
+    平台ID | 平台名称
+    1. 标题 [URL:链接] [MOBILE:移动端链接]
+    ...
+    （空行分隔平台）
+    ==== 以下ID请求失败 ====
+    平台ID
+    ...
+
+- iter_snapshot_records：逐行扫描，逐条产出记录，不构建整份字典（只做过滤/统计的调用方使用）
+- parse_snapshot_text：构建 (titles_by_id, id_to_name)
+
+每行只做一次排名前缀匹配（预编译正则）和两次从右向左查找，标题空白清理用 split/join 代替 re.sub
+"""
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+FAILED_SECTION_HEADER = "==== 以下ID请求失败 ===="
+
+_RANK_PREFIX = re.compile(r"(\d+)\. ")
+_MOBILE_MARKER = " [MOBILE:"
+_URL_MARKER = " [URL:"
+
+
+class SnapshotRecord(NamedTuple):
+    """快照中的一条标题"""
+    platform_id: str
+    platform_name: str
+    rank: Optional[int]  # 无排名前缀时为 None
+    title: str
+    url: str
+    mobile_url: str
+
+
+def clean_title(title: str) -> str:
+    """合并连续空白（含换行）为一个空格并去除首尾空白（与 re.sub(r"\s+", " ", title).strip() 等价）"""
+    if not isinstance(title, str):
+        title = str(title)
+    return " ".join(title.split())
+
+
+def split_title_line(line: str) -> Tuple[Optional[int], str, str, str]:
+    """
+    拆分标题行（已去除首尾空白）为 (排名, 标题原文, URL, 移动端 URL)
+
+    排名取行首的 "数字. "；URL 与移动端 URL 取最后一个标记之后的内容（缺少结尾 "]" 时丢弃）
+    """
+    rank = None
+    if line[:1].isdigit():
+        match = _RANK_PREFIX.match(line)
+        if match:
+            rank = int(match.group(1))
+            line = line[match.end():]
+
+    mobile_url = ""
+    index = line.rfind(_MOBILE_MARKER)
+    if index >= 0:
+        tail = line[index + 9:]  # len(_MOBILE_MARKER)
+        line = line[:index]
+        if tail[-1:] == "]":
+            mobile_url = tail[:-1]
+
+    url = ""
+    index = line.rfind(_URL_MARKER)
+    if index >= 0:
+        tail = line[index + 6:]  # len(_URL_MARKER)
+        line = line[:index]
+        if tail[-1:] == "]":
+            url = tail[:-1]
+
+    return rank, line.strip(), url, mobile_url
+
+
+def _parse_header(line: str) -> Tuple[str, str]:
+    """平台行解析为 (平台ID, 平台名称)，无名称时名称为平台ID"""
+    if " | " in line:
+        platform_id, name = line.split(" | ", 1)
+        return platform_id.strip(), name.strip()
+    return line, line
+
+
+def _iter_sections(content: str) -> Iterator[List[str]]:
+    """按空行切分段落，产出每段的非空白行（已去除首尾空白）"""
+    for block in content.split("\n\n"):
+        section = [line for line in map(str.strip, block.split("\n")) if line]
+        if section:
+            yield section
+
+
+def iter_snapshot_records(content: str, platform_ids: Optional[set] = None) -> Iterator[SnapshotRecord]:
+    """
+    逐条产出快照中的标题记录（失败平台段跳过）
+
+    Args:
+        content: 快照文本
+        platform_ids: 只产出这些平台的记录（其他平台的标题行不解析），None 表示全部
+    """
+    for section in _iter_sections(content):
+        if len(section) < 2 or any(FAILED_SECTION_HEADER in line for line in section):
+            continue
+        platform_id, platform_name = _parse_header(section[0])
+        if platform_ids is not None and platform_id not in platform_ids:
+            continue
+        for line in section[1:]:
+            rank, title, url, mobile_url = split_title_line(line)
+            yield SnapshotRecord(platform_id, platform_name, rank, clean_title(title), url, mobile_url)
+
+
+def parse_snapshot_text(content: str, platform_ids: Optional[set] = None) -> Tuple[Dict, Dict]:
+    """
+    解析快照文本
+
+    Args:
+        content: 快照文本
+        platform_ids: 只解析这些平台（结果中也只包含这些平台），None 表示全部
+
+    Returns:
+        (titles_by_id, id_to_name)
+        - titles_by_id: {platform_id: {title: {ranks, url, mobileUrl}}}，同一平台内重复的标题取最后一次
+        - id_to_name: {platform_id: platform_name}
+    """
+    titles_by_id: Dict[str, Dict] = {}
+    id_to_name: Dict[str, str] = {}
+    # 与 iter_snapshot_records 相同的扫描，直接写入字典（省去逐条构造记录）
+    for section in _iter_sections(content):
+        if len(section) < 2 or any(FAILED_SECTION_HEADER in line for line in section):
+            continue
+        platform_id, platform_name = _parse_header(section[0])
+        if platform_ids is not None and platform_id not in platform_ids:
+            continue
+        platform_titles = titles_by_id.get(platform_id)
+        if platform_titles is None:
+            platform_titles = titles_by_id[platform_id] = {}
+            id_to_name[platform_id] = platform_name
+        for line in section[1:]:
+            rank, title, url, mobile_url = split_title_line(line)
+            platform_titles[" ".join(title.split())] = {
+                "ranks": [rank if rank is not None else 1],
+                "url": url,
+                "mobileUrl": mobile_url,
+            }
+    return titles_by_id, id_to_name
+
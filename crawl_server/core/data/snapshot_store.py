@@ -0,0 +1,341 @@
+"""
+快照存储
+
+每次抓取的结果只写入一次快照：序列化后以临时文件 + 重命名的方式原子落盘，
+读取方不会看到写了一半的文件。写入成功后依次调用提交钩子（更新输出清单、合并当日聚合状态等）
+
+快照仍位于 output/<日期>/txt/ 下，文件名为 <时间><后端后缀>，后端可插拔：
+- txt：纯文本（.txt，默认）
+- gzip：gzip 压缩文本（.txt.gz）
+- binary：二进制列式格式（.snap，见 snapshot_binary），读取时直接解码为标题数据
+
+读取时按文件后缀选择后端，不同后端写入的快照可以共存
+"""
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from crawl_server.configs import CrawlConfig
+from crawl_server.core.data.snapshot_binary import decode_snapshot_text, decode_snapshot_titles, encode_snapshot
+from crawl_server.core.data.storage import render_snapshot_content
+from crawl_server.core.utils import format_time_filename, get_output_path
+from crawl_server.core.utils.day_archive import list_members, read_member_bytes
+
+
+@dataclass(frozen=True)
+class SnapshotHandle:
+    """已写入快照的句柄"""
+    path: str  # 快照路径
+    time_info: str  # 时间标签（HH时MM分）
+    content_hash: str  # 快照文本的 sha1（与后端无关）
+    size: int  # 落盘字节数
+    backend: str  # 写入后端名称
+    written: bool = True  # 同一分钟内容相同时未重复写入为 False
+
+
+class SnapshotBackend(ABC):
+    """快照后端（文本与落盘字节之间的编解码）"""
+
+    name = ""
+    suffix = ""
+
+    @abstractmethod
+    def encode(self, content: str) -> bytes:
+        """快照文本编码为落盘字节"""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> str:
+        """落盘字节解码为快照文本"""
+
+    def decode_titles(self, data: bytes) -> Optional[Tuple[Dict, Dict]]:
+        """直接解码为 (titles_by_id, id_to_name)；返回 None 表示需要解析文本"""
+        return None
+
+
+class TxtSnapshotBackend(SnapshotBackend):
+    """纯文本快照"""
+
+    name = "txt"
+    suffix = ".txt"
+
+    def encode(self, content: str) -> bytes:
+        return content.encode("utf-8")
+
+    def decode(self, data: bytes) -> str:
+        return data.decode("utf-8")
+
+
+class GzipSnapshotBackend(SnapshotBackend):
+    """gzip 压缩快照"""
+
+    name = "gzip"
+    suffix = ".txt.gz"
+
+    def encode(self, content: str) -> bytes:
+        # mtime=0 保证相同内容得到相同字节
+        return gzip.compress(content.encode("utf-8"), mtime=0)
+
+    def decode(self, data: bytes) -> str:
+        return gzip.decompress(data).decode("utf-8")
+
+
+class BinarySnapshotBackend(SnapshotBackend):
+    """二进制列式快照"""
+
+    name = "binary"
+    suffix = ".snap"
+
+    def encode(self, content: str) -> bytes:
+        return encode_snapshot(content)
+
+    def decode(self, data: bytes) -> str:
+        return decode_snapshot_text(data)
+
+    def decode_titles(self, data: bytes) -> Optional[Tuple[Dict, Dict]]:
+        return decode_snapshot_titles(data)
+
+
+# 已注册的后端 {名称: 后端}
+SNAPSHOT_BACKENDS: Dict[str, SnapshotBackend] = {}
+
+
+def register_snapshot_backend(backend: SnapshotBackend) -> None:
+    """注册快照后端"""
+    SNAPSHOT_BACKENDS[backend.name] = backend
+
+
+register_snapshot_backend(TxtSnapshotBackend())
+register_snapshot_backend(GzipSnapshotBackend())
+register_snapshot_backend(BinarySnapshotBackend())
+
+
+def backend_for_path(path) -> Optional[SnapshotBackend]:
+    """按文件名后缀匹配快照后端（后缀越长越优先），不是快照文件时返回 None"""
+    name = Path(path).name
+    matched = None
+    for backend in SNAPSHOT_BACKENDS.values():
+        if name.endswith(backend.suffix) and (matched is None or len(backend.suffix) > len(matched.suffix)):
+            matched = backend
+    return matched
+
+
+def snapshot_time_label(path) -> str:
+    """快照文件的时间标签（去掉后端后缀的文件名）"""
+    name = Path(path).name
+    backend = backend_for_path(name)
+    return name[: -len(backend.suffix)] if backend else Path(name).stem
+
+
+def read_snapshot_bytes(path) -> Tuple[SnapshotBackend, bytes]:
+    """读取快照原始字节及其后端（已归档的快照从当天归档中读取）"""
+    backend = backend_for_path(path) or SNAPSHOT_BACKENDS["txt"]
+    return backend, read_member_bytes(path)
+
+
+def read_snapshot_text(path) -> str:
+    """读取快照文本（按后缀选择后端解码）"""
+    backend, data = read_snapshot_bytes(path)
+    return backend.decode(data)
+
+
+def list_snapshot_files(txt_dir: Path) -> List[Path]:
+    """列出快照目录下的快照文件（含已归档的快照，按时间标签排序）"""
+    files = list_members(txt_dir, lambda name: backend_for_path(name) is not None)
+    files.sort(key=lambda p: (snapshot_time_label(p), p.name))
+    return files
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """写入唯一临时文件后重命名（多个进程/副本同时写入同名快照时互不覆盖临时文件），失败时清理临时文件"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class SnapshotStore:
+    """快照存储"""
+
+    def __init__(self, backend: str = "txt"):
+        """
+        初始化快照存储
+
+        Args:
+            backend: 写入后端名称（txt / gzip / binary），未知名称回退为 txt
+        """
+        self.backend = SNAPSHOT_BACKENDS["txt"]
+        self.set_backend(backend)
+        self._commit_hooks: List[Callable[[SnapshotHandle, str], None]] = []
+        self._lock = threading.Lock()
+
+    def set_backend(self, backend: str) -> None:
+        """切换写入后端"""
+        if backend not in SNAPSHOT_BACKENDS:
+            print(f"未知的快照后端 {backend}，使用 txt")
+            backend = "txt"
+        self.backend = SNAPSHOT_BACKENDS[backend]
+
+    def add_commit_hook(self, hook: Callable[[SnapshotHandle, str], None]) -> None:
+        """
+        注册提交钩子，快照写入成功后以 (handle, content) 调用
+
+        钩子抛出的异常只打印，不影响快照本身；同一钩子只注册一次
+        """
+        if hook not in self._commit_hooks:
+            self._commit_hooks.append(hook)
+
+    def write(
+        self,
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        fingerprints: Optional[Dict[str, str]] = None,
+    ) -> SnapshotHandle:
+        """
+        写入本次抓取的快照
+
+        Args:
+            results: 抓取结果
+            id_to_name: 平台ID到名称的映射
+            failed_ids: 失败的平台ID列表
+            fingerprints: 平台内容指纹，提供时复用未变化平台的已序列化内容
+
+        Returns:
+            快照句柄
+        """
+        time_info = format_time_filename()
+        content = render_snapshot_content(results, id_to_name, failed_ids, fingerprints)
+        content_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        backend = self.backend
+        path = Path(get_output_path("txt", f"{time_info}{backend.suffix}"))
+
+        with self._lock:
+            # 同一分钟内以相同内容重复保存时不改写文件（保持修改时间，当日聚合状态无需重建）
+            existing_hash = self._existing_hash(path)
+            if existing_hash == content_hash:
+                return SnapshotHandle(
+                    str(path), time_info, content_hash, path.stat().st_size, backend.name, written=False
+                )
+
+            data = backend.encode(content)
+            _write_atomic(path, data)
+
+        handle = SnapshotHandle(str(path), time_info, content_hash, len(data), backend.name)
+        for hook in self._commit_hooks:
+            try:
+                hook(handle, content)
+            except Exception as e:
+                print(f"快照提交钩子执行失败: {e}")
+        return handle
+
+    @staticmethod
+    def _existing_hash(path: Path) -> Optional[str]:
+        """已存在快照的内容哈希（不存在或无法读取时返回 None）"""
+        if not path.exists():
+            return None
+        try:
+            return hashlib.sha1(read_snapshot_text(path).encode("utf-8")).hexdigest()
+        except (OSError, ValueError, EOFError):
+            return None
+
+
+def convert_snapshots(txt_dir: Path, backend: str, keep_source: bool = False) -> int:
+    """
+    将快照目录下的已有快照无损转换为指定后端（用于迁移历史数据）
+
+    每个文件转换后先校验解码文本与原文本一致再替换；转换后删除当天清单，下次访问时重建
+
+    Args:
+        txt_dir: 快照目录（output/<日期>/txt）
+        backend: 目标后端名称
+        keep_source: 是否保留原文件
+
+    Returns:
+        转换的文件数
+    """
+    target = SNAPSHOT_BACKENDS[backend]
+    converted = 0
+    for path in list_snapshot_files(txt_dir):
+        # 已归档的快照随归档整体保存，不单独转换
+        if backend_for_path(path) is target or not path.exists():
+            continue
+        content = read_snapshot_text(path)
+        data = target.encode(content)
+        if target.decode(data) != content:
+            raise ValueError(f"快照转换校验失败: {path}")
+
+        target_path = path.with_name(f"{snapshot_time_label(path)}{target.suffix}")
+        _write_atomic(target_path, data)
+        if not keep_source:
+            os.remove(path)
+        converted += 1
+
+    if converted:
+        from crawl_server.core.utils.manifest import MANIFEST_FILENAME
+
+        try:
+            os.remove(txt_dir.parent / MANIFEST_FILENAME)
+        except OSError:
+            pass
+    return converted
+
+
+def _record_manifest(handle: SnapshotHandle, content: str) -> None:
+    """提交钩子：记录到输出清单"""
+    from crawl_server.core.utils.manifest import get_output_manifest
+
+    get_output_manifest().record_snapshot(handle.path, content, time_info=handle.time_info)
+
+
+def _merge_day_aggregate(handle: SnapshotHandle, content: str) -> None:
+    """提交钩子：合并进当日聚合状态（已见标题索引 + 新增标题），分析时只需一次读取"""
+    from crawl_server.core.data.day_aggregate import DayAggregate
+
+    day_dir = Path(handle.path).parent.parent
+    DayAggregate(day_dir.name, day_dir.parent).latest_new_titles()
+
+
+def _record_history(handle: SnapshotHandle, content: str) -> None:
+    """提交钩子：写入本地历史库（HISTORY_DB_ENABLED）"""
+    from crawl_server.core.data.history_store import get_history_store
+
+    get_history_store().record_snapshot(handle.path, content, content_hash=handle.content_hash)
+
+
+# 全局快照存储实例
+_snapshot_store: Optional[SnapshotStore] = None
+_snapshot_store_lock = threading.Lock()
+
+
+def get_snapshot_store(crawl_config: Optional[CrawlConfig] = None) -> SnapshotStore:
+    """
+    获取全局快照存储实例
+
+    Args:
+        crawl_config: 爬虫配置，提供时按 SNAPSHOT_BACKEND 设置写入后端，
+            HISTORY_DB_ENABLED 开启时同步写入本地历史库
+    """
+    global _snapshot_store
+    with _snapshot_store_lock:
+        if _snapshot_store is None:
+            _snapshot_store = SnapshotStore()
+            _snapshot_store.add_commit_hook(_record_manifest)
+            _snapshot_store.add_commit_hook(_merge_day_aggregate)
+        if crawl_config is not None and crawl_config.SNAPSHOT_BACKEND != _snapshot_store.backend.name:
+            _snapshot_store.set_backend(crawl_config.SNAPSHOT_BACKEND)
+        if crawl_config is not None and crawl_config.HISTORY_DB_ENABLED:
+            _snapshot_store.add_commit_hook(_record_history)
+        return _snapshot_store
@@ -1,60 +1,104 @@
 """
 数据存储
 
-负责将数据保存到文件
+负责将抓取结果序列化为快照文本（写入由 snapshot_store 负责）
 """
-from typing import Dict, List
-
-from crawl_server.core.utils import clean_title, format_time_filename, get_output_path
-
-def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-    """保存标题到文件"""
-    file_path = get_output_path("txt", f"{format_time_filename()}.txt")
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        for id_value, title_data in results.items():
-            # id | name 或 id
-            name = id_to_name.get(id_value)
-            if name and name != id_value:
-                f.write(f"{id_value} | {name}\n")
-            else:
-                f.write(f"{id_value}\n")
-
-            # 按排名排序标题
-            sorted_titles = []
-            for title, info in title_data.items():
-                cleaned_title = clean_title(title)
-                if isinstance(info, dict):
-                    ranks = info.get("ranks", [])
-                    url = info.get("url", "")
-                    mobile_url = info.get("mobileUrl", "")
-                else:
-                    ranks = info if isinstance(info, list) else []
-                    url = ""
-                    mobile_url = ""
-
-                rank = ranks[0] if ranks else 1
-                sorted_titles.append((rank, cleaned_title, url, mobile_url))
-
-            sorted_titles.sort(key=lambda x: x[0])
-
-            for rank, cleaned_title, url, mobile_url in sorted_titles:
-                line = f"{rank}. {cleaned_title}"
-
-                if url:
-                    line += f" [URL:{url}]"
-                if mobile_url:
-                    line += f" [MOBILE:{mobile_url}]"
-                f.write(line + "\n")
-
-            f.write("\n")
-
-        if failed_ids:
-            f.write("==== 以下ID请求失败 ====\n")
-            for id_value in failed_ids:
-                f.write(f"{id_value}\n")
-
-    return file_path
+from typing import Dict, List, Optional, Tuple
+
+from crawl_server.core.data.records import title_fields
+from crawl_server.core.utils import clean_title
+
+# 平台分段内容缓存：{platform_id: (fingerprint, name, section_text)}
+# 平台内容未变化时直接复用上一周期的序列化结果
+_section_cache: Dict[str, Tuple[str, Optional[str], str]] = {}
+
+
+def _render_platform_section(id_value: str, name: Optional[str], title_data: Dict) -> str:
+    """序列化单个平台的数据段"""
+    lines = []
+    # id | name 或 id
+    if name and name != id_value:
+        lines.append(f"{id_value} | {name}")
+    else:
+        lines.append(f"{id_value}")
+
+    # 按排名排序标题
+    sorted_titles = []
+    for title, info in title_data.items():
+        cleaned_title = clean_title(title)
+        ranks, url, mobile_url = title_fields(info)
+
+        rank = ranks[0] if ranks else 1
+        sorted_titles.append((rank, cleaned_title, url, mobile_url))
+
+    sorted_titles.sort(key=lambda x: x[0])
+
+    for rank, cleaned_title, url, mobile_url in sorted_titles:
+        line = f"{rank}. {cleaned_title}"
+
+        if url:
+            line += f" [URL:{url}]"
+        if mobile_url:
+            line += f" [MOBILE:{mobile_url}]"
+        lines.append(line)
+
+    return "\n".join(lines) + "\n\n"
+
+
+def render_snapshot_content(
+    results: Dict,
+    id_to_name: Dict,
+    failed_ids: List,
+    fingerprints: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    序列化抓取结果为快照文本
+
+    Args:
+        results: 抓取结果
+        id_to_name: 平台ID到名称的映射
+        failed_ids: 失败的平台ID列表
+        fingerprints: 平台内容指纹，提供时复用指纹未变化平台的已序列化内容
+    """
+    parts = []
+    for id_value, title_data in results.items():
+        name = id_to_name.get(id_value)
+        fingerprint = fingerprints.get(id_value) if fingerprints else None
+
+        cached = _section_cache.get(id_value)
+        if fingerprint and cached and cached[0] == fingerprint and cached[1] == name:
+            section = cached[2]
+        else:
+            section = _render_platform_section(id_value, name, title_data)
+            if fingerprint:
+                _section_cache[id_value] = (fingerprint, name, section)
+        parts.append(section)
+
+    if failed_ids:
+        parts.append("==== 以下ID请求失败 ====\n")
+        for id_value in failed_ids:
+            parts.append(f"{id_value}\n")
+    return "".join(parts)
+
+
+def save_titles_to_file(
+    results: Dict,
+    id_to_name: Dict,
+    failed_ids: List,
+    fingerprints: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    保存标题到文件（通过快照存储写入，返回快照路径）
+
+    Args:
+        results: 抓取结果
+        id_to_name: 平台ID到名称的映射
+        failed_ids: 失败的平台ID列表
+        fingerprints: 平台内容指纹，提供时复用指纹未变化平台的已序列化内容
+    """
+    from crawl_server.core.data.snapshot_store import get_snapshot_store
+
+    return get_snapshot_store().write(results, id_to_name, failed_ids, fingerprints).path
 
 
 # load_frequency_words 已移至 crawl_server.utils.data_utils
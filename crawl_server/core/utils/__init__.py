@@ -10,9 +10,12 @@ from .time_utils import (
     format_time_display,
 )
 from .string_utils import clean_title, html_escape, strip_markdown
+from .json_utils import json_loads
 from .file_utils import ensure_directory_exists, get_output_path, is_first_crawl_today
 from .format_utils import format_rank_display
 from .version_utils import check_version_update
+from .keyword_matcher import KeywordMatcher, get_keyword_matcher
+from .scoring import calculate_news_weights, rank_titles
 from .statistics_utils import (
     calculate_news_weight,
     count_word_frequency,
@@ -23,6 +26,7 @@ from .contents import (
     render_dingtalk_content,
     render_feishu_content,
     render_html_content,
+    write_html_content,
 )
 from .data_utils import load_frequency_words, prepare_report_data
 from .render_utils import generate_html_report
@@ -37,6 +41,8 @@ __all__ = [
     "clean_title",
     "html_escape",
     "strip_markdown",
+    # JSON 工具
+    "json_loads",
     # 文件工具
     "ensure_directory_exists",
     "get_output_path",
@@ -45,8 +51,13 @@ __all__ = [
     "format_rank_display",
     # 版本工具
     "check_version_update",
+    # 频率词匹配
+    "KeywordMatcher",
+    "get_keyword_matcher",
     # 统计工具
     "calculate_news_weight",
+    "calculate_news_weights",
+    "rank_titles",
     "count_word_frequency",
     "matches_word_groups",
     # 数据处理工具
@@ -58,5 +69,6 @@ __all__ = [
     "render_dingtalk_content",
     "render_feishu_content",
     "render_html_content",
+    "write_html_content",
 ]
 
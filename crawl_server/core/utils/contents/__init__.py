@@ -6,12 +6,13 @@
 from .dingtalk_content import render_dingtalk_content
 from .feishu_content import render_feishu_content
 from .format_title import format_title_for_platform
-from .html_content import render_html_content
+from .html_content import render_html_content, write_html_content
 
 __all__ = [
     "format_title_for_platform",
     "render_dingtalk_content",
     "render_feishu_content",
     "render_html_content",
+    "write_html_content",
 ]
 
@@ -0,0 +1,195 @@
+"""
+HTML 模板缓存
+
+模板文件（HTML 模板会内联同名的 CSS / JS 文件）读取后按文件修改时间缓存：每次取用只检查
+修改时间，文件被修改、新增或删除时重新读取，修改模板后下次生成报告即可生效，无需重启服务。
+
+模板按占位符预编译为片段列表（字面量与占位符交替），渲染时一次拼接，
+不再对整个模板逐个占位符执行 replace；render_into 把片段直接追加到调用方的列表
+（多条目的报告只在最后 join 一次）或 ChunkedWriter（分块写入文件）
+"""
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, TextIO, Tuple, Union
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
+
+
+class CompiledTemplate:
+    """预编译的模板（字面量与占位符片段）"""
+
+    __slots__ = ("_parts", "_slots")
+
+    def __init__(self, text: str, names: Sequence[str]):
+        """
+        编译模板
+
+        Args:
+            text: 模板文本
+            names: 占位符名称（只识别 {名称} 形式的这些占位符，其余花括号原样保留）
+        """
+        self._parts: List[str] = []
+        self._slots: List[Tuple[int, str]] = []
+        position = 0
+        if names:
+            pattern = re.compile("|".join(re.escape("{%s}" % name) for name in names))
+            for match in pattern.finditer(text):
+                self._parts.append(text[position:match.start()])
+                self._slots.append((len(self._parts), match.group()[1:-1]))
+                self._parts.append("")
+                position = match.end()
+        self._parts.append(text[position:])
+
+    def render_into(self, out, values: Dict[str, Union[str, Callable]]) -> None:
+        """
+        填充占位符并把片段追加到 out（调用方最后统一 join，或由 ChunkedWriter 分块写出）
+
+        值为可调用对象时表示嵌套内容：先写出该占位符之前的片段，再调用 value(out) 直接写入嵌套内容，
+        不先拼成字符串
+        """
+        parts = self._parts.copy()
+        start = 0
+        for index, name in self._slots:
+            value = values[name]
+            if callable(value):
+                out.extend(parts[start:index])
+                value(out)
+                start = index + 1
+            else:
+                parts[index] = value
+        out.extend(parts[start:] if start else parts)
+
+    def render(self, values: Dict[str, str]) -> str:
+        """填充占位符（每个值原样插入，不会再被其他占位符替换）"""
+        out: List[str] = []
+        self.render_into(out, values)
+        return "".join(out)
+
+
+class ChunkedWriter:
+    """
+    分块写出渲染片段
+
+    提供与 list 相同的 append / extend 接口，片段累计超过 chunk_size 个字符时拼接后写入文件，
+    渲染整份报告时内存中只保留一个分块
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = 256 * 1024):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._pieces: List[str] = []
+        self._size = 0
+
+    def append(self, piece: str) -> None:
+        self._pieces.append(piece)
+        self._size += len(piece)
+        if self._size >= self._chunk_size:
+            self.flush()
+
+    def extend(self, pieces: Sequence[str]) -> None:
+        self._pieces.extend(pieces)
+        self._size += sum(map(len, pieces))
+        if self._size >= self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """写出缓冲的片段"""
+        if self._pieces:
+            self._stream.write("".join(self._pieces))
+            self._pieces.clear()
+            self._size = 0
+
+
+def _source_paths(filename: str) -> List[Path]:
+    """模板及其内联文件（HTML 模板对应的同名 CSS / JS）"""
+    template_path = TEMPLATE_DIR / filename
+    if filename.endswith(".html"):
+        return [
+            template_path,
+            template_path.with_name(filename.replace(".html", ".css")),
+            template_path.with_name(filename.replace(".html", ".js")),
+        ]
+    return [template_path]
+
+
+def _mtimes(paths: List[Path]) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """各文件的 (修改时间, 大小)，不存在时为 None"""
+    mtimes = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            mtimes.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _read_source(paths: List[Path], mtimes: Tuple) -> str:
+    """读取模板并内联 CSS / JS"""
+    template_path = paths[0]
+    if mtimes[0] is None:
+        raise FileNotFoundError(f"模板文件不存在: {template_path}")
+    with open(template_path, "r", encoding="utf-8") as f:
+        template = f.read()
+
+    if len(paths) == 3:
+        css_path, js_path = paths[1], paths[2]
+        if mtimes[1] is not None:
+            with open(css_path, "r", encoding="utf-8") as f:
+                template = template.replace("/*css_content*/", f.read())
+        if mtimes[2] is not None:
+            with open(js_path, "r", encoding="utf-8") as f:
+                template = template.replace("//js_content", f.read())
+    return template
+
+
+def templates_signature() -> Tuple:
+    """模板目录下所有文件的 (文件名, 修改时间, 大小)，任一模板修改后结果随之变化"""
+    entries = []
+    with os.scandir(TEMPLATE_DIR) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+# {文件名: (修改时间, 模板文本)}，{(文件名, 占位符): (修改时间, 编译结果)}
+_text_cache: Dict[str, Tuple[Tuple, str]] = {}
+_compiled_cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[Tuple, CompiledTemplate]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_template(filename: str) -> str:
+    """加载模板文本（文件未修改时取缓存）"""
+    paths = _source_paths(filename)
+    mtimes = _mtimes(paths)
+    cached = _text_cache.get(filename)
+    if cached is not None and cached[0] == mtimes:
+        return cached[1]
+    text = _read_source(paths, mtimes)
+    with _cache_lock:
+        _text_cache[filename] = (mtimes, text)
+    return text
+
+
+def load_compiled_template(filename: str, names: Sequence[str]) -> CompiledTemplate:
+    """
+    加载预编译模板（文件未修改时取缓存）
+
+    Args:
+        filename: 模板文件名
+        names: 占位符名称
+    """
+    key = (filename, tuple(names))
+    paths = _source_paths(filename)
+    mtimes = _mtimes(paths)
+    cached = _compiled_cache.get(key)
+    if cached is not None and cached[0] == mtimes:
+        return cached[1]
+    compiled = CompiledTemplate(load_template(filename), key[1])
+    with _cache_lock:
+        _compiled_cache[key] = (mtimes, compiled)
+    return compiled
@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from crawl_server.configs import CrawlConfig
-from crawl_server.core.utils.statistics_utils import matches_word_groups
+from crawl_server.core.utils.keyword_matcher import get_keyword_matcher
 
 
 def load_frequency_words(
@@ -86,12 +86,16 @@ def prepare_report_data(
     id_to_name: Optional[Dict] = None,
     mode: str = "daily",
     crawl_config: Optional[CrawlConfig] = None,
+    word_groups: Optional[List[Dict]] = None,
+    filter_words: Optional[List[str]] = None,
 ) -> Dict:
     """
     准备报告数据
     
     Args:
         crawl_config: 爬虫配置对象
+        word_groups: 频率词组列表（为 None 时从文件加载，向后兼容）
+        filter_words: 过滤词列表（为 None 时从文件加载，向后兼容）
     """
     if not crawl_config:
         raise RuntimeError("CrawlConfig 未提供，无法准备报告数据")
@@ -104,11 +108,14 @@ def prepare_report_data(
     if not hide_new_section:
         filtered_new_titles = {}
         if new_titles and id_to_name:
-            word_groups, filter_words = load_frequency_words()
+            if word_groups is None or filter_words is None:
+                word_groups, filter_words = load_frequency_words()
+            # 与统计阶段使用同一词表时直接复用已缓存的匹配结果
+            matcher = get_keyword_matcher(word_groups, filter_words)
             for source_id, titles_data in new_titles.items():
                 filtered_titles = {}
                 for title, title_data in titles_data.items():
-                    if matches_word_groups(title, word_groups, filter_words):
+                    if matcher.matches(title):
                         filtered_titles[title] = title_data
                 if filtered_titles:
                     filtered_new_titles[source_id] = filtered_titles
@@ -0,0 +1,173 @@
+"""
+日期目录归档（pack）
+
+把一个目录下的全部文件合并为同级的单个归档文件（如 output/<日期>/txt → output/<日期>/txt.pack），
+每个成员单独 zlib 压缩，末尾带偏移索引，可按文件名随机读取：
+
+    b"NFXP" | 版本 u8 | 成员数据... | 索引(JSON, zlib) | 索引偏移 u64 | 索引长度 u32 | b"NFXP"
+
+    索引: {文件名: [偏移, 压缩长度, 原始长度, 修改时间 ns]}
+
+读取方按原路径访问（output/<日期>/txt/<文件名>）：文件存在时直接读取，
+否则从归档中读取，归档前后调用方无需区分
+"""
+import json
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+PACK_MAGIC = b"NFXP"
+PACK_VERSION = 1
+PACK_SUFFIX = ".pack"
+
+_PACK_HEADER = struct.Struct("<4sB")
+_PACK_FOOTER = struct.Struct("<QI4s")
+
+# 归档索引缓存 {归档路径: (修改时间 ns, 索引)}
+_index_cache: Dict[str, Tuple[int, Dict[str, List[int]]]] = {}
+_index_cache_lock = threading.Lock()
+
+
+def archive_path_for(directory: Path) -> Path:
+    """目录对应的归档路径（output/<日期>/txt → output/<日期>/txt.pack）"""
+    directory = Path(directory)
+    return directory.parent / f"{directory.name}{PACK_SUFFIX}"
+
+
+def write_archive(archive_path: Path, members: Iterable[Tuple[str, bytes, int]], level: int = 6) -> Dict[str, List[int]]:
+    """
+    写入归档（同目录下唯一命名的临时文件 + 重命名，多个进程同时写同一归档互不干扰）
+
+    Args:
+        archive_path: 归档路径
+        members: (成员名, 原始内容, 修改时间 ns)，逐个写入，无需全部载入内存
+        level: zlib 压缩级别
+
+    Returns:
+        归档索引
+    """
+    index: Dict[str, List[int]] = {}
+    fd, tmp_name = tempfile.mkstemp(dir=archive_path.parent, prefix=f".{archive_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION))
+            for name, raw, mtime_ns in members:
+                data = zlib.compress(raw, level)
+                index[name] = [f.tell(), len(data), len(raw), mtime_ns]
+                f.write(data)
+            index_offset = f.tell()
+            index_data = zlib.compress(json.dumps(index, ensure_ascii=False).encode("utf-8"))
+            f.write(index_data)
+            f.write(_PACK_FOOTER.pack(index_offset, len(index_data), PACK_MAGIC))
+        os.replace(tmp_name, archive_path)
+    except BaseException:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+        raise
+    return index
+
+
+def read_archive_index(archive_path: Path) -> Optional[Dict[str, List[int]]]:
+    """读取归档索引（按归档修改时间缓存），归档不存在或无效时返回 None"""
+    try:
+        mtime_ns = archive_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    key = str(archive_path)
+    with _index_cache_lock:
+        cached = _index_cache.get(key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    try:
+        with open(archive_path, "rb") as f:
+            f.seek(-_PACK_FOOTER.size, os.SEEK_END)
+            index_offset, index_length, magic = _PACK_FOOTER.unpack(f.read(_PACK_FOOTER.size))
+            if magic != PACK_MAGIC:
+                return None
+            f.seek(index_offset)
+            index = json.loads(zlib.decompress(f.read(index_length)).decode("utf-8"))
+    except (OSError, ValueError, zlib.error, struct.error) as e:
+        print(f"读取归档索引失败 {archive_path}: {e}")
+        return None
+
+    with _index_cache_lock:
+        _index_cache[key] = (mtime_ns, index)
+    return index
+
+
+def read_archive_member(archive_path: Path, name: str) -> Optional[bytes]:
+    """从归档读取成员原始内容，不存在时返回 None"""
+    index = read_archive_index(archive_path)
+    if not index or name not in index:
+        return None
+    offset, length, _, _ = index[name]
+    with open(archive_path, "rb") as f:
+        f.seek(offset)
+        return zlib.decompress(f.read(length))
+
+
+def list_members(directory: Path, predicate: Callable[[str], bool]) -> List[Path]:
+    """
+    列出目录中的文件（包括已归档的成员），返回按原路径表示的列表（未排序）
+
+    Args:
+        directory: 目录（可能已被归档删除）
+        predicate: 文件名过滤条件
+    """
+    directory = Path(directory)
+    names = set()
+    if directory.is_dir():
+        names.update(entry.name for entry in os.scandir(directory) if entry.is_file() and predicate(entry.name))
+    index = read_archive_index(archive_path_for(directory))
+    if index:
+        names.update(name for name in index if predicate(name))
+    return [directory / name for name in names]
+
+
+def member_exists(path: Path) -> bool:
+    """文件（或已归档的成员）是否存在"""
+    path = Path(path)
+    if path.exists():
+        return True
+    index = read_archive_index(archive_path_for(path.parent))
+    return bool(index) and path.name in index
+
+
+def read_member_bytes(path: Path) -> bytes:
+    """读取文件内容，文件已归档时从归档读取"""
+    path = Path(path)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        data = read_archive_member(archive_path_for(path.parent), path.name)
+        if data is None:
+            raise
+        return data
+
+
+def member_info(path: Path) -> Tuple[int, int]:
+    """
+    文件大小与修改时间（ns），已归档时取归档中的压缩长度与原修改时间
+
+    Raises:
+        FileNotFoundError: 文件与归档成员均不存在
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+    except FileNotFoundError:
+        index = read_archive_index(archive_path_for(path.parent))
+        if not index or path.name not in index:
+            raise
+        _, length, _, mtime_ns = index[path.name]
+        return length, mtime_ns
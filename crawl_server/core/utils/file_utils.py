@@ -3,6 +3,7 @@
 """
 from pathlib import Path
 
+from .manifest import get_output_manifest
 from .time_utils import format_date_folder
 
 
@@ -20,13 +21,7 @@ def get_output_path(subfolder: str, filename: str) -> str:
 
 
 def is_first_crawl_today() -> bool:
-    """检测是否是当天第一次爬取"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
-
-    if not txt_dir.exists():
-        return True
-
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-    return len(files) <= 1
+    """检测是否是当天第一次爬取（查当日清单，不遍历快照目录）"""
+    manifest = get_output_manifest().load_day(format_date_folder())
+    return len(manifest["snapshots"]) <= 1
 
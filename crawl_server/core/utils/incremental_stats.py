@@ -0,0 +1,128 @@
+"""
+词组统计增量引擎
+
+当日汇总（daily）模式每个周期都要对当天全部标题统计词组。相邻两个周期之间，
+只有最新快照涉及的标题（新增标题、排名合并、last_time / count 变化）以及新增标记变化的标题不同，
+其余标题的统计条目完全相同。
+
+引擎保存每个词组、每个平台、每条标题的统计条目，按当日聚合版本（DayRevision）只重算变化的标题；
+词表、日期、平台集合、排名阈值或平台名称变化，或聚合版本无法衔接时全量重建。
+输出的 word_stats 与全量统计完全一致（条目顺序相同）
+"""
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from crawl_server.core.utils.keyword_matcher import get_keyword_matcher
+
+
+class IncrementalWordStats:
+    """词组统计增量引擎（daily 模式）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._matcher = None
+        self._key: Optional[Tuple] = None
+        self._files: Tuple = ()
+        # group_key -> source_id -> title -> 统计条目（插入顺序与全量统计的遍历顺序一致）
+        self._groups: Dict[str, Dict[str, Dict[str, Dict]]] = {}
+        self._counts: Dict[str, int] = {}
+        self._new_keys: List[Tuple[str, str]] = []
+
+    def compute(
+        self,
+        results: Dict,
+        word_groups: List[Dict],
+        filter_words: List[str],
+        id_to_name: Dict,
+        new_titles: Dict,
+        rank_threshold: int,
+        revision,
+        build_stat: Callable[[str, str, Dict], Dict],
+    ) -> Dict:
+        """
+        计算 word_stats（{group_key: {"count": n, "titles": {source_id: [条目, ...]}}}）
+
+        Args:
+            results: 当日聚合的标题数据（与 revision 对应，已按平台过滤）
+            word_groups: 频率词组列表
+            filter_words: 过滤词列表
+            id_to_name: 平台ID到名称的映射
+            new_titles: 最新快照的新增标题
+            rank_threshold: 排名阈值
+            revision: 当日聚合版本（DayRevision）
+            build_stat: 构建单条标题统计条目的函数 (source_id, title, title_data) -> 条目
+        """
+        matcher = get_keyword_matcher(word_groups, filter_words)
+        key = (
+            revision.date_folder,
+            tuple(results),
+            rank_threshold,
+            tuple(sorted(id_to_name.items())),
+        )
+        new_keys = [(source_id, title) for source_id, titles in new_titles.items() for title in titles]
+
+        with self._lock:
+            changes = None
+            if matcher is self._matcher and key == self._key:
+                changes = revision.changes_since(self._files)
+
+            if changes is None:
+                self._matcher, self._key = matcher, key
+                self._groups = {group["group_key"]: {} for group in word_groups}
+                self._counts = dict.fromkeys(self._groups, 0)
+                changes = [(source_id, title) for source_id, titles in results.items() for title in titles]
+                print(f"📈 词组统计：全量计算 {len(changes)} 条标题")
+            else:
+                # 新增标记在上一周期与本周期之间变化的标题也需要重算
+                changes = changes + self._new_keys + new_keys
+                print(f"📈 词组统计：增量计算 {len(changes)} 条标题")
+
+            self._apply(changes, results, word_groups, matcher, build_stat)
+            self._files = revision.files
+            self._new_keys = new_keys
+
+            return {
+                group_key: {
+                    "count": self._counts[group_key],
+                    "titles": {
+                        source_id: list(sources[source_id].values())
+                        for source_id in results
+                        if source_id in sources
+                    },
+                }
+                for group_key, sources in self._groups.items()
+            }
+
+    def _apply(self, changes, results: Dict, word_groups: List[Dict], matcher, build_stat) -> None:
+        """重算变化标题的统计条目（新标题追加在所属平台末尾，与聚合中的顺序一致）"""
+        done = set()
+        for source_id, title in changes:
+            if (source_id, title) in done:
+                continue
+            done.add((source_id, title))
+            titles_data = results.get(source_id)
+            if titles_data is None or title not in titles_data:
+                continue
+            matched_indices = matcher.match_indices(title)
+            if not matched_indices:
+                continue
+            # 标题归入第一个匹配的词组（标题与词表不变时归属不变）
+            group_key = word_groups[matched_indices[0]]["group_key"]
+            source_stats = self._groups[group_key].setdefault(source_id, {})
+            if title not in source_stats:
+                self._counts[group_key] += 1
+            source_stats[title] = build_stat(source_id, title, titles_data[title])
+
+
+# 全局增量引擎
+_incremental_stats: Optional[IncrementalWordStats] = None
+_incremental_stats_lock = threading.Lock()
+
+
+def get_incremental_word_stats() -> IncrementalWordStats:
+    """获取全局词组统计增量引擎"""
+    global _incremental_stats
+    with _incremental_stats_lock:
+        if _incremental_stats is None:
+            _incremental_stats = IncrementalWordStats()
+        return _incremental_stats
@@ -0,0 +1,20 @@
+"""
+JSON 工具函数
+
+安装了 orjson 时使用其解码（更快），否则回退到标准库 json
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """解码 JSON（接受 str 或 bytes），解码失败统一抛出 ValueError"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,247 @@
+"""
+频率词匹配器
+
+把所有词组的必须词、普通词和过滤词（统一转小写）编译为一个 Aho-Corasick 自动机，
+每个标题只扫描一遍即可得到命中的词，再按词组规则得出匹配的词组，
+代替逐词组、逐词的子串查找。匹配规则与原逐词判断完全一致：
+
+- 标题命中任一过滤词：不匹配任何词组
+- 词组的必须词全部命中，且（没有普通词或命中任一普通词）：匹配该词组
+
+编译结果按词表版本（词组与过滤词的内容）缓存，词表不变时复用同一个匹配器。
+每个匹配器同时缓存标题的匹配结果（命中的词组与是否被过滤），即按 (标题, 词表版本) 缓存：
+抓取后匹配一次（warm），统计、Kafka 事件、通知和 HTML 渲染直接复用；
+全天都在榜的标题跨抓取周期也只匹配一次
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+class AhoCorasick:
+    """多模式子串匹配自动机"""
+
+    __slots__ = ("_goto", "_fail", "_output")
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        构建自动机
+
+        Args:
+            patterns: 模式串（非空），按出现顺序编号
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        output: List[Set[int]] = [set()]
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    output.append(set())
+                state = next_state
+            output[state].add(pattern_id)
+
+        # 按层构建失败指针，并把失败链上的输出合并到当前状态
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                output[next_state] |= output[self._fail[next_state]]
+
+        self._output: List[Optional[FrozenSet[int]]] = [frozenset(ids) if ids else None for ids in output]
+
+    def find(self, text: str) -> Set[int]:
+        """返回 text 中出现的所有模式编号"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state] is not None:
+                found |= output[state]
+        return found
+
+
+# 每个匹配器缓存的标题匹配结果上限（超出时丢弃最早的一半）
+MATCH_RESULT_CACHE_SIZE = 50000
+
+
+class KeywordMatcher:
+    """编译后的词组匹配器（带标题匹配结果缓存）"""
+
+    def __init__(self, word_groups: List[Dict], filter_words: List[str]):
+        """
+        编译词表
+
+        Args:
+            word_groups: 词组列表（load_frequency_words 的格式）
+            filter_words: 过滤词列表
+        """
+        self.word_groups = word_groups
+        self.group_keys: List[str] = [group.get("group_key", "") for group in word_groups]
+
+        word_ids: Dict[str, int] = {}
+
+        def _ids(words: Iterable[str]) -> FrozenSet[int]:
+            return frozenset(word_ids.setdefault(word.lower(), len(word_ids)) for word in words)
+
+        self._filter_ids = _ids(filter_words)
+        self._groups: List[Tuple[FrozenSet[int], FrozenSet[int]]] = [
+            (_ids(group.get("required", [])), _ids(group.get("normal", []))) for group in word_groups
+        ]
+
+        # 空字符串是任何标题的子串，视为总是命中
+        self._always_found = frozenset(word_id for word, word_id in word_ids.items() if not word)
+        words = sorted(word_ids, key=word_ids.get)
+        self._automaton = AhoCorasick(word if word else "\0" for word in words)
+
+        # 词 -> 引用它的词组（只检查命中词涉及的词组），以及不含任何词的词组（总是候选）
+        self._groups_by_word: Dict[int, List[int]] = {}
+        self._wordless_groups: List[int] = []
+        for index, (required, normal) in enumerate(self._groups):
+            if not required and not normal:
+                self._wordless_groups.append(index)
+            for word_id in required | normal:
+                self._groups_by_word.setdefault(word_id, []).append(index)
+
+        # 标题 -> (是否命中过滤词, 匹配的词组下标)
+        self._results: Dict[str, Tuple[bool, Tuple[int, ...]]] = {}
+        self._results_lock = threading.Lock()
+
+    def _found_words(self, title: str) -> Set[int]:
+        found = self._automaton.find(title.lower())
+        if self._always_found:
+            found |= self._always_found
+        return found
+
+    def _compute(self, title: str) -> Tuple[bool, Tuple[int, ...]]:
+        """匹配标题，返回 (是否命中过滤词, 匹配的词组下标)"""
+        found = self._found_words(title)
+        if not self._filter_ids.isdisjoint(found):
+            return True, ()
+
+        candidates = set(self._wordless_groups)
+        for word_id in found:
+            candidates.update(self._groups_by_word.get(word_id, ()))
+
+        matched = []
+        for index in sorted(candidates):
+            required, normal = self._groups[index]
+            if required and not required <= found:
+                continue
+            if normal and normal.isdisjoint(found):
+                continue
+            matched.append(index)
+        return False, tuple(matched)
+
+    def _result(self, title) -> Tuple[bool, Tuple[int, ...]]:
+        """标题的匹配结果（优先取缓存）"""
+        if not isinstance(title, str):
+            title = str(title) if title is not None else ""
+        result = self._results.get(title)
+        if result is None:
+            result = self._compute(title) if title.strip() else (False, ())
+            with self._results_lock:
+                if len(self._results) >= MATCH_RESULT_CACHE_SIZE:
+                    for stale in list(self._results)[:MATCH_RESULT_CACHE_SIZE // 2]:
+                        del self._results[stale]
+                self._results[title] = result
+        return result
+
+    def warm(self, results: Dict) -> int:
+        """
+        预先匹配抓取结果中的所有标题
+
+        Args:
+            results: {platform_id: {title: title_data}}
+
+        Returns:
+            本次新匹配（不在缓存中）的标题数
+        """
+        computed = 0
+        for titles_data in results.values():
+            for title in titles_data:
+                if title not in self._results:
+                    self._result(title)
+                    computed += 1
+        return computed
+
+    def match_indices(self, title: str) -> Tuple[int, ...]:
+        """
+        标题匹配的词组下标（按词组配置顺序）
+
+        空标题或命中过滤词时返回空元组
+        """
+        return self._result(title)[1]
+
+    def is_filtered(self, title: str) -> bool:
+        """标题是否命中过滤词"""
+        return self._result(title)[0]
+
+    def match(self, title: str) -> List[str]:
+        """标题匹配的词组 group_key（按词组配置顺序）"""
+        return [self.group_keys[index] for index in self.match_indices(title)]
+
+    def matches(self, title: str) -> bool:
+        """标题是否匹配任一词组（没有配置词组时匹配所有非空标题）"""
+        if not self.word_groups:
+            if not isinstance(title, str):
+                title = str(title) if title is not None else ""
+            return bool(title.strip())
+        return bool(self.match_indices(title))
+
+
+# 编译缓存：按词表内容缓存最近使用的匹配器；同一词表对象的重复调用直接命中 _last_matcher
+_MATCHER_CACHE_SIZE = 8
+_matcher_cache: "OrderedDict[Tuple, KeywordMatcher]" = OrderedDict()
+_last_matcher: Optional[Tuple[List[Dict], List[str], KeywordMatcher]] = None
+_matcher_lock = threading.Lock()
+
+
+def _word_list_version(word_groups: List[Dict], filter_words: List[str]) -> Tuple:
+    """词表版本（词组与过滤词的内容）"""
+    return (
+        tuple(
+            (tuple(group.get("required", [])), tuple(group.get("normal", [])), group.get("group_key", ""))
+            for group in word_groups
+        ),
+        tuple(filter_words),
+    )
+
+
+def get_keyword_matcher(word_groups: List[Dict], filter_words: List[str]) -> KeywordMatcher:
+    """
+    获取词表对应的匹配器（词表内容不变时复用已编译的匹配器）
+
+    词表加载后视为只读（重新加载会得到新的列表对象）
+    """
+    global _last_matcher
+    last = _last_matcher
+    if last is not None and last[0] is word_groups and last[1] is filter_words:
+        return last[2]
+
+    version = _word_list_version(word_groups, filter_words)
+    with _matcher_lock:
+        matcher = _matcher_cache.get(version)
+        if matcher is None:
+            matcher = KeywordMatcher(word_groups, filter_words)
+            _matcher_cache[version] = matcher
+            while len(_matcher_cache) > _MATCHER_CACHE_SIZE:
+                _matcher_cache.popitem(last=False)
+        else:
+            _matcher_cache.move_to_end(version)
+        # 持有词表引用，保证对象 id 不会被复用
+        _last_matcher = (word_groups, filter_words, matcher)
+    return matcher
@@ -0,0 +1,286 @@
+"""
+输出目录清单（manifest）
+
+快照/报告写入时同步更新清单，读取方查清单而不是遍历 output/ 目录：
+
+- output/<日期>/manifest.json：当天每个快照的时间、平台、标题数、字节数、内容哈希，以及报告文件
+- output/manifest.json：按日期汇总（快照数、报告数、总字节数、最新快照），
+  以及每个报告文件名最近一次出现的日期（按时间查报告时无需遍历所有日期）
+
+清单均以临时文件 + 重命名的方式原子写入；缺失时从目录重建一次
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .day_archive import list_members, member_info
+
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+
+_DATE_FOLDER_PATTERN = re.compile(r"^(\d{4})年(\d{2})月(\d{2})日$")
+_FAILED_SECTION_MARKER = "==== 以下ID请求失败 ===="
+
+_manifest_lock = threading.Lock()
+
+
+def _now_str() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    """原子写入 JSON（临时文件 + 重命名）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path) -> Optional[Dict]:
+    """读取 JSON，缺失、损坏或版本不符时返回 None"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+    return data
+
+
+def date_folder_to_str(date_folder: str) -> Optional[str]:
+    """日期文件夹名（YYYY年MM月DD日）转为 YYYYMMDD，格式无效时返回 None"""
+    match = _DATE_FOLDER_PATTERN.match(date_folder)
+    if not match:
+        return None
+    return "".join(match.groups())
+
+
+def summarize_snapshot(content: str) -> Tuple[List[str], Dict[str, int], List[str]]:
+    """
+    从快照文本统计平台、各平台标题数和失败平台
+
+    Returns:
+        (platforms, title_counts, failed_ids)
+    """
+    platforms = []
+    title_counts = {}
+    failed_ids = []
+    for section in content.split("\n\n"):
+        lines = [line for line in section.strip().split("\n") if line.strip()]
+        if not lines:
+            continue
+        if _FAILED_SECTION_MARKER in lines[0]:
+            failed_ids.extend(line.strip() for line in lines[1:])
+            continue
+        platform_id = lines[0].split(" | ", 1)[0].strip()
+        platforms.append(platform_id)
+        title_counts[platform_id] = len(lines) - 1
+    return platforms, title_counts, failed_ids
+
+
+class OutputManifest:
+    """output/ 目录清单"""
+
+    def __init__(self, output_dir: Optional[Path] = None):
+        """
+        初始化清单
+
+        Args:
+            output_dir: 输出根目录，默认 output
+        """
+        self.output_dir = Path(output_dir) if output_dir else Path("output")
+        self.root_path = self.output_dir / MANIFEST_FILENAME
+
+    def day_path(self, date_folder: str) -> Path:
+        return self.output_dir / date_folder / MANIFEST_FILENAME
+
+    # === 读取 ===
+
+    def load_day(self, date_folder: str) -> Dict:
+        """读取某天的清单（缺失时从目录重建并保存；日期目录不存在时返回空清单）"""
+        with _manifest_lock:
+            manifest = _read_json(self.day_path(date_folder))
+            if manifest is None:
+                manifest = self._rebuild_day(date_folder)
+            return manifest
+
+    def load_root(self) -> Dict:
+        """读取根清单（缺失时从目录重建并保存）"""
+        with _manifest_lock:
+            manifest = _read_json(self.root_path)
+            if manifest is None:
+                manifest = self._rebuild_root()
+            return manifest
+
+    # === 写入 ===
+
+    def record_snapshot(self, file_path: str, content: str, time_info: Optional[str] = None) -> None:
+        """
+        记录一个快照文件（快照提交后调用）
+
+        Args:
+            file_path: 快照路径（output/<日期>/txt/<时间><后缀>）
+            content: 快照文本
+            time_info: 时间标签，默认取文件名去掉后缀
+        """
+        path = Path(file_path)
+        date_folder = path.parent.parent.name
+        time_info = time_info or path.name.split(".", 1)[0]
+        with _manifest_lock:
+            manifest = _read_json(self.day_path(date_folder)) or self._rebuild_day(date_folder)
+            manifest["snapshots"][time_info] = self._snapshot_entry(path, content, time_info)
+            self._save_day(date_folder, manifest)
+
+    def record_report(self, file_path: str) -> None:
+        """
+        记录一个报告文件（写入 HTML 报告后调用）
+
+        Args:
+            file_path: 报告路径（output/<日期>/html/<文件名>.html）
+        """
+        path = Path(file_path)
+        date_folder = path.parent.parent.name
+        with _manifest_lock:
+            manifest = _read_json(self.day_path(date_folder)) or self._rebuild_day(date_folder)
+            manifest["reports"][path.name] = self._report_entry(path)
+            self._save_day(date_folder, manifest)
+
+    # === 内部实现（调用方持有 _manifest_lock） ===
+
+    @staticmethod
+    def _snapshot_entry(path: Path, content: str, time_info: str) -> Dict:
+        platforms, title_counts, failed_ids = summarize_snapshot(content)
+        size, mtime_ns = member_info(path)
+        return {
+            "file": f"txt/{path.name}",
+            "time": time_info,
+            "platforms": platforms,
+            "title_counts": title_counts,
+            "failed_ids": failed_ids,
+            "bytes": size,
+            "mtime_ns": mtime_ns,
+            "hash": hashlib.sha1(content.encode("utf-8")).hexdigest(),
+        }
+
+    @staticmethod
+    def _report_entry(path: Path) -> Dict:
+        size, mtime_ns = member_info(path)
+        return {
+            "file": f"html/{path.name}",
+            "bytes": size,
+            "mtime": mtime_ns / 1e9,
+        }
+
+    def _rebuild_day(self, date_folder: str, update_root: bool = True) -> Dict:
+        """从日期目录重建当天清单（目录存在时保存）"""
+        day_dir = self.output_dir / date_folder
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "date_folder": date_folder,
+            "snapshots": {},
+            "reports": {},
+        }
+        if not day_dir.is_dir():
+            return manifest
+
+        # 快照后端在 core.data 中定义（其依赖 core.utils），此处延迟导入
+        from crawl_server.core.data.snapshot_store import (
+            list_snapshot_files,
+            read_snapshot_text,
+            snapshot_time_label,
+        )
+
+        for path in list_snapshot_files(day_dir / "txt"):
+            try:
+                content = read_snapshot_text(path)
+            except (OSError, ValueError, EOFError):
+                continue
+            time_info = snapshot_time_label(path)
+            manifest["snapshots"][time_info] = self._snapshot_entry(path, content, time_info)
+
+        for path in sorted(list_members(day_dir / "html", lambda name: name.endswith(".html"))):
+            manifest["reports"][path.name] = self._report_entry(path)
+
+        self._save_day(date_folder, manifest, update_root=update_root)
+        return manifest
+
+    def _save_day(self, date_folder: str, manifest: Dict, update_root: bool = True) -> None:
+        """保存当天清单，并同步更新根清单中的当天汇总"""
+        manifest["snapshots"] = dict(sorted(manifest["snapshots"].items()))
+        manifest["updated_at"] = _now_str()
+        try:
+            _write_json(self.day_path(date_folder), manifest)
+        except OSError as e:
+            print(f"保存当日清单失败: {e}")
+            return
+
+        date_str = date_folder_to_str(date_folder)
+        if not date_str or not update_root:
+            return
+        root = _read_json(self.root_path) or self._rebuild_root(skip=date_folder)
+        root["days"][date_folder] = self._day_summary(date_str, manifest)
+        for name, entry in manifest["reports"].items():
+            known = root["reports_by_name"].get(name)
+            if not known or known["mtime"] <= entry["mtime"]:
+                root["reports_by_name"][name] = {"date_folder": date_folder, "mtime": entry["mtime"]}
+        self._save_root(root)
+
+    @staticmethod
+    def _day_summary(date_str: str, manifest: Dict) -> Dict:
+        snapshots = manifest["snapshots"]
+        reports = manifest["reports"]
+        return {
+            "date_str": date_str,
+            "snapshot_count": len(snapshots),
+            "report_count": len(reports),
+            "latest_snapshot": next(reversed(snapshots), None) if snapshots else None,
+            "total_bytes": sum(s["bytes"] for s in snapshots.values()) + sum(r["bytes"] for r in reports.values()),
+            "updated_at": manifest["updated_at"],
+        }
+
+    def _rebuild_root(self, skip: Optional[str] = None) -> Dict:
+        """从各日期清单重建根清单（skip 为正在保存的日期，由调用方填充）"""
+        root = {"version": MANIFEST_VERSION, "days": {}, "reports_by_name": {}}
+        if not self.output_dir.is_dir():
+            return root
+
+        for entry in sorted(os.scandir(self.output_dir), key=lambda e: e.name):
+            date_str = date_folder_to_str(entry.name)
+            if not date_str or not entry.is_dir() or entry.name == skip:
+                continue
+            manifest = _read_json(self.day_path(entry.name))
+            if manifest is None:
+                manifest = self._rebuild_day(entry.name, update_root=False)
+            root["days"][entry.name] = self._day_summary(date_str, manifest)
+            for name, report in manifest["reports"].items():
+                known = root["reports_by_name"].get(name)
+                if not known or known["mtime"] <= report["mtime"]:
+                    root["reports_by_name"][name] = {"date_folder": entry.name, "mtime": report["mtime"]}
+
+        if skip is None:
+            self._save_root(root)
+        return root
+
+    def _save_root(self, root: Dict) -> None:
+        root["days"] = dict(sorted(root["days"].items()))
+        root["updated_at"] = _now_str()
+        try:
+            _write_json(self.root_path, root)
+        except OSError as e:
+            print(f"保存根清单失败: {e}")
+
+
+# 全局清单实例（默认 output 目录）
+_output_manifest = OutputManifest()
+
+
+def get_output_manifest() -> OutputManifest:
+    """获取默认 output 目录的清单实例"""
+    return _output_manifest
@@ -3,15 +3,68 @@
 
 用于生成各种格式的报告（HTML、飞书、钉钉等）
 """
+import hashlib
+import json
+import os
+import shutil
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from crawl_server.configs import CrawlConfig
-from crawl_server.core.utils.contents import render_html_content
+from crawl_server.core.utils.contents import write_html_content
+from crawl_server.core.utils.contents.template_cache import ChunkedWriter, templates_signature
 from crawl_server.core.utils.data_utils import prepare_report_data
 from crawl_server.core.utils.file_utils import get_output_path
+from crawl_server.core.utils.manifest import get_output_manifest
 from crawl_server.core.utils.time_utils import format_time_filename
 
+
+def _write_report_file(file_path: Path, report_data: Dict, *render_args) -> None:
+    """流式渲染报告到临时文件后原子替换（读取方不会看到写了一半的报告）"""
+    tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        writer = ChunkedWriter(f)
+        write_html_content(writer, report_data, *render_args)
+        writer.flush()
+    os.replace(tmp_path, file_path)
+
+
+def _link_file(source_path: Path, target_path: Path) -> None:
+    """
+    把已写好的报告发布到另一个文件名（index.html、内容未变的时间段报告）：
+    硬链接到同一文件后原子替换，不再重复写一份内容
+
+    文件系统不支持硬链接（或跨设备）时退回复制
+    """
+    tmp_path = target_path.with_name(f"{target_path.name}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    try:
+        os.link(source_path, tmp_path)
+    except OSError:
+        shutil.copyfile(source_path, tmp_path)
+    os.replace(tmp_path, target_path)
+
+
+def _report_digest(report_data: Dict, *render_args) -> str:
+    """
+    报告内容摘要（报告数据、渲染参数与模板版本；不含生成时间）
+
+    prepare_report_data 的输出顺序是确定的，且列表顺序本身决定渲染结果，因此不排序键，直接紧凑序列化
+    """
+    payload = json.dumps(
+        [report_data, render_args, templates_signature()],
+        default=str, check_circular=False, separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# 最近生成的报告：{汇总文件路径 / ("slot", 日期目录) / "index": (摘要, 文件路径)}
+_last_reports: Dict[object, Tuple[str, str]] = {}
+_last_reports_lock = threading.Lock()
+
+
 def generate_html_report(
     stats: List[Dict],
     total_titles: int,
@@ -22,6 +75,8 @@ def generate_html_report(
     is_daily_summary: bool = False,
     update_info: Optional[Dict] = None,
     crawl_config: Optional[CrawlConfig] = None,
+    word_groups: Optional[List[Dict]] = None,
+    filter_words: Optional[List[str]] = None,
 ) -> str:
     """生成HTML报告"""
     if is_daily_summary:
@@ -36,19 +91,37 @@ def generate_html_report(
 
     file_path = get_output_path("html", filename)
 
-    report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode, crawl_config=crawl_config)
-
-    html_content = render_html_content(
-        report_data, total_titles, is_daily_summary, mode, update_info
+    report_data = prepare_report_data(
+        stats, failed_ids, new_titles, id_to_name, mode,
+        crawl_config=crawl_config, word_groups=word_groups, filter_words=filter_words,
     )
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    render_args = (total_titles, is_daily_summary, mode, update_info)
+    digest = _report_digest(report_data, *render_args)
+    path = Path(file_path)
+    slot_key = file_path if is_daily_summary else ("slot", path.parent.parent.name)
 
-    if is_daily_summary:
-        root_file_path = Path("output") / "index.html"
-        with open(root_file_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+    with _last_reports_lock:
+        previous = _last_reports.get(slot_key)
+        if previous is not None and previous[0] == digest and Path(previous[1]).exists():
+            if previous[1] == file_path:
+                # 同一报告文件内容未变（汇总报告）：不重新渲染，也不改写文件（保持修改时间，HTTP 缓存继续有效）
+                print(f"📄 报告内容未变化，跳过生成: {file_path}")
+            else:
+                # 时间段报告与上一份内容相同：直接链接到上一份报告
+                _link_file(Path(previous[1]), path)
+                get_output_manifest().record_report(file_path)
+                print(f"📄 报告内容未变化，复用 {Path(previous[1]).name}: {file_path}")
+        else:
+            _write_report_file(path, report_data, *render_args)
+            get_output_manifest().record_report(file_path)
+        _last_reports[slot_key] = (digest, file_path)
+
+        if is_daily_summary:
+            index_path = Path("output") / "index.html"
+            if _last_reports.get("index") != (digest, file_path) or not index_path.exists():
+                _link_file(path, index_path)
+                _last_reports["index"] = (digest, file_path)
 
     return file_path
 
@@ -0,0 +1,133 @@
+"""
+新闻权重批量计算与排序
+
+把一组标题的排名、出现次数展开为扁平数组，一次算出所有标题的排名权重、频次权重和热度权重
+（安装了 NumPy 时向量化计算，否则用 array 逐条计算），排序键与 calculate_news_weight 的结果一致。
+设置了显示数量上限时用堆选出前 k 条，不再整体排序后截取
+"""
+import heapq
+from array import array
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def _flatten_ranks(titles: List[Dict]) -> Tuple[array, array, array]:
+    """展开为 (扁平排名数组, 每条标题的排名个数, 出现次数)"""
+    rank_lists = [title_data.get("ranks", []) for title_data in titles]
+    flat_ranks = array("l", chain.from_iterable(rank_lists))
+    lengths = array("l", map(len, rank_lists))
+    counts = array("l", [title_data.get("count", length) for title_data, length in zip(titles, lengths)])
+    return flat_ranks, lengths, counts
+
+
+def _columns_numpy(flat_ranks: array, lengths: array, counts: array, rank_threshold: int, weight_config):
+    """NumPy 向量化计算，返回 (权重, 最高排名, 出现次数) 三列"""
+    ranks = np.asarray(flat_ranks, dtype=np.int64)
+    lengths_np = np.asarray(lengths, dtype=np.int64)
+    counts_np = np.asarray(counts, dtype=np.int64)
+
+    has_ranks = lengths_np > 0
+    starts = np.zeros(len(lengths_np), dtype=np.int64)
+    np.cumsum(lengths_np[:-1], out=starts[1:])
+
+    rank_sums = np.zeros(len(lengths_np), dtype=np.int64)
+    high_counts = np.zeros(len(lengths_np), dtype=np.int64)
+    best_ranks = np.full(len(lengths_np), 999, dtype=np.int64)
+    if len(ranks):
+        # reduceat 只对有排名的标题取区间（空区间会取到下一个元素）
+        valid_starts = starts[has_ranks]
+        rank_sums[has_ranks] = np.add.reduceat(11 - np.minimum(ranks, 10), valid_starts)
+        high_counts[has_ranks] = np.add.reduceat((ranks <= rank_threshold).astype(np.int64), valid_starts)
+        best_ranks[has_ranks] = np.minimum.reduceat(ranks, valid_starts)
+
+    safe_lengths = np.where(has_ranks, lengths_np, 1)
+    rank_weight = rank_sums / safe_lengths
+    frequency_weight = np.minimum(counts_np, 10) * 10
+    hotness_weight = high_counts / safe_lengths * 100
+
+    weights = (
+        rank_weight * weight_config.RANK_WEIGHT
+        + frequency_weight * weight_config.FREQUENCY_WEIGHT
+        + hotness_weight * weight_config.HOTNESS_WEIGHT
+    )
+    return np.where(has_ranks, weights, 0.0).tolist(), best_ranks.tolist(), counts_np.tolist()
+
+
+def _columns_python(flat_ranks: array, lengths: array, counts: array, rank_threshold: int, weight_config):
+    """逐条计算（未安装 NumPy 时），返回 (权重, 最高排名, 出现次数) 三列"""
+    rank_factor = weight_config.RANK_WEIGHT
+    frequency_factor = weight_config.FREQUENCY_WEIGHT
+    hotness_factor = weight_config.HOTNESS_WEIGHT
+
+    weights = []
+    best_ranks = []
+    offset = 0
+    for length, count in zip(lengths, counts):
+        if not length:
+            weights.append(0.0)
+            best_ranks.append(999)
+            continue
+        ranks = flat_ranks[offset:offset + length]
+        offset += length
+        rank_sum = 0
+        high_count = 0
+        for rank in ranks:
+            rank_sum += 11 - (rank if rank < 10 else 10)
+            if rank <= rank_threshold:
+                high_count += 1
+        weights.append(
+            rank_sum / length * rank_factor
+            + min(count, 10) * 10 * frequency_factor
+            + high_count / length * 100 * hotness_factor
+        )
+        best_ranks.append(min(ranks))
+    return weights, best_ranks, counts.tolist()
+
+
+def _score_columns(titles: List[Dict], rank_threshold: int, weight_config):
+    if not weight_config:
+        raise RuntimeError("weight_config 未提供，无法计算权重")
+    if not titles:
+        return [], [], []
+    columns = _flatten_ranks(titles)
+    if NUMPY_AVAILABLE:
+        return _columns_numpy(*columns, rank_threshold, weight_config)
+    return _columns_python(*columns, rank_threshold, weight_config)
+
+
+def calculate_news_weights(titles: List[Dict], rank_threshold: int = 5, weight_config=None) -> Sequence[float]:
+    """
+    批量计算新闻权重（每条结果与 calculate_news_weight 相同）
+
+    Args:
+        titles: 标题数据列表（含 ranks，可选 count）
+        rank_threshold: 排名阈值
+        weight_config: 权重配置对象
+    """
+    return _score_columns(titles, rank_threshold, weight_config)[0]
+
+
+def rank_titles(titles: List[Dict], rank_threshold: int = 5, weight_config=None, limit: int = 0) -> List[Dict]:
+    """
+    按权重降序、最高排名升序、出现次数降序排列标题（同分保持原顺序）
+
+    Args:
+        titles: 标题数据列表
+        rank_threshold: 排名阈值
+        weight_config: 权重配置对象
+        limit: 只取前 limit 条（0 表示全部）
+    """
+    weights, best_ranks, counts = _score_columns(titles, rank_threshold, weight_config)
+    keys = list(zip([-weight for weight in weights], best_ranks, [-count for count in counts]))
+    if 0 < limit < len(titles):
+        # nsmallest 与 sorted(...)[:limit] 结果一致（同键时保持原顺序）
+        order = heapq.nsmallest(limit, range(len(titles)), key=keys.__getitem__)
+    else:
+        order = sorted(range(len(titles)), key=keys.__getitem__)
+    return [titles[index] for index in order]
@@ -0,0 +1,71 @@
+"""
+进程内单飞（single-flight）工具
+
+同一个 key 同时只执行一次：执行期间到达的调用不再重复执行，
+而是等待正在进行的那一次完成并共享其结果（或异常）
+"""
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class _Call:
+    """一次正在进行的调用"""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """进程内单飞执行器"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        执行 fn，同一 key 的并发调用合并为一次
+
+        Args:
+            key: 合并键
+            fn: 实际执行的函数
+
+        Returns:
+            (结果, 是否共享了其他调用的结果)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self, key: str) -> bool:
+        """该 key 当前是否有调用正在执行"""
+        with self._lock:
+            return key in self._calls
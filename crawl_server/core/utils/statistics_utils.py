@@ -5,6 +5,9 @@ from typing import Dict, List, Optional, Tuple
 
 from crawl_server.configs import CrawlConfig
 from crawl_server.core.utils.file_utils import is_first_crawl_today
+from crawl_server.core.utils.incremental_stats import get_incremental_word_stats
+from crawl_server.core.utils.keyword_matcher import get_keyword_matcher
+from crawl_server.core.utils.scoring import rank_titles
 from crawl_server.core.utils.time_utils import format_time_display
 
 
@@ -59,47 +62,8 @@ def calculate_news_weight(
 def matches_word_groups(
     title: str, word_groups: List[Dict], filter_words: List[str]
 ) -> bool:
-    """检查标题是否匹配词组规则"""
-    # 防御性类型检查：确保 title 是有效字符串
-    if not isinstance(title, str):
-        title = str(title) if title is not None else ""
-    if not title.strip():
-        return False
-
-    # 如果没有配置词组，则匹配所有标题（支持显示全部新闻）
-    if not word_groups:
-        return True
-
-    title_lower = title.lower()
-
-    # 过滤词检查
-    if any(filter_word.lower() in title_lower for filter_word in filter_words):
-        return False
-
-    # 词组匹配检查
-    for group in word_groups:
-        required_words = group["required"]
-        normal_words = group["normal"]
-
-        # 必须词检查
-        if required_words:
-            all_required_present = all(
-                req_word.lower() in title_lower for req_word in required_words
-            )
-            if not all_required_present:
-                continue
-
-        # 普通词检查
-        if normal_words:
-            any_normal_present = any(
-                normal_word.lower() in title_lower for normal_word in normal_words
-            )
-            if not any_normal_present:
-                continue
-
-        return True
-
-    return False
+    """检查标题是否匹配词组规则（没有配置词组时匹配所有非空标题）"""
+    return get_keyword_matcher(word_groups, filter_words).matches(title)
 
 
 def count_word_frequency(
@@ -112,12 +76,14 @@ def count_word_frequency(
     new_titles: Optional[Dict] = None,
     mode: str = "daily",
     crawl_config: Optional[CrawlConfig] = None,
+    day_revision=None,
 ) -> Tuple[List[Dict], int]:
     """
     统计词频，支持必须词、频率词、过滤词，并标记新增标题
     
     Args:
         crawl_config: 爬虫配置对象
+        day_revision: results 对应的当日聚合版本（DayRevision）；daily 模式下传入时增量统计
     """
     if not crawl_config:
         raise RuntimeError("CrawlConfig 未提供，无法统计词频")
@@ -195,9 +161,82 @@ def count_word_frequency(
     if new_titles is None:
         new_titles = {}
 
+    def build_title_stat(source_id: str, title: str, title_data: Dict) -> Dict:
+        """构建单条标题的统计条目"""
+        source_ranks = title_data.get("ranks", [])
+        source_url = title_data.get("url", "")
+        source_mobile_url = title_data.get("mobileUrl", "")
+
+        first_time = ""
+        last_time = ""
+        count_info = 1
+        ranks = source_ranks if source_ranks else []
+        url = source_url
+        mobile_url = source_mobile_url
+
+        # 从历史统计信息中获取完整数据（current 模式及其他模式规则相同）
+        if title_info and source_id in title_info and title in title_info[source_id]:
+            info = title_info[source_id][title]
+            first_time = info.get("first_time", "")
+            last_time = info.get("last_time", "")
+            count_info = info.get("count", 1)
+            if "ranks" in info and info["ranks"]:
+                ranks = info["ranks"]
+            url = info.get("url", source_url)
+            mobile_url = info.get("mobileUrl", source_mobile_url)
+
+        if not ranks:
+            ranks = [99]
+
+        time_display = format_time_display(first_time, last_time)
+
+        source_name = id_to_name.get(source_id, source_id)
+
+        # 判断是否为新增
+        is_new = False
+        if all_news_are_new:
+            # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
+            is_new = True
+        elif new_titles and source_id in new_titles:
+            # 检查是否在新增列表中
+            new_titles_for_source = new_titles[source_id]
+            is_new = title in new_titles_for_source
+
+        return {
+            "title": title,
+            "source_name": source_name,
+            "first_time": first_time,
+            "last_time": last_time,
+            "time_display": time_display,
+            "count": count_info,
+            "ranks": ranks,
+            "rank_threshold": rank_threshold,
+            "url": url,
+            "mobileUrl": mobile_url,
+            "is_new": is_new,
+        }
+
+    if mode == "daily" and day_revision is not None:
+        # 当日汇总：按聚合版本只重算变化的标题
+        total_titles = sum(len(titles_data) for titles_data in results_to_process.values())
+        word_stats = get_incremental_word_stats().compute(
+            results_to_process,
+            word_groups,
+            filter_words,
+            id_to_name,
+            new_titles,
+            rank_threshold,
+            day_revision,
+            build_title_stat,
+        )
+        results_to_process = {}
+
     for group in word_groups:
         group_key = group["group_key"]
-        word_stats[group_key] = {"count": 0, "titles": {}}
+        word_stats.setdefault(group_key, {"count": 0, "titles": {}})
+
+    all_news_mode = len(word_groups) == 1 and word_groups[0]["group_key"] == "全部新闻"
+    matcher = get_keyword_matcher(word_groups, filter_words)
 
     for source_id, titles_data in results_to_process.items():
         total_titles += len(titles_data)
@@ -209,12 +248,9 @@ def count_word_frequency(
             if title in processed_titles.get(source_id, {}):
                 continue
 
-            # 使用统一的匹配逻辑
-            matches_frequency_words = matches_word_groups(
-                title, word_groups, filter_words
-            )
-
-            if not matches_frequency_words:
+            # 使用统一的匹配逻辑（编译后的匹配器，一次扫描得到匹配的词组）
+            matched_indices = matcher.match_indices(title)
+            if not matched_indices:
                 continue
 
             # 如果是增量模式或 current 模式第一次，统计匹配的新增新闻数量
@@ -223,119 +259,13 @@ def count_word_frequency(
             ):
                 matched_new_count += 1
 
-            source_ranks = title_data.get("ranks", [])
-            source_url = title_data.get("url", "")
-            source_mobile_url = title_data.get("mobileUrl", "")
-
-            # 找到匹配的词组（防御性转换确保类型安全）
-            title_lower = str(title).lower() if not isinstance(title, str) else title.lower()
-            for group in word_groups:
-                required_words = group["required"]
-                normal_words = group["normal"]
-
-                # 如果是"全部新闻"模式，所有标题都匹配第一个（唯一的）词组
-                if len(word_groups) == 1 and word_groups[0]["group_key"] == "全部新闻":
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-                else:
-                    # 原有的匹配逻辑
-                    if required_words:
-                        all_required_present = all(
-                            req_word.lower() in title_lower
-                            for req_word in required_words
-                        )
-                        if not all_required_present:
-                            continue
-
-                    if normal_words:
-                        any_normal_present = any(
-                            normal_word.lower() in title_lower
-                            for normal_word in normal_words
-                        )
-                        if not any_normal_present:
-                            continue
-
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-
-                first_time = ""
-                last_time = ""
-                count_info = 1
-                ranks = source_ranks if source_ranks else []
-                url = source_url
-                mobile_url = source_mobile_url
-
-                # 对于 current 模式，从历史统计信息中获取完整数据
-                if (
-                    mode == "current"
-                    and title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-                elif (
-                    title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-
-                if not ranks:
-                    ranks = [99]
-
-                time_display = format_time_display(first_time, last_time)
-
-                source_name = id_to_name.get(source_id, source_id)
-
-                # 判断是否为新增
-                is_new = False
-                if all_news_are_new:
-                    # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
-                    is_new = True
-                elif new_titles and source_id in new_titles:
-                    # 检查是否在新增列表中
-                    new_titles_for_source = new_titles[source_id]
-                    is_new = title in new_titles_for_source
-
-                word_stats[group_key]["titles"][source_id].append(
-                    {
-                        "title": title,
-                        "source_name": source_name,
-                        "first_time": first_time,
-                        "last_time": last_time,
-                        "time_display": time_display,
-                        "count": count_info,
-                        "ranks": ranks,
-                        "rank_threshold": rank_threshold,
-                        "url": url,
-                        "mobileUrl": mobile_url,
-                        "is_new": is_new,
-                    }
-                )
-
-                if source_id not in processed_titles:
-                    processed_titles[source_id] = {}
-                processed_titles[source_id][title] = True
-
-                break
+            # 标题归入第一个匹配的词组（"全部新闻"模式下只有一个词组）
+            group_key = word_groups[0 if all_news_mode else matched_indices[0]]["group_key"]
+            word_stats[group_key]["count"] += 1
+            word_stats[group_key]["titles"].setdefault(source_id, []).append(
+                build_title_stat(source_id, title, title_data)
+            )
+            processed_titles[source_id][title] = True
 
     # 最后统一打印汇总信息
     if mode == "incremental":
@@ -401,24 +331,19 @@ def count_word_frequency(
         for source_id, title_list in data["titles"].items():
             all_titles.extend(title_list)
 
-        # 按权重排序
-        sorted_titles = sorted(
-            all_titles,
-            key=lambda x: (
-                -calculate_news_weight(x, rank_threshold, crawl_config.WEIGHT_CONFIG),
-                min(x["ranks"]) if x["ranks"] else 999,
-                -x["count"],
-            ),
-        )
-
         # 应用最大显示数量限制（优先级：单独配置 > 全局配置）
         group_max_count = group_key_to_max_count.get(group_key, 0)
         if group_max_count == 0:
             # 使用全局配置
             group_max_count = crawl_config.MAX_NEWS_PER_KEYWORD
 
-        if group_max_count > 0:
-            sorted_titles = sorted_titles[:group_max_count]
+        # 批量计算权重后排序（设置了上限时只选出前 group_max_count 条）
+        sorted_titles = rank_titles(
+            all_titles,
+            rank_threshold,
+            crawl_config.WEIGHT_CONFIG,
+            limit=max(group_max_count, 0),
+        )
 
         stats.append(
             {
@@ -5,13 +5,10 @@ import re
 
 
 def clean_title(title: str) -> str:
-    """清理标题中的特殊字符"""
+    """清理标题中的特殊字符（换行等连续空白合并为一个空格）"""
     if not isinstance(title, str):
         title = str(title)
-    cleaned_title = title.replace("\n", " ").replace("\r", " ")
-    cleaned_title = re.sub(r"\s+", " ", cleaned_title)
-    cleaned_title = cleaned_title.strip()
-    return cleaned_title
+    return " ".join(title.split())
 
 
 def html_escape(text: str) -> str:
@@ -6,7 +6,7 @@
 负责执行单次抓取任务
 """
 import logging
-from typing import Optional
+from typing import List, Optional
 
 from crawl_server.controllers import CrawlController
 
@@ -16,7 +16,8 @@ logger = logging.getLogger(__name__)
 def run_crawl_task(
     crawl_controller: Optional[CrawlController] = None,
     trigger: str = "scheduled",
-    count: int = 1
+    count: int = 1,
+    platform_ids: Optional[List[str]] = None,
 ):
     """
     执行一次抓取任务
@@ -25,6 +26,7 @@ def run_crawl_task(
         crawl_controller: 抓取控制器实例（已在初始化时接收配置）
         trigger: 触发来源（manual, scheduled, api）
         count: 抓取次数，默认为1
+        platform_ids: 本次需要请求的平台ID（自适应调度使用，None 表示全部）
     """
     if not crawl_controller:
         logger.error("❌ CrawlController 未初始化，无法执行抓取任务")
@@ -34,7 +36,7 @@ def run_crawl_task(
         logger.info(f"🔄 开始执行抓取任务: trigger={trigger}, count={count}")
         
         # 直接调用 controller 的 handle_crawl（定时服务调用，不需要 event_data）
-        crawl_controller.handle_crawl(trigger=trigger, count=count)
+        crawl_controller.handle_crawl(trigger=trigger, count=count, platform_ids=platform_ids)
         logger.info("✅ 抓取任务完成")
             
     except Exception as e:
@@ -5,7 +5,7 @@ TrendRadar Crawl Server - 主入口
 
 服务器模式：持续运行，支持：
 - 定时任务（定期抓取）
-- Kafka 事件监听（operation.crawl, operation.clear）
+- Kafka 事件监听（operation.crawl, operation.clear, 分片抓取任务）
 - 连接池管理（PostgreSQL, Kafka, Redis）
 """
 import os
@@ -15,7 +15,10 @@ import logging
 
 from crawl_server.configs import load_config, VERSION
 from crawl_server.connections import init_connections, cleanup_connections
+from crawl_server.core.data.compaction import start_day_compactor
+from crawl_server.core.data.history_store import start_history_backfill
 from crawl_server.crawl_task import run_crawl_task
+from crawl_server.scheduler import AdaptiveScheduler
 
 # 配置日志
 logging.basicConfig(
@@ -34,6 +37,96 @@ def signal_handler(sig, frame):
     running = False
 
 
+def run_fixed_loop(connections, crawl_config):
+    """固定间隔主循环：每 SCHEDULE_MINUTES 分钟抓取全部平台"""
+    global running
+
+    interval_seconds = crawl_config.SCHEDULE_MINUTES * 60
+    
+    while running:
+        try:
+            # 先执行抓取任务
+            if connections.crawl_controller:
+                run_crawl_task(
+                    crawl_controller=connections.crawl_controller,
+                    trigger="scheduled",
+                    count=1
+                )
+            else:
+                logger.error("❌ CrawlController 未初始化，无法执行抓取任务")
+            
+            # 如果收到停止信号，退出循环
+            if not running:
+                break
+            
+            # 等待指定时间
+            logger.info(f"⏰ 等待 {crawl_config.SCHEDULE_MINUTES} 分钟后执行下次任务...")
+            time.sleep(interval_seconds)
+            
+        except KeyboardInterrupt:
+            break
+        except Exception as e:
+            logger.error(f"❌ 主循环出错: {e}", exc_info=True)
+            logger.info(f"⏰ {crawl_config.SCHEDULE_MINUTES} 分钟后重试...")
+            # 即使出错也要等待，避免频繁重试
+            time.sleep(interval_seconds)
+
+
+def run_adaptive_loop(connections, crawl_config):
+    """自适应调度主循环：只抓取到期的平台，其余平台沿用上次结果"""
+    global running
+
+    scheduler = AdaptiveScheduler(crawl_config)
+
+    while running:
+        wait_seconds = scheduler.min_seconds
+        try:
+            if not connections.crawl_controller:
+                logger.error("❌ CrawlController 未初始化，无法执行抓取任务")
+            else:
+                platforms = connections.crawl_controller.platform_service.get_platforms()
+                platform_ids = [platform["id"] for platform in platforms]
+                due_ids = scheduler.due_platforms(platform_ids)
+
+                if due_ids:
+                    logger.info(f"🗓️ 本轮到期平台 {len(due_ids)}/{len(platform_ids)}: {due_ids}")
+                    scheduler.mark_started(due_ids)
+                    try:
+                        run_crawl_task(
+                            crawl_controller=connections.crawl_controller,
+                            trigger="scheduled",
+                            count=1,
+                            platform_ids=due_ids,
+                        )
+                    finally:
+                        scheduler.record_results(due_ids)
+                    logger.info(f"🗓️ 平台抓取间隔/变化率: {scheduler.describe(platform_ids)}")
+
+                wait_seconds = scheduler.seconds_until_next_due(platform_ids)
+
+            if not running:
+                break
+
+            logger.info(f"⏰ 等待 {wait_seconds / 60:.1f} 分钟后检查到期平台...")
+            time.sleep(wait_seconds)
+
+        except KeyboardInterrupt:
+            break
+        except Exception as e:
+            logger.error(f"❌ 主循环出错: {e}", exc_info=True)
+            logger.info(f"⏰ {wait_seconds / 60:.1f} 分钟后重试...")
+            time.sleep(wait_seconds)
+
+
+def run_worker_loop():
+    """分片执行方主循环：不主动抓取，只通过 Kafka 消费协调方下发的分片任务"""
+    global running
+
+    logger.info("🧩 分片执行方模式：等待协调方下发的抓取任务...")
+    while running:
+        time.sleep(1)
+
+
 def run_server_mode():
     """服务器模式：持续运行，定时执行 + 事件监听"""
     global running
@@ -49,11 +142,24 @@ def run_server_mode():
     logger.info(f"  Crawl Server Version: {VERSION}")
     logger.info("=" * 60)
     logger.info(f"🚀 启动服务器模式")
-    logger.info(f"⏰ 定时执行间隔: {crawl_config.SCHEDULE_MINUTES} 分钟")
+    if crawl_config.SCHEDULER_MODE == "adaptive":
+        logger.info(
+            f"⏰ 自适应调度: 平台抓取间隔 {crawl_config.SCHEDULER_MIN_MINUTES}~{crawl_config.SCHEDULER_MAX_MINUTES} 分钟"
+        )
+    else:
+        logger.info(f"⏰ 定时执行间隔: {crawl_config.SCHEDULE_MINUTES} 分钟")
     
     # 初始化连接（PostgreSQL, Redis, Kafka）和 Controllers
     connections = init_connections(db_config=db_config, crawl_config=crawl_config)
-    
+
+    # 启动历史日期归档线程（COMPACT_AFTER_DAYS > 0 时）
+    if start_day_compactor(crawl_config):
+        logger.info(f"🗜️ 历史归档已启用：归档 {crawl_config.COMPACT_AFTER_DAYS} 天前的日期目录")
+
+    # 本地历史库：后台补录已有快照（HISTORY_DB_ENABLED）
+    if start_history_backfill(crawl_config):
+        logger.info("🗃️ 本地历史库已启用：output/history.db")
+
     # 启动 Kafka 监听线程（controller 已经通过 event_router 注册到 kafka_consumer）
     if connections.kafka_consumer:
         from crawl_server.resources.kafka import KafkaConsumerThread
@@ -66,37 +172,16 @@ def run_server_mode():
     
 
     # 主循环：定时执行（Kafka 监听在后台线程运行）
+    if crawl_config.CRAWL_SHARD_MODE == "coordinator":
+        logger.info(f"🧩 分片协调方模式：按调度下发平台抓取任务，截止时间 {crawl_config.CRAWL_SHARD_DEADLINE_SECONDS} 秒")
     logger.info(f"🔄 进入主循环，立即执行第一次抓取任务...")
     
-    interval_seconds = crawl_config.SCHEDULE_MINUTES * 60
-    
-    while running:
-        try:
-            # 先执行抓取任务
-            if connections.crawl_controller:
-                run_crawl_task(
-                    crawl_controller=connections.crawl_controller,
-                    trigger="scheduled",
-                    count=1
-                )
-            else:
-                logger.error("❌ CrawlController 未初始化，无法执行抓取任务")
-            
-            # 如果收到停止信号，退出循环
-            if not running:
-                break
-            
-            # 等待指定时间
-            logger.info(f"⏰ 等待 {crawl_config.SCHEDULE_MINUTES} 分钟后执行下次任务...")
-            time.sleep(interval_seconds)
-            
-        except KeyboardInterrupt:
-            break
-        except Exception as e:
-            logger.error(f"❌ 主循环出错: {e}", exc_info=True)
-            logger.info(f"⏰ {crawl_config.SCHEDULE_MINUTES} 分钟后重试...")
-            # 即使出错也要等待，避免频繁重试
-            time.sleep(interval_seconds)
+    if crawl_config.CRAWL_SHARD_MODE == "worker":
+        run_worker_loop()
+    elif crawl_config.SCHEDULER_MODE == "adaptive":
+        run_adaptive_loop(connections, crawl_config)
+    else:
+        run_fixed_loop(connections, crawl_config)
     
     # 清理连接
     cleanup_connections(connections)
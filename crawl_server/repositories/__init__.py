@@ -4,7 +4,7 @@ Repositories 模块
 MVC 架构 - Repository 层
 数据访问层，分为 cache/database/pipeline/file
 """
-from .cache import FrequencyCache, PlatformCache
+from .cache import FrequencyCache, PlatformCache, CrawlLockCache
 from .database import FrequencyDatabase, PlatformDatabase, CrawlResultDatabase, CrawlSessionDatabase
 from .pipeline import CrawlPipeline
 
@@ -13,6 +13,7 @@ __all__ = [
     "FrequencyDatabase",
     "CrawlPipeline",
     "PlatformCache",
+    "CrawlLockCache",
     "PlatformDatabase",
     "CrawlResultDatabase",
     "CrawlSessionDatabase",
@@ -5,5 +5,6 @@ Redis 缓存数据访问
 """
 from .frequency import FrequencyCache
 from .platform import PlatformCache
+from .crawl_lock import CrawlLockCache
 
-__all__ = ["FrequencyCache", "PlatformCache"]
+__all__ = ["FrequencyCache", "PlatformCache", "CrawlLockCache"]
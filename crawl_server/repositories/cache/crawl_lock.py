@@ -0,0 +1,239 @@
+# coding=utf-8
+
+"""
+抓取租约仓库
+
+保证同一时间只有一个抓取在执行（跨副本/跨进程）：
+- Redis 启用时使用 Redis 租约（SET NX PX 获取，令牌比对后续期/释放）
+- 否则使用本地文件锁（output/.locks/crawl.lock，进程退出时由系统自动释放）
+- Redis 请求失败（无法判断租约是否被占用）时退回本地文件锁，不把错误当作“租约已被占用”
+
+持有者释放租约前写入本次抓取结果，等待方在租约释放后读取，共享同一次抓取的结果
+"""
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from crawl_server.resources.redis import RedisClient
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Redis key
+CRAWL_LOCK_KEY = "trendradar:crawl_lock"
+CRAWL_LOCK_RESULT_KEY = "trendradar:crawl_lock:result"
+
+
+class CrawlLockCache:
+    """抓取租约（Redis 租约 / 本地文件锁）"""
+
+    def __init__(
+        self,
+        redis_client: Optional[RedisClient] = None,
+        ttl_seconds: int = 600,
+        lock_dir: Optional[Path] = None,
+    ):
+        """
+        初始化租约仓库
+
+        Args:
+            redis_client: Redis 客户端（未启用时使用本地文件锁）
+            ttl_seconds: Redis 租约有效期（秒），持有期间每 1/3 有效期自动续期
+            lock_dir: 文件锁目录，默认 output/.locks
+        """
+        self.redis_client = redis_client
+        self.ttl_ms = max(1, ttl_seconds) * 1000
+        self.lock_dir = lock_dir or Path("output") / ".locks"
+        self.lock_file = self.lock_dir / "crawl.lock"
+        self.result_file = self.lock_dir / "crawl.result.json"
+        self._held: Dict[str, Tuple[str, object]] = {}  # {token: ("file", 文件描述符) 或 ("redis", 续期停止事件)}
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> str:
+        """当前使用的租约后端（redis / file）"""
+        if self.redis_client and self.redis_client.enable_redis:
+            return "redis"
+        return "file"
+
+    def acquire(self) -> Optional[str]:
+        """
+        尝试获取租约（不阻塞）
+
+        Returns:
+            持有者令牌，租约已被占用时返回 None
+        """
+        token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        if self.backend == "redis":
+            acquired = self.redis_client.set_nx(CRAWL_LOCK_KEY, token, px=self.ttl_ms)
+            if acquired is False:
+                return None
+            if acquired:
+                stop_event = threading.Event()
+                threading.Thread(
+                    target=self._renew_loop, args=(token, stop_event), name="crawl-lock-renew", daemon=True
+                ).start()
+                with self._lock:
+                    self._held[token] = ("redis", stop_event)
+                return token
+            logger.warning("⚠️  Redis 租约请求失败，退回本地文件锁")
+
+        fd = self._try_lock_file()
+        if fd is None:
+            return None
+        try:
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, token.encode("utf-8"), 0)
+        except OSError as e:
+            logger.warning(f"⚠️  写入抓取锁文件失败: {e}")
+        with self._lock:
+            self._held[token] = ("file", fd)
+        return token
+
+    def holder(self) -> Optional[str]:
+        """
+        当前租约持有者令牌（无人持有或暂时无法确定时返回 None）
+
+        Redis 租约无人持有时再看本地文件锁（Redis 请求失败时持有者会退回文件锁）；
+        文件锁刚被获取、令牌尚未写入时也返回 None，调用方应重试 acquire 而不是当作已被占用
+        """
+        if self.backend == "redis":
+            token = self.redis_client.get(CRAWL_LOCK_KEY)
+            if token:
+                return token
+        try:
+            content = self.lock_file.read_text(encoding="utf-8").strip()
+            return content or None
+        except OSError:
+            return None
+
+    def release(self, token: str, result: Optional[Dict] = None) -> None:
+        """
+        释放租约（先写入结果，供等待方共享）
+
+        Args:
+            token: acquire() 返回的令牌
+            result: 本次抓取结果摘要
+        """
+        with self._lock:
+            held = self._held.pop(token, None)
+        if held is None:
+            return
+
+        backend, handle = held
+        record = {
+            "token": token,
+            "result": result,
+            "finished_at": datetime.now().isoformat(),
+        }
+        if backend == "redis":
+            handle.set()
+            self.redis_client.set(CRAWL_LOCK_RESULT_KEY, record, ex=max(60, self.ttl_ms // 1000))
+            self.redis_client.compare_and_delete(CRAWL_LOCK_KEY, token)
+            return
+
+        try:
+            tmp_file = self.result_file.with_suffix(".json.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(tmp_file, self.result_file)
+            os.ftruncate(handle, 0)
+        except OSError as e:
+            logger.warning(f"⚠️  写入抓取结果文件失败: {e}")
+        finally:
+            self._unlock_file(handle)
+
+    def wait_for_release(self, holder_token: str, timeout: float, poll_interval: float = 1.0) -> Optional[Dict]:
+        """
+        等待指定持有者释放租约，并读取其写入的抓取结果
+
+        Args:
+            holder_token: 等待的持有者令牌（holder() 的返回值）
+            timeout: 最长等待时间（秒）
+            poll_interval: 轮询间隔（秒）
+
+        Returns:
+            持有者写入的结果；超时或持有者未正常释放（租约过期）时返回 None
+        """
+        stop_event = threading.Event()
+        deadline = datetime.now().timestamp() + max(0.0, timeout)
+        while True:
+            if self._released(holder_token):
+                record = self._read_result(holder_token)
+                if record and record.get("token") == holder_token:
+                    return record.get("result")
+                return None
+            remaining = deadline - datetime.now().timestamp()
+            if remaining <= 0:
+                return None
+            stop_event.wait(min(poll_interval, remaining))
+
+    def _released(self, holder_token: str) -> bool:
+        """持有者是否已释放租约（文件锁还需识别持有进程退出后残留的令牌）"""
+        if self.holder() != holder_token:
+            return True
+        if self.backend == "redis" and self.redis_client.get(CRAWL_LOCK_KEY) == holder_token:
+            return False
+        return FCNTL_AVAILABLE and not self._file_locked()
+
+    def _renew_loop(self, token: str, stop_event: threading.Event) -> None:
+        """持有期间定期续期 Redis 租约"""
+        interval = self.ttl_ms / 3000
+        while not stop_event.wait(interval):
+            if not self.redis_client.compare_and_expire(CRAWL_LOCK_KEY, token, self.ttl_ms):
+                logger.warning("⚠️  抓取租约续期失败（可能已过期被其他副本获取）")
+                return
+
+    def _read_result(self, holder_token: Optional[str] = None) -> Optional[Dict]:
+        """读取最近一次释放时写入的结果记录（Redis 中没有该持有者的记录时再读结果文件）"""
+        if self.backend == "redis":
+            value = self.redis_client.get(CRAWL_LOCK_RESULT_KEY)
+            try:
+                record = json.loads(value) if value else None
+            except ValueError:
+                record = None
+            if record and (holder_token is None or record.get("token") == holder_token):
+                return record
+        try:
+            with open(self.result_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _try_lock_file(self) -> Optional[int]:
+        """尝试获取文件锁，成功返回文件描述符"""
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        if not FCNTL_AVAILABLE:
+            return fd
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except OSError:
+            os.close(fd)
+            return None
+
+    @staticmethod
+    def _unlock_file(fd: int) -> None:
+        try:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def _file_locked(self) -> bool:
+        """文件锁是否仍被持有"""
+        fd = self._try_lock_file()
+        if fd is None:
+            return True
+        self._unlock_file(fd)
+        return False
@@ -9,7 +9,13 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime
 from crawl_server.resources.kafka.client import KafkaClient
-from crawl_server.resources.kafka.events import EventType, DataCrawlEvent
+from crawl_server.resources.kafka.events import (
+    EventType,
+    DataCrawlEvent,
+    DataCrawlShardEvent,
+    OperationCrawlShardEvent,
+    OperationCrawlShardSessionEvent,
+)
 from crawl_server.configs import DatabaseConfig
 
 logger = logging.getLogger(__name__)
@@ -135,6 +141,54 @@ class CrawlPipeline:
                 client.close()
             return False
     
+    def _send_event(self, event, key: str) -> bool:
+        """发送单个事件（event_type 放在 headers 中）"""
+        client = self._get_client()
+        if not client:
+            return False
+        
+        try:
+            if not self.db_config:
+                raise RuntimeError("DatabaseConfig 未提供，无法发送数据")
+            event_topic = self.db_config.KAFKA_EVENT_TOPIC or "trendradar.crawl_server"
+            return client.send(
+                topic=event_topic,
+                data=event.to_dict(),
+                key=key,
+                headers={"event_type": event.event_type()}
+            )
+        except Exception as e:
+            logger.error(f"❌ 发送 {event.event_type()} 事件失败: {e}", exc_info=True)
+            return False
+    
+    def send_shard_session(self, event: OperationCrawlShardSessionEvent) -> bool:
+        """
+        发送分片会话开始事件（operation.crawl.shard.session）
+        
+        以会话ID作为消息键：同一会话的开始事件与分片结果落在同一分区，由同一个副本按顺序合并；
+        不同会话分散到各分区，合并负载分摊到各副本。必须先于分片任务发送，保证合并方先收到会话再收到结果
+        """
+        return self._send_event(event, key=event.session_id)
+    
+    def send_shard_tasks(self, events: List[OperationCrawlShardEvent]) -> int:
+        """
+        发送分片抓取任务（operation.crawl.shard）
+        
+        以平台ID作为消息键：任务分散到各分区，同一平台固定由同一副本抓取（熔断状态保持在本地）
+        
+        Returns:
+            成功发送的数量
+        """
+        success_count = sum(
+            1 for event in events if self._send_event(event, key=event.platform_id)
+        )
+        logger.info(f"📤 已下发 {success_count}/{len(events)} 个分片抓取任务")
+        return success_count
+    
+    def send_shard_result(self, event: DataCrawlShardEvent) -> bool:
+        """发送分片抓取结果（data.crawl.shard）到合并方（以会话ID为消息键，与会话开始事件同一分区）"""
+        return self._send_event(event, key=event.session_id)
+    
     def close(self):
         """关闭连接（如果客户端是自己创建的）"""
         if self._client_owned and self.kafka_client:
@@ -10,8 +10,11 @@ from .events import (
     EventType,
     DataCrawlEvent,
     DataCrawlSessionEvent,
+    DataCrawlShardEvent,
     OperationCrawlEvent,
     OperationClearEvent,
+    OperationCrawlShardEvent,
+    OperationCrawlShardSessionEvent,
 )
 
 __all__ = [
@@ -22,7 +25,10 @@ __all__ = [
     "EventType",
     "DataCrawlEvent",
     "DataCrawlSessionEvent",
+    "DataCrawlShardEvent",
     "OperationCrawlEvent",
     "OperationClearEvent",
+    "OperationCrawlShardEvent",
+    "OperationCrawlShardSessionEvent",
 ]
 
@@ -10,14 +10,20 @@ Kafka 事件模块
 from .event_type import EventType
 from .data_crawl_event import DataCrawlEvent
 from .data_crawl_session_event import DataCrawlSessionEvent
+from .data_crawl_shard_event import DataCrawlShardEvent
 from .operation_crawl_event import OperationCrawlEvent
 from .operation_clear_event import OperationClearEvent
+from .operation_crawl_shard_event import OperationCrawlShardEvent
+from .operation_crawl_shard_session_event import OperationCrawlShardSessionEvent
 
 __all__ = [
     "EventType",
     "DataCrawlEvent",
     "DataCrawlSessionEvent",
+    "DataCrawlShardEvent",
     "OperationCrawlEvent",
     "OperationClearEvent",
+    "OperationCrawlShardEvent",
+    "OperationCrawlShardSessionEvent",
 ]
 
@@ -25,6 +25,7 @@ class DataCrawlSessionEvent:
     platforms: list = None  # 使用的平台ID列表，格式: ["toutiao", "baidu", "weibo", ...]
     word_groups: list = None  # 使用的频率词组列表
     filter_words: list = None  # 使用的过滤词列表
+    unchanged_ids: list = None  # 内容与上一周期相同、未重复发送新闻事件的平台ID列表
     total_news_count: int = 0  # 抓取到的新闻总数
     status: str = "completed"  # 状态（running, completed, failed）
     timestamp: Optional[str] = None
@@ -36,6 +37,8 @@ class DataCrawlSessionEvent:
             self.word_groups = []
         if self.filter_words is None:
             self.filter_words = []
+        if self.unchanged_ids is None:
+            self.unchanged_ids = []
         if self.timestamp is None:
             self.timestamp = datetime.now().isoformat()
     
@@ -54,6 +57,7 @@ class DataCrawlSessionEvent:
             platforms=data.get("platforms", []),
             word_groups=data.get("word_groups", []),
             filter_words=data.get("filter_words", []),
+            unchanged_ids=data.get("unchanged_ids", []),
             total_news_count=data.get("total_news_count", 0),
             status=data.get("status", "completed"),
             timestamp=data.get("timestamp"),
@@ -0,0 +1,57 @@
+# coding=utf-8
+
+"""
+分片抓取结果事件
+"""
+from typing import Dict, Any, Optional
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from .event_type import EventType
+
+
+@dataclass
+class DataCrawlShardEvent:
+    """分片抓取结果事件（单个平台的完整热榜，发往合并方）"""
+    # 必需字段（无默认值）必须在前面
+    session_id: str  # 所属抓取会话ID
+    platform_id: str  # 平台ID
+    is_success: bool  # 是否抓取成功
+    # 可选字段（有默认值）必须在后面
+    platform_name: str = ""  # 平台名称
+    titles: dict = None  # 按排名顺序的标题数据，格式: {title: {"ranks": [...], "url": "", "mobileUrl": ""}}
+    error_message: Optional[str] = None  # 失败原因
+    circuit_state: str = ""  # 失败时执行方该平台的熔断状态（closed/open/half_open）
+    worker_id: str = ""  # 执行抓取的副本标识
+    timestamp: Optional[str] = None
+
+    def __post_init__(self):
+        if not self.platform_name:
+            self.platform_name = self.platform_id
+        if self.titles is None:
+            self.titles = {}
+        if self.timestamp is None:
+            self.timestamp = datetime.now().isoformat()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DataCrawlShardEvent":
+        """从字典创建事件"""
+        return cls(
+            session_id=data["session_id"],
+            platform_id=data["platform_id"],
+            is_success=data.get("is_success", False),
+            platform_name=data.get("platform_name", ""),
+            titles=data.get("titles", {}),
+            error_message=data.get("error_message"),
+            circuit_state=data.get("circuit_state", ""),
+            worker_id=data.get("worker_id", ""),
+            timestamp=data.get("timestamp"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return asdict(self)
+
+    @staticmethod
+    def event_type() -> str:
+        """返回事件类型"""
+        return EventType.DATA_CRAWL_SHARD
@@ -10,8 +10,11 @@ class EventType:
     # 数据事件
     DATA_CRAWL = "data.crawl"  # 数据抓取成功（每条新闻）
     DATA_CRAWL_SESSION = "data.crawl.session"  # 抓取会话完成（包含统计信息）
+    DATA_CRAWL_SHARD = "data.crawl.shard"  # 分片抓取结果（单个平台，发往合并方）
     
     # 操作事件
     OPERATION_CRAWL = "operation.crawl"  # 执行抓取操作（需要监听，次数由 count 参数决定）
     OPERATION_CLEAR = "operation.clear"  # 刷新 frequency_words
+    OPERATION_CRAWL_SHARD = "operation.crawl.shard"  # 分片抓取任务（单个平台，由消费组内任一副本执行）
+    OPERATION_CRAWL_SHARD_SESSION = "operation.crawl.shard.session"  # 分片抓取会话开始（通知合并方等待各分片）
 
@@ -0,0 +1,47 @@
+# coding=utf-8
+
+"""
+分片抓取任务事件
+"""
+from typing import Dict, Any, Optional
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from .event_type import EventType
+
+
+@dataclass
+class OperationCrawlShardEvent:
+    """分片抓取任务事件（每个平台一条，按平台ID作为消息键分散到各分区）"""
+    session_id: str  # 所属抓取会话ID
+    platform_id: str  # 平台ID
+    platform_name: str = ""  # 平台名称
+    deadline: Optional[str] = None  # 会话截止时间（ISO 格式），超过后不再执行
+    trigger: str = "scheduled"  # manual, scheduled, api
+    timestamp: Optional[str] = None
+
+    def __post_init__(self):
+        if not self.platform_name:
+            self.platform_name = self.platform_id
+        if self.timestamp is None:
+            self.timestamp = datetime.now().isoformat()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OperationCrawlShardEvent":
+        """从字典创建事件"""
+        return cls(
+            session_id=data["session_id"],
+            platform_id=data["platform_id"],
+            platform_name=data.get("platform_name", ""),
+            deadline=data.get("deadline"),
+            trigger=data.get("trigger", "scheduled"),
+            timestamp=data.get("timestamp"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return asdict(self)
+
+    @staticmethod
+    def event_type() -> str:
+        """返回事件类型"""
+        return EventType.OPERATION_CRAWL_SHARD
@@ -0,0 +1,61 @@
+# coding=utf-8
+
+"""
+分片抓取会话开始事件
+"""
+from typing import Dict, Any, Optional
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from .event_type import EventType
+
+
+@dataclass
+class OperationCrawlShardSessionEvent:
+    """分片抓取会话开始事件（发往合并方，告知需要等待的分片）"""
+    # 必需字段（无默认值）必须在前面
+    session_id: str  # 会话ID（唯一标识）
+    trigger_source: str  # 触发来源（manual, scheduled, api）
+    started_at: str  # 开始时间
+    deadline: str  # 截止时间（ISO 格式），到期后未上报的分片按失败处理
+    # 可选字段（有默认值）必须在后面
+    platforms: list = None  # 监控平台列表，格式: [{"id": "toutiao", "name": "今日头条"}, ...]
+    shard_ids: list = None  # 本次实际下发抓取任务的平台ID（其余平台按失败处理）
+    word_groups: list = None  # 使用的频率词组列表
+    filter_words: list = None  # 使用的过滤词列表
+    timestamp: Optional[str] = None
+
+    def __post_init__(self):
+        if self.platforms is None:
+            self.platforms = []
+        if self.shard_ids is None:
+            self.shard_ids = [platform["id"] for platform in self.platforms]
+        if self.word_groups is None:
+            self.word_groups = []
+        if self.filter_words is None:
+            self.filter_words = []
+        if self.timestamp is None:
+            self.timestamp = datetime.now().isoformat()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OperationCrawlShardSessionEvent":
+        """从字典创建事件"""
+        return cls(
+            session_id=data["session_id"],
+            trigger_source=data.get("trigger_source", "scheduled"),
+            started_at=data["started_at"],
+            deadline=data["deadline"],
+            platforms=data.get("platforms", []),
+            shard_ids=data.get("shard_ids"),
+            word_groups=data.get("word_groups", []),
+            filter_words=data.get("filter_words", []),
+            timestamp=data.get("timestamp"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return asdict(self)
+
+    @staticmethod
+    def event_type() -> str:
+        """返回事件类型"""
+        return EventType.OPERATION_CRAWL_SHARD_SESSION
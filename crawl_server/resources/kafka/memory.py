@@ -0,0 +1,169 @@
+# coding=utf-8
+
+"""
+进程内 Kafka 替身
+
+提供与 KafkaClient 兼容的 send / send_batch 接口，以及与 KafkaEventConsumer 相同的
+按 event_type header 分发语义，用于在单进程内验证多副本分片抓取：
+
+- 消息按 key 哈希到固定分区（同一 key 总在同一分区，分区内保持顺序）
+- 每个加入的成员（模拟同一消费组内的一个副本）按轮询方式分配分区
+- dispatch_pending() 同步投递所有待处理消息（处理器内新发送的消息也会继续投递）
+"""
+import logging
+import threading
+import zlib
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], None]
+
+
+class InMemoryKafka:
+    """进程内 Kafka 替身（单 topic 语义由调用方保证，topic 仅记录不区分）"""
+
+    EVENT_TYPE_HEADER_KEY = "event_type"
+
+    def __init__(self, num_partitions: int = 3):
+        """
+        初始化
+
+        Args:
+            num_partitions: 分区数
+        """
+        self.enable_kafka = True
+        self.num_partitions = max(1, num_partitions)
+        self._partitions: List[Deque[Tuple[str, Optional[str], Dict[str, Any], Dict[str, str]]]] = [
+            deque() for _ in range(self.num_partitions)
+        ]
+        self._members: Dict[str, Dict[str, Handler]] = {}
+        self._lock = threading.Lock()
+        self.sent_count = 0
+        self.delivered: List[Tuple[str, str, Optional[str]]] = []  # (member_id, event_type, key)
+
+    def partition_for(self, key: Optional[str]) -> int:
+        """按 key 计算分区（无 key 时固定写入 0 号分区）"""
+        if not key:
+            return 0
+        return zlib.crc32(key.encode("utf-8")) % self.num_partitions
+
+    # === 生产者接口（与 KafkaClient 兼容） ===
+
+    def ensure_topic_exists(self, topic: str, *args, **kwargs) -> bool:
+        return True
+
+    def send(
+        self,
+        topic: str,
+        data: Dict[str, Any],
+        key: Optional[str] = None,
+        ensure_topic: bool = True,
+        headers: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """发送消息到 key 对应的分区"""
+        if not isinstance(data, dict):
+            raise ValueError(f"data 必须是字典类型，当前类型: {type(data)}")
+        message = dict(data)
+        message.setdefault("_timestamp", datetime.now().isoformat())
+        with self._lock:
+            self._partitions[self.partition_for(key)].append((topic, key, message, dict(headers or {})))
+            self.sent_count += 1
+        return True
+
+    def send_batch(
+        self,
+        topic: str,
+        data_list: list,
+        key_prefix: Optional[str] = None,
+        ensure_topic: bool = True,
+        headers: Optional[Dict[str, str]] = None
+    ) -> int:
+        """批量发送（key 规则与 KafkaClient.send_batch 一致）"""
+        success_count = 0
+        for idx, data in enumerate(data_list):
+            key = f"{key_prefix}_{idx}" if key_prefix else str(idx)
+            if self.send(topic, data, key, headers=headers):
+                success_count += 1
+        return success_count
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    # === 消费者接口 ===
+
+    def join(self, member_id: str, handlers: Dict[str, Handler]) -> None:
+        """
+        加入消费组（模拟一个副本）
+
+        Args:
+            member_id: 成员标识
+            handlers: {event_type: handler}，通常为 EventRouter.routes
+        """
+        with self._lock:
+            self._members[member_id] = dict(handlers)
+
+    def leave(self, member_id: str) -> None:
+        """离开消费组（分区重新分配给剩余成员）"""
+        with self._lock:
+            self._members.pop(member_id, None)
+
+    def assignment(self) -> Dict[int, str]:
+        """当前分区分配 {partition: member_id}（按成员加入顺序轮询）"""
+        with self._lock:
+            members = list(self._members.keys())
+        if not members:
+            return {}
+        return {partition: members[partition % len(members)] for partition in range(self.num_partitions)}
+
+    def pending_count(self) -> int:
+        """待投递的消息数"""
+        with self._lock:
+            return sum(len(partition) for partition in self._partitions)
+
+    def dispatch_pending(self, max_messages: Optional[int] = None) -> int:
+        """
+        同步投递待处理消息，直到所有分区为空（或达到 max_messages）
+
+        Returns:
+            本次投递的消息数
+        """
+        delivered = 0
+        while max_messages is None or delivered < max_messages:
+            assignment = self.assignment()
+            if not assignment:
+                break
+
+            progressed = False
+            for partition, member_id in assignment.items():
+                with self._lock:
+                    if not self._partitions[partition]:
+                        continue
+                    topic, key, message, headers = self._partitions[partition].popleft()
+                    handlers = self._members.get(member_id, {})
+
+                progressed = True
+                delivered += 1
+                event_type = headers.get(self.EVENT_TYPE_HEADER_KEY)
+                self.delivered.append((member_id, event_type, key))
+
+                handler = handlers.get(event_type) if event_type else None
+                if not handler:
+                    logger.warning(f"⚠️  未注册的事件类型: {event_type}, member={member_id}")
+                    continue
+                try:
+                    handler(message)
+                except Exception as e:
+                    logger.error(f"❌ 事件处理器执行失败: event_type={event_type}, error={e}", exc_info=True)
+
+                if max_messages is not None and delivered >= max_messages:
+                    break
+
+            if not progressed:
+                break
+        return delivered
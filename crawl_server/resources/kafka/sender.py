@@ -25,12 +25,14 @@ def send_fetched_data_to_kafka(
     platforms: Optional[List] = None,  # 平台列表，可以是对象列表 [{"id": "...", "name": "..."}] 或 ID 列表 ["id1", "id2"]，存储时会转换为 ID 列表
     word_groups: Optional[List[Dict]] = None,
     filter_words: Optional[List[str]] = None,
+    unchanged_ids: Optional[List[str]] = None,
+    circuit_states: Optional[Dict[str, str]] = None,
 ) -> bool:
     """
     将抓取的新闻数据发送到 Kafka
     
     Args:
-        results: 抓取结果，格式为 {platform_id: {title: {ranks: [], url: "", mobileUrl: ""}}}
+        results: 抓取结果，格式为 {platform_id: {title: TitleRecord 或 {ranks: [], url: "", mobileUrl: ""}}}
         id_to_name: 平台ID到名称的映射
         failed_ids: 失败的平台ID列表
         db_config: 数据库配置对象
@@ -40,6 +42,8 @@ def send_fetched_data_to_kafka(
         platforms: 使用的平台ID列表，格式: ["toutiao", "baidu", "weibo", ...]
         word_groups: 使用的频率词组列表
         filter_words: 使用的过滤词列表
+        unchanged_ids: 内容与上一周期相同的平台ID列表（不重复发送其新闻事件）
+        circuit_states: 失败平台的熔断状态 {platform_id: closed/open/half_open}
     
     Returns:
         bool: 是否发送成功
@@ -83,58 +87,35 @@ def send_fetched_data_to_kafka(
         total_news_count = 0
         
         # 遍历所有平台的数据，创建 DataCrawlEvent（成功记录）
+        # 延迟导入，避免循环导入
+        from crawl_server.core.data.records import title_fields
+        from crawl_server.core.utils.keyword_matcher import get_keyword_matcher
+
+        matcher = get_keyword_matcher(word_groups or [], filter_words or [])
+        unchanged_set = set(unchanged_ids or [])
         for platform_id, titles_data in results.items():
+            # 内容未变化的平台，上一周期已发送过相同的新闻事件
+            if platform_id in unchanged_set:
+                continue
             
             # 遍历该平台的所有新闻
             for title, title_data in titles_data.items():
-                ranks = title_data.get("ranks", [])
-                url = title_data.get("url", "")
-                mobile_url = title_data.get("mobileUrl", "")
+                ranks, url, mobile_url = title_fields(title_data)
                 
                 # 使用与 HTML 生成相同的匹配逻辑（只保存匹配到的新闻）
                 matched_group_keys = []
                 if word_groups and title:
-                    # 延迟导入，避免循环导入
-                    from crawl_server.core.utils.statistics_utils import matches_word_groups
-                    
-                    # 使用统一的匹配函数（与 HTML 生成逻辑一致）
+                    # 使用统一的匹配器（与 HTML 生成逻辑一致），一次扫描得到所有匹配的词组
                     # 如果不匹配，跳过这个标题（与 HTML 生成逻辑一致）
-                    if not matches_word_groups(title, word_groups, filter_words):
+                    matched_indices = matcher.match_indices(title)
+                    if not matched_indices:
                         continue
-                    
-                    # 如果匹配成功，遍历所有 word_groups，找出所有匹配的组，收集 group_key
-                    title_lower = str(title).lower()
-                    matched_count = 0
-                    for group in word_groups:
-                        required_words = group.get("required", [])
-                        normal_words = group.get("normal", [])
-                        group_key = group.get("group_key", "")
-                        
-                        # 如果是"全部新闻"模式，所有标题都匹配第一个（唯一的）词组
-                        if len(word_groups) == 1 and word_groups[0].get("group_key") == "全部新闻":
-                            if group_key:
-                                matched_group_keys.append(group_key)
-                            break
-                        else:
-                            # 原有的匹配逻辑
-                            if required_words:
-                                all_required_present = all(
-                                    req_word.lower() in title_lower for req_word in required_words
-                                )
-                                if not all_required_present:
-                                    continue
-                            
-                            if normal_words:
-                                any_normal_present = any(
-                                    normal_word.lower() in title_lower for normal_word in normal_words
-                                )
-                                if not any_normal_present:
-                                    continue
-                            
-                            # 匹配成功，收集该组的 group_key
-                            if group_key:
-                                matched_group_keys.append(group_key)
-                                matched_count += 1
+
+                    # "全部新闻"模式下所有标题都归入第一个（唯一的）词组
+                    if len(word_groups) == 1 and word_groups[0].get("group_key") == "全部新闻":
+                        matched_indices = matched_indices[:1]
+                    matched_group_keys = [matcher.group_keys[index] for index in matched_indices if matcher.group_keys[index]]
+                    matched_count = len(matched_group_keys)
                     
                     # 调试：打印匹配结果（只打印前几条有匹配的）
                     if matched_count > 0 and total_news_count < 10:
@@ -162,6 +143,11 @@ def send_fetched_data_to_kafka(
         
         # 为失败的平台创建失败记录（记录平台信息和使用的配置）
         for failed_id in failed_ids:
+            error_message = f"平台 {failed_id} 抓取失败"
+            circuit_state = (circuit_states or {}).get(failed_id)
+            if circuit_state:
+                error_message += f"（熔断状态: {circuit_state}）"
+            
             # 创建失败事件 - 记录平台信息
             failed_event = DataCrawlEvent(
                 platform_id=failed_id,
@@ -172,7 +158,7 @@ def send_fetched_data_to_kafka(
                 mobile_url="",  # 失败时没有移动端链接
                 matched_group_keys=[],  # 失败时没有匹配到任何词组
                 is_success=0,  # 标记为失败
-                error_message=f"平台 {failed_id} 抓取失败",  # 失败原因
+                error_message=error_message,  # 失败原因（含熔断状态）
                 fetch_time=timestamp,  # 抓取时间
             )
             
@@ -223,6 +209,7 @@ def send_fetched_data_to_kafka(
             platforms=platform_ids,  # 只存储 ID 列表
             word_groups=word_groups or [],
             filter_words=filter_words or [],
+            unchanged_ids=unchanged_ids or [],
             total_news_count=total_news_count,
             started_at=started_at,
             completed_at=completed_at,
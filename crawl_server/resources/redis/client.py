@@ -125,6 +125,60 @@ class RedisClient:
             self.logger.error(f"❌ Redis EXISTS 失败: {e}")
             return False
     
+    # 仅当值与持有者令牌一致时才删除 / 续期（避免误释放其他持有者的租约）
+    _COMPARE_AND_DELETE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+    _COMPARE_AND_EXPIRE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+    def set_nx(self, key: str, value: str, px: int) -> Optional[bool]:
+        """
+        键不存在时设置值（SET NX PX），用于获取租约
+
+        Args:
+            key: 键
+            value: 值（持有者令牌）
+            px: 过期时间（毫秒）
+
+        Returns:
+            True 设置成功；False 键已存在；None Redis 不可用或请求失败（无法判断键是否存在）
+        """
+        if not self.enable_redis or not self.client:
+            return None
+        try:
+            return bool(self.client.set(key, value, nx=True, px=px))
+        except Exception as e:
+            self.logger.error(f"❌ Redis SET NX 失败: {e}")
+            return None
+
+    def compare_and_delete(self, key: str, value: str) -> bool:
+        """值与 value 一致时删除键（原子操作），用于释放租约"""
+        if not self.enable_redis or not self.client:
+            return False
+        try:
+            return bool(self.client.eval(self._COMPARE_AND_DELETE_SCRIPT, 1, key, value))
+        except Exception as e:
+            self.logger.error(f"❌ Redis 比较删除失败: {e}")
+            return False
+
+    def compare_and_expire(self, key: str, value: str, px: int) -> bool:
+        """值与 value 一致时重设过期时间（原子操作），用于续期租约"""
+        if not self.enable_redis or not self.client:
+            return False
+        try:
+            return bool(self.client.eval(self._COMPARE_AND_EXPIRE_SCRIPT, 1, key, value, px))
+        except Exception as e:
+            self.logger.error(f"❌ Redis 比较续期失败: {e}")
+            return False
+
     def get_frequency_words(self) -> Optional[list]:
         """
         从 Redis 获取 frequency_words
@@ -41,6 +41,15 @@ class EventRouter:
         if self.crawl_controller:
             self.routes[EventType.OPERATION_CRAWL] = self.crawl_controller.handle_event_crawl
             logger.info(f"✅ 注册路由: {EventType.OPERATION_CRAWL} -> CrawlController.handle_event_crawl")
+            
+            # 注册分片抓取路由（任务执行、会话合并、分片结果）
+            self.routes[EventType.OPERATION_CRAWL_SHARD] = self.crawl_controller.handle_event_crawl_shard
+            self.routes[EventType.OPERATION_CRAWL_SHARD_SESSION] = self.crawl_controller.handle_event_crawl_shard_session
+            self.routes[EventType.DATA_CRAWL_SHARD] = self.crawl_controller.handle_event_crawl_shard_result
+            logger.info(
+                f"✅ 注册路由: {EventType.OPERATION_CRAWL_SHARD}, {EventType.OPERATION_CRAWL_SHARD_SESSION}, "
+                f"{EventType.DATA_CRAWL_SHARD} -> CrawlController"
+            )
         
         # 注册 operation.clear 路由
         if self.frequency_controller:
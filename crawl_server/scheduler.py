@@ -0,0 +1,138 @@
+# coding=utf-8
+
+"""
+自适应抓取调度模块
+
+按平台观测到的内容变化率（基于平台指纹）动态调整各平台的抓取间隔：
+变化频繁的平台缩短间隔，长期不变的平台逐步退避，
+间隔限制在 [SCHEDULER_MIN_MINUTES, SCHEDULER_MAX_MINUTES] 内，
+并受每小时全局请求预算约束
+"""
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+from crawl_server.configs import CrawlConfig
+from crawl_server.core.data.fingerprint import get_fingerprint_store
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PlatformSchedule:
+    """单平台调度状态"""
+    churn: float  # 内容变化率（EWMA，0~1）
+    interval_seconds: float  # 当前抓取间隔（秒）
+    next_due: float = 0.0  # 下次到期时间（time.time()）
+    last_checked_at: str = ""  # 上次指纹检查时间（用于判断本次抓取是否成功）
+
+
+class AdaptiveScheduler:
+    """自适应抓取调度器"""
+
+    def __init__(self, crawl_config: CrawlConfig, smoothing: float = 0.3):
+        """
+        初始化调度器
+
+        Args:
+            crawl_config: 爬虫配置对象
+            smoothing: 变化率 EWMA 平滑系数（越大越看重最近一次观测）
+        """
+        self.min_seconds = max(1, crawl_config.SCHEDULER_MIN_MINUTES) * 60
+        self.max_seconds = max(crawl_config.SCHEDULER_MIN_MINUTES, crawl_config.SCHEDULER_MAX_MINUTES) * 60
+        self.max_requests_per_hour = crawl_config.SCHEDULER_MAX_REQUESTS_PER_HOUR
+        self.smoothing = smoothing
+        self._platforms: Dict[str, PlatformSchedule] = {}
+        self._request_times: Deque[float] = deque()
+
+    def _interval_for(self, churn: float) -> float:
+        """变化率映射为抓取间隔：churn=1 取最小间隔，churn=0 取最大间隔"""
+        return self.max_seconds - churn * (self.max_seconds - self.min_seconds)
+
+    def _get_schedule(self, platform_id: str) -> PlatformSchedule:
+        schedule = self._platforms.get(platform_id)
+        if schedule is None:
+            # 新平台：变化率未知，按中间值起步，立即到期
+            schedule = PlatformSchedule(churn=0.5, interval_seconds=self._interval_for(0.5))
+            self._platforms[platform_id] = schedule
+        return schedule
+
+    def _remaining_budget(self, now: float) -> Optional[int]:
+        """过去一小时内剩余的请求预算（None 表示不限制）"""
+        while self._request_times and now - self._request_times[0] >= 3600:
+            self._request_times.popleft()
+        if self.max_requests_per_hour <= 0:
+            return None
+        return max(0, self.max_requests_per_hour - len(self._request_times))
+
+    def due_platforms(self, platform_ids: List[str], now: Optional[float] = None) -> List[str]:
+        """
+        获取当前到期需要抓取的平台（最久逾期的优先，受请求预算限制）
+
+        Args:
+            platform_ids: 当前所有监控平台ID
+            now: 当前时间戳（默认 time.time()）
+        """
+        now = time.time() if now is None else now
+        due = [
+            platform_id for platform_id in platform_ids
+            if self._get_schedule(platform_id).next_due <= now
+        ]
+        due.sort(key=lambda platform_id: self._platforms[platform_id].next_due)
+
+        budget = self._remaining_budget(now)
+        if budget is not None and len(due) > budget:
+            logger.info(f"⚖️ 请求预算不足：到期 {len(due)} 个平台，本轮只抓取 {budget} 个")
+            due = due[:budget]
+        return due
+
+    def mark_started(self, platform_ids: List[str], now: Optional[float] = None) -> None:
+        """记录即将抓取的平台（计入请求预算，并记下当前指纹检查时间）"""
+        now = time.time() if now is None else now
+        fingerprint_store = get_fingerprint_store()
+        for platform_id in platform_ids:
+            record = fingerprint_store.get_record(platform_id) or {}
+            self._get_schedule(platform_id).last_checked_at = record.get("checked_at", "")
+            self._request_times.append(now)
+
+    def record_results(self, platform_ids: List[str], now: Optional[float] = None) -> None:
+        """
+        根据平台指纹更新变化率和下次到期时间
+
+        抓取失败（指纹检查时间未更新）的平台不更新变化率，按最小间隔重试
+        """
+        now = time.time() if now is None else now
+        fingerprint_store = get_fingerprint_store()
+        for platform_id in platform_ids:
+            schedule = self._get_schedule(platform_id)
+            record = fingerprint_store.get_record(platform_id) or {}
+            if record.get("checked_at", "") == schedule.last_checked_at:
+                schedule.next_due = now + self.min_seconds
+                continue
+
+            changed = 0.0 if record.get("unchanged") else 1.0
+            schedule.churn = self.smoothing * changed + (1 - self.smoothing) * schedule.churn
+            schedule.interval_seconds = self._interval_for(schedule.churn)
+            schedule.next_due = now + schedule.interval_seconds
+
+    def seconds_until_next_due(self, platform_ids: List[str], now: Optional[float] = None) -> float:
+        """距离下次需要抓取的秒数（至少 1 秒，最多最小间隔；预算耗尽时等到预算恢复）"""
+        now = time.time() if now is None else now
+        if not platform_ids:
+            return self.min_seconds
+        next_due = min(self._get_schedule(platform_id).next_due for platform_id in platform_ids)
+        wait_seconds = min(self.min_seconds, max(1.0, next_due - now))
+
+        if self._remaining_budget(now) == 0 and self._request_times:
+            wait_seconds = max(wait_seconds, 3600 - (now - self._request_times[0]))
+        return wait_seconds
+
+    def describe(self, platform_ids: List[str]) -> str:
+        """输出各平台当前间隔（分钟）和变化率，便于日志观察"""
+        parts = []
+        for platform_id in platform_ids:
+            schedule = self._get_schedule(platform_id)
+            parts.append(f"{platform_id}={schedule.interval_seconds / 60:.0f}m/{schedule.churn:.2f}")
+        return ", ".join(parts)
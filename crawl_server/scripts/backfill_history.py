@@ -0,0 +1,32 @@
+# coding=utf-8
+
+"""
+本地历史库补录
+
+将 output/ 下已有的快照写入 output/history.db（已写入且未变化的快照跳过，可重复执行）
+
+用法:
+    python -m crawl_server.scripts.backfill_history [--output-dir output]
+"""
+import argparse
+from pathlib import Path
+
+from crawl_server.core.data.history_store import HISTORY_DB_FILENAME, HistoryStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="补录本地历史库")
+    parser.add_argument("--output-dir", default="output", help="输出根目录")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    store = HistoryStore(output_dir / HISTORY_DB_FILENAME)
+    try:
+        total = store.backfill(output_dir)
+    finally:
+        store.close()
+    print(f"完成，共写入 {total} 个快照")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# coding=utf-8
+
+"""
+HTML 报告渲染性能测试
+
+生成 1k / 10k / 50k 条新闻的合成报告数据（默认全部放在一个词组里，对应“全部新闻”模式），
+分别用逐个占位符 replace、字符串 += 拼接的旧实现和预编译模板渲染统计部分，输出耗时，
+并校验两者生成的 HTML 一致；同时给出 render_html_content 渲染整份报告的耗时
+
+用法:
+    python -m crawl_server.scripts.benchmark_html_render [--items 1000 10000 50000] [--groups 1] [--repeat 3]
+"""
+import argparse
+import gc
+import random
+import time
+from typing import Callable, Dict, List
+
+from crawl_server.core.utils.contents.html_content import _escaper, _generate_stats_section, render_html_content
+from crawl_server.core.utils.contents.template_cache import load_template
+from crawl_server.core.utils.string_utils import html_escape
+
+_WORDS = ["人工智能", "新能源", "芯片", "发布会", "世界杯", "暴雨", "股市", "AI", "iPhone", "高考", "航天", "电影"]
+_SOURCES = ["微博", "知乎", "百度热搜", "今日头条", "抖音", "B站 <热门>", "华尔街见闻", "澎湃新闻"]
+
+
+def _legacy_stats_section(report_data: Dict) -> str:
+    """重构前的统计部分渲染（每个条目对整段模板逐个占位符 replace，结果用 += 拼接），作为对照"""
+    news_item_template = load_template("news_item.html")
+    word_group_template = load_template("word_group_outer.html")
+    stats_html = ""
+    for i, stat in enumerate(report_data["stats"], 1):
+        count = stat["count"]
+        count_class = "hot" if count >= 10 else "warm" if count >= 5 else ""
+        news_items = ""
+        for j, title_data in enumerate(stat["titles"], 1):
+            ranks = title_data["ranks"]
+            min_rank, max_rank = min(ranks), max(ranks)
+            rank_class = "top" if min_rank <= 3 else "high" if min_rank <= title_data["rank_threshold"] else ""
+            rank_text = str(min_rank) if min_rank == max_rank else f"{min_rank}-{max_rank}"
+            rank_html = f'<span class="rank-num {rank_class}">{rank_text}</span>'
+            simplified_time = title_data["time_display"].replace(" ~ ", "~").replace("[", "").replace("]", "")
+            time_html = f'<span class="time-info">{html_escape(simplified_time)}</span>'
+            count_html = f'<span class="count-info">{title_data["count"]}次</span>' if title_data["count"] > 1 else ""
+            escaped_url = html_escape(title_data["mobile_url"] or title_data["url"])
+            title_html = (
+                f'<a href="{escaped_url}" target="_blank" class="news-link">{html_escape(title_data["title"])}</a>'
+            )
+            news_item_html = news_item_template
+            news_item_html = news_item_html.replace("{news_number}", str(j))
+            news_item_html = news_item_html.replace("{new_class}", "new" if title_data["is_new"] else "")
+            news_item_html = news_item_html.replace("{source_name}", html_escape(title_data["source_name"]))
+            news_item_html = news_item_html.replace("{rank_html}", rank_html)
+            news_item_html = news_item_html.replace("{time_html}", time_html)
+            news_item_html = news_item_html.replace("{count_html}", count_html)
+            news_item_html = news_item_html.replace("{title_html}", title_html)
+            news_items += news_item_html
+        word_group_html = word_group_template
+        word_group_html = word_group_html.replace("{word_name}", html_escape(stat["word"]))
+        word_group_html = word_group_html.replace("{count_class}", count_class)
+        word_group_html = word_group_html.replace("{count}", str(count))
+        word_group_html = word_group_html.replace("{index}", str(i))
+        word_group_html = word_group_html.replace("{total_count}", str(len(report_data["stats"])))
+        word_group_html = word_group_html.replace("{news_items}", news_items)
+        stats_html += word_group_html
+    return stats_html
+
+
+def build_report(items: int, groups: int, seed: int = 42) -> Dict:
+    """生成 items 条新闻、平均分布在 groups 个词组的报告数据"""
+    rng = random.Random(seed)
+    stats = []
+    per_group = [items // groups + (1 if g < items % groups else 0) for g in range(groups)]
+    for g, size in enumerate(per_group):
+        titles = []
+        for _ in range(size):
+            rank = rng.randint(1, 50)
+            titles.append({
+                "title": "".join(rng.choice(_WORDS) for _ in range(3)) + f" & {rng.randint(0, 9999)}",
+                "source_name": rng.choice(_SOURCES),
+                "ranks": [rank, rank + rng.randint(0, 3)],
+                "rank_threshold": 5,
+                "count": rng.randint(1, 5),
+                "time_display": "[08时12分 ~ 10时30分]",
+                "url": f"https://example.com/?id={rng.randint(0, 10 ** 6)}&src=hot",
+                "mobile_url": "",
+                "is_new": rng.random() < 0.2,
+            })
+        stats.append({"word": f"词组{g}", "count": size, "titles": titles, "percentage": 0})
+    return {"stats": stats, "new_titles": [], "failed_ids": []}
+
+
+def _measure(render: Callable[[], str], repeat: int) -> float:
+    """取 repeat 次中的最短耗时（计时期间关闭 GC）"""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            render()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTML 报告渲染性能测试")
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10000, 50000], help="新闻条数")
+    parser.add_argument("--groups", type=int, default=1, help="词组数")
+    parser.add_argument("--repeat", type=int, default=3, help="每种规模重复次数（取最短）")
+    args = parser.parse_args()
+
+    print(f"{'条数':>8} {'旧实现':>10} {'预编译模板':>10} {'加速':>8} {'整份报告':>10} {'HTML 大小':>12}")
+    for items in args.items:
+        report_data = build_report(items, max(args.groups, 1))
+
+        def compiled_stats_section() -> str:
+            out: List[str] = []
+            _generate_stats_section(out, report_data["stats"], _escaper())
+            return "".join(out)
+
+        if _legacy_stats_section(report_data) != compiled_stats_section():
+            raise SystemExit("❌ 新旧渲染结果不一致")
+
+        legacy = _measure(lambda: _legacy_stats_section(report_data), args.repeat)
+        compiled = _measure(compiled_stats_section, args.repeat)
+        full = _measure(lambda: render_html_content(report_data, items, True, "daily"), args.repeat)
+        size = len(render_html_content(report_data, items, True, "daily"))
+        print(
+            f"{items:>8} {legacy * 1000:>8.1f}ms {compiled * 1000:>8.1f}ms {legacy / compiled:>7.2f}x "
+            f"{full * 1000:>8.1f}ms {size:>12,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
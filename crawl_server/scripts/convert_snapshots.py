@@ -0,0 +1,41 @@
+# coding=utf-8
+
+"""
+历史快照格式转换
+
+将 output/<日期>/txt/ 下已有的快照无损转换为指定后端（默认 binary 列式格式）
+
+用法:
+    python -m crawl_server.scripts.convert_snapshots [--backend binary] [--output-dir output] [--keep-source] [日期文件夹 ...]
+"""
+import argparse
+from pathlib import Path
+
+from crawl_server.core.data.snapshot_store import SNAPSHOT_BACKENDS, convert_snapshots
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="转换历史快照格式")
+    parser.add_argument("dates", nargs="*", help="日期文件夹名（如 2025年11月26日），默认全部")
+    parser.add_argument("--backend", default="binary", choices=sorted(SNAPSHOT_BACKENDS), help="目标后端")
+    parser.add_argument("--output-dir", default="output", help="输出根目录")
+    parser.add_argument("--keep-source", action="store_true", help="保留原快照文件（同一时间将有两份快照，仅用于核对）")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    if args.dates:
+        day_dirs = [output_dir / date for date in args.dates]
+    else:
+        day_dirs = sorted(p for p in output_dir.iterdir() if p.is_dir() and (p / "txt").is_dir())
+
+    total = 0
+    for day_dir in day_dirs:
+        converted = convert_snapshots(day_dir / "txt", args.backend, keep_source=args.keep_source)
+        if converted:
+            print(f"✅ {day_dir.name}: 转换 {converted} 个快照")
+        total += converted
+    print(f"完成，共转换 {total} 个快照为 {args.backend}")
+
+
+if __name__ == "__main__":
+    main()
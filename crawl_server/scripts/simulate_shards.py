@@ -0,0 +1,151 @@
+# coding=utf-8
+
+"""
+多副本分片抓取模拟
+
+在单进程内用 InMemoryKafka 模拟一个消费组内的多个副本，走完整的分片抓取链路：
+
+    协调方 dispatch_shards → 各副本 execute_shard（按分区分配） → 会话所在分区的副本 ShardMerger 合并
+
+事件经 CrawlController 的分片处理方法分发（与 EventRouter 注册的路由相同）。平台抓取用合成数据代替
+（不访问网络），会话完成后只记录合并结果、不落盘也不推送。模拟结束时校验：
+
+- 每个会话的全部分片都被某个副本执行，且只被合并一次
+- 合并结果与各平台的合成数据一致，失败平台计入 failed_ids
+- 同一会话的会话事件与分片结果由同一个副本消费，不同会话分散到不同副本
+
+用法:
+    python -m crawl_server.scripts.simulate_shards [--replicas 3] [--partitions 6] [--sessions 8] [--platforms 12]
+"""
+import argparse
+import random
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from crawl_server.configs import CrawlConfig, DatabaseConfig
+from crawl_server.controllers.crawl_controller import CrawlController
+from crawl_server.core.data import ShardSession
+from crawl_server.core.data.records import TitleRecord
+from crawl_server.repositories import CrawlPipeline
+from crawl_server.resources.kafka import EventType
+from crawl_server.resources.kafka.memory import InMemoryKafka
+from crawl_server.services import CrawlService
+
+
+def synthetic_titles(platform_id: str, seed: int, count: int = 10) -> Dict[str, TitleRecord]:
+    """平台的合成标题数据（同一平台、同一种子结果固定）"""
+    return {
+        f"{platform_id} 标题 {seed}-{rank}": TitleRecord(
+            platform_id, f"{platform_id} 标题 {seed}-{rank}", [rank], f"https://example.com/{platform_id}/{rank}"
+        )
+        for rank in range(1, count + 1)
+    }
+
+
+class SimulatedCrawlService(CrawlService):
+    """模拟副本：抓取返回合成数据，会话完成时只记录合并结果"""
+
+    def __init__(self, replica_id: str, kafka: InMemoryKafka, failing: set, seed: int, completed: List):
+        crawl_config = CrawlConfig(CRAWL_SHARD_MODE="worker", CRAWL_SHARD_DEADLINE_SECONDS=3600)
+        db_config = DatabaseConfig(KAFKA_ENABLED=True, KAFKA_EVENT_TOPIC="simulate.crawl_server")
+        super().__init__(CrawlPipeline(kafka_client=kafka, db_config=db_config), crawl_config, db_config)
+        self.worker_id = replica_id
+        self.failing = failing
+        self.seed = seed
+        self.completed = completed
+        self.fetched: List[str] = []
+
+    def _fetch_shard(self, platform_id: str, platform_name: str) -> Tuple[Optional[Dict], str]:
+        self.fetched.append(platform_id)
+        if platform_id in self.failing:
+            return None, "open"
+        return synthetic_titles(platform_id, self.seed), ""
+
+    def _complete_shard_session(self, session: ShardSession) -> None:
+        self.completed.append((self.worker_id, threading.current_thread().name, session))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="多副本分片抓取模拟")
+    parser.add_argument("--replicas", type=int, default=3, help="副本数")
+    parser.add_argument("--partitions", type=int, default=6, help="分区数")
+    parser.add_argument("--sessions", type=int, default=8, help="会话数")
+    parser.add_argument("--platforms", type=int, default=12, help="平台数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    kafka = InMemoryKafka(num_partitions=args.partitions)
+    platforms = [{"id": f"platform{i}", "name": f"平台{i}"} for i in range(args.platforms)]
+    failing = set(rng.sample([p["id"] for p in platforms], k=max(1, args.platforms // 6)))
+    completed: List = []
+
+    replicas = []
+    for index in range(args.replicas):
+        service = SimulatedCrawlService(f"replica-{index}", kafka, failing, args.seed, completed)
+        controller = CrawlController(service, None, None, service.crawl_config, service.db_config)
+        kafka.join(service.worker_id, {
+            EventType.OPERATION_CRAWL_SHARD: controller.handle_event_crawl_shard,
+            EventType.OPERATION_CRAWL_SHARD_SESSION: controller.handle_event_crawl_shard_session,
+            EventType.DATA_CRAWL_SHARD: controller.handle_event_crawl_shard_result,
+        })
+        replicas.append(service)
+
+    # 协调方（副本 0）下发会话
+    session_ids = []
+    for _ in range(args.sessions):
+        session_id = replicas[0].dispatch_shards(platforms, [], [], trigger="simulate")
+        if session_id is None:
+            raise SystemExit("❌ 会话下发失败")
+        session_ids.append(session_id)
+
+    delivered = kafka.dispatch_pending()
+    for service in replicas:
+        service.close()  # 处理完交给后台线程的已合并会话
+
+    # === 校验 ===
+    errors = []
+    by_session = defaultdict(list)
+    for replica_id, thread_name, session in completed:
+        by_session[session.session_id].append((replica_id, thread_name, session))
+    merge_consumers = defaultdict(set)
+    for member_id, event_type, key in kafka.delivered:
+        if event_type in (EventType.OPERATION_CRAWL_SHARD_SESSION, EventType.DATA_CRAWL_SHARD):
+            merge_consumers[key].add(member_id)
+
+    for session_id in session_ids:
+        records = by_session.get(session_id, [])
+        if len(records) != 1:
+            errors.append(f"会话 {session_id} 合并了 {len(records)} 次")
+            continue
+        replica_id, thread_name, session = records[0]
+        if merge_consumers[session_id] != {replica_id}:
+            errors.append(f"会话 {session_id} 的消息由多个副本消费: {sorted(merge_consumers[session_id])}")
+        if not thread_name.startswith("cycle-shard-merge"):
+            errors.append(f"会话 {session_id} 在 {thread_name} 线程处理（应交给合并后台线程）")
+        expected_ok = {p["id"] for p in platforms if p["id"] not in failing}
+        if set(session.results) != expected_ok or set(session.failed_ids) != failing:
+            errors.append(f"会话 {session_id} 合并结果不符: 成功 {sorted(session.results)}, 失败 {session.failed_ids}")
+        for platform_id, titles in session.results.items():
+            if list(titles) != list(synthetic_titles(platform_id, args.seed)):
+                errors.append(f"会话 {session_id} 平台 {platform_id} 标题不一致")
+
+    fetched = Counter(platform_id for service in replicas for platform_id in service.fetched)
+    expected_fetches = args.platforms * args.sessions
+    if sum(fetched.values()) != expected_fetches:
+        errors.append(f"分片执行次数 {sum(fetched.values())}，应为 {expected_fetches}")
+
+    merged_by = Counter(records[0][0] for records in by_session.values())
+    print(f"投递消息 {delivered} 条，分区分配: {kafka.assignment()}")
+    print(f"各副本执行分片: { {service.worker_id: len(service.fetched) for service in replicas} }")
+    print(f"各副本合并会话: {dict(merged_by)}")
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        raise SystemExit(1)
+    print(f"✅ {len(session_ids)} 个会话全部合并且结果一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,29 @@ MVC 架构 - Service 层
 负责抓取业务逻辑
 """
 import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from crawl_server.core import create_news_analyzer
-from crawl_server.repositories import CrawlPipeline
+from crawl_server.core.analyzers import CrawlCycle, new_session_id
+from crawl_server.core.analyzers.cycle_pipeline import StageWorker
+from crawl_server.core.data import ShardMerger, ShardSession, get_fingerprint_store
+from crawl_server.core.utils.single_flight import SingleFlight
+from crawl_server.repositories import CrawlPipeline, CrawlLockCache
+from crawl_server.resources.kafka.events import (
+    DataCrawlShardEvent,
+    OperationCrawlShardEvent,
+    OperationCrawlShardSessionEvent,
+)
 from crawl_server.configs import CrawlConfig, DatabaseConfig
 
 logger = logging.getLogger(__name__)
 
+# 租约持有者暂时无法确定时重试获取的间隔（秒）
+_LEASE_RETRY_INTERVAL = 0.2
+
 
 class CrawlService:
     """抓取服务"""
@@ -22,7 +38,8 @@ class CrawlService:
         self,
         pipeline_repo: CrawlPipeline,
         crawl_config: CrawlConfig,
-        db_config: DatabaseConfig
+        db_config: DatabaseConfig,
+        lock_repo: Optional[CrawlLockCache] = None
     ):
         """
         初始化服务
@@ -31,10 +48,35 @@ class CrawlService:
             pipeline_repo: Pipeline 仓库（Kafka 发送）
             crawl_config: 爬虫配置对象
             db_config: 数据库配置对象
+            lock_repo: 抓取租约仓库（跨副本/进程互斥，None 表示只在进程内合并）
         """
         self.pipeline_repo = pipeline_repo
         self.crawl_config = crawl_config
         self.db_config = db_config
+        self.lock_repo = lock_repo
+        # 定时循环与 Kafka 线程同时触发时合并为一次抓取
+        self._single_flight = SingleFlight()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        # 分片模式下每个副本都可能成为合并方（取决于会话消息所在分区分配给谁）
+        self.shard_merger: Optional[ShardMerger] = None
+        self._shard_worker: Optional[StageWorker] = None
+        if self.shard_enabled:
+            # 合并完成的会话交给单个后台线程按顺序处理：不阻塞 Kafka 消费线程与截止时间检查线程，
+            # 同一副本上的多个会话也不会同时落盘/分析
+            self._shard_worker = StageWorker("shard-merge", crawl_config.PIPELINE_QUEUE_SIZE)
+            self.shard_merger = ShardMerger(
+                on_complete=lambda session: self._shard_worker.submit(
+                    lambda: self._complete_shard_session(session)
+                )
+            )
+    
+    @property
+    def shard_enabled(self) -> bool:
+        """是否启用多副本分片抓取（需要 Kafka）"""
+        return (
+            self.crawl_config.CRAWL_SHARD_MODE in ("coordinator", "worker")
+            and bool(self.db_config and self.db_config.KAFKA_ENABLED)
+        )
     
     def execute_crawl(
         self, 
@@ -42,7 +84,8 @@ class CrawlService:
         word_groups: List[Dict],
         filter_words: List[str],
         count: int = 1, 
-        trigger: str = "manual"
+        trigger: str = "manual",
+        fetch_ids: Optional[List[str]] = None,
     ):
         """
         执行抓取任务
@@ -53,10 +96,74 @@ class CrawlService:
             filter_words: 过滤词列表
             count: 抓取次数
             trigger: 触发来源（manual, scheduled, api）
+            fetch_ids: 本次实际请求的平台ID（None 表示全部，其余平台沿用上次结果）
         
         Returns:
-            成功次数
+            成功次数（合并到进行中的抓取时为该次抓取的成功次数）
+        """
+        run = lambda: self._execute_crawl(
+            platforms, word_groups, filter_words, count=count, trigger=trigger, fetch_ids=fetch_ids
+        )
+        if not self.crawl_config.CRAWL_LOCK_ENABLED:
+            return run()
+        
+        success_count, shared = self._single_flight.do("crawl", lambda: self._run_with_lease(run))
+        if shared:
+            logger.info(f"🔁 本进程已有抓取正在进行，已合并并共享其结果: trigger={trigger}, 成功 {success_count} 次")
+        return success_count
+    
+    def _run_with_lease(self, run) -> int:
         """
+        持有抓取租约执行；租约被其他副本/进程占用时等待其完成并共享结果
+
+        只有确实等待过已知持有者（超时）才跳过本次抓取；持有者暂时无法确定（租约刚过期/刚释放、
+        文件锁令牌尚未写入、Redis 请求失败）或持有者未留下结果就退出时重试获取租约，
+        等待期限内始终无法确定持有者时不持租约直接抓取，不丢弃本次抓取
+        """
+        if not self.lock_repo:
+            return run()
+        
+        deadline = time.monotonic() + self.crawl_config.CRAWL_LOCK_WAIT_SECONDS
+        token = self.lock_repo.acquire()
+        waited = False
+        while token is None:
+            remaining = deadline - time.monotonic()
+            holder = self.lock_repo.holder()
+            if holder:
+                if not waited:
+                    logger.info(f"🔒 其他副本/进程正在抓取（{self.lock_repo.backend} 租约），等待其完成并共享结果")
+                    waited = True
+                result = self.lock_repo.wait_for_release(holder, timeout=max(0.0, remaining))
+                if result is not None:
+                    return result.get("success_count", 0)
+                if deadline - time.monotonic() <= 0:
+                    logger.warning("⚠️  等待进行中的抓取超时，跳过本次抓取")
+                    return 0
+                # 持有者未留下结果就释放（异常退出或租约过期），重新获取租约
+            elif remaining <= 0:
+                logger.warning("⚠️  无法确定抓取租约持有者，不持租约直接执行本次抓取")
+                return run()
+            else:
+                time.sleep(min(_LEASE_RETRY_INTERVAL, remaining))
+            token = self.lock_repo.acquire()
+        
+        success_count = 0
+        try:
+            success_count = run()
+            return success_count
+        finally:
+            self.lock_repo.release(token, {"success_count": success_count})
+    
+    def _execute_crawl(
+        self, 
+        platforms: List[Dict],
+        word_groups: List[Dict],
+        filter_words: List[str],
+        count: int = 1, 
+        trigger: str = "manual",
+        fetch_ids: Optional[List[str]] = None,
+    ) -> int:
+        """执行指定次数的抓取（不做并发合并）"""
         logger.info(f"📥 开始执行抓取任务: count={count}, trigger={trigger}")
         
         if not platforms:
@@ -75,7 +182,8 @@ class CrawlService:
                     platforms=platforms,
                     word_groups=word_groups,
                     filter_words=filter_words,
-                    trigger_source=trigger
+                    trigger_source=trigger,
+                    fetch_ids=fetch_ids,
                 )
                 
                 success_count += 1
@@ -87,6 +195,173 @@ class CrawlService:
         logger.info(f"✅ 抓取任务完成: 成功 {success_count}/{count} 次")
         return success_count
     
+    def dispatch_shards(
+        self,
+        platforms: List[Dict],
+        word_groups: List[Dict],
+        filter_words: List[str],
+        trigger: str = "scheduled",
+    ) -> Optional[str]:
+        """
+        协调方：下发分片抓取任务（每个平台一条），由消费组内各副本分担抓取
+        
+        会话按 session_id 分区，可能在任意副本上合并，合并方没有其他副本的上次结果可沿用，
+        因此分片模式下每次都抓取全部平台（不支持只请求部分平台）
+        
+        Args:
+            platforms: 平台列表，格式: [{"id": "toutiao", "name": "今日头条"}, ...]
+            word_groups: 频率词组列表
+            filter_words: 过滤词列表
+            trigger: 触发来源（manual, scheduled, api）
+        
+        Returns:
+            会话ID，会话开始事件发送失败时返回 None
+        """
+        if not platforms:
+            logger.error("❌ 没有可用的平台，跳过分片抓取")
+            return None
+        
+        session_id = new_session_id()
+        started_at = datetime.now()
+        deadline = started_at + timedelta(seconds=self.crawl_config.CRAWL_SHARD_DEADLINE_SECONDS)
+        shard_ids = [platform["id"] for platform in platforms]
+        
+        # 先发送会话开始事件，再下发任务（合并方按分区顺序先收到会话）
+        session_event = OperationCrawlShardSessionEvent(
+            session_id=session_id,
+            trigger_source=trigger,
+            started_at=started_at.isoformat(),
+            deadline=deadline.isoformat(),
+            platforms=platforms,
+            shard_ids=shard_ids,
+            word_groups=word_groups,
+            filter_words=filter_words,
+        )
+        if not self.pipeline_repo.send_shard_session(session_event):
+            logger.error(f"❌ 分片会话开始事件发送失败，放弃本次分片抓取: {session_id}")
+            return None
+        
+        names = {platform["id"]: platform.get("name", platform["id"]) for platform in platforms}
+        self.pipeline_repo.send_shard_tasks([
+            OperationCrawlShardEvent(
+                session_id=session_id,
+                platform_id=platform_id,
+                platform_name=names[platform_id],
+                deadline=deadline.isoformat(),
+                trigger=trigger,
+            )
+            for platform_id in shard_ids
+        ])
+        logger.info(f"🧩 分片抓取会话已下发: {session_id}, {len(shard_ids)} 个平台")
+        return session_id
+    
+    def execute_shard(self, event: OperationCrawlShardEvent) -> bool:
+        """
+        执行方：抓取单个平台并把结果发回合并方
+        
+        Args:
+            event: 分片抓取任务事件
+        
+        Returns:
+            是否已上报结果（任务过期时不抓取也不上报）
+        """
+        if event.deadline and datetime.now() > datetime.fromisoformat(event.deadline):
+            logger.warning(f"⚠️  分片任务已过截止时间，跳过: {event.session_id}/{event.platform_id}")
+            return False
+        
+        title_data, circuit_state = self._fetch_shard(event.platform_id, event.platform_name)
+        if title_data is not None:
+            result_event = DataCrawlShardEvent(
+                session_id=event.session_id,
+                platform_id=event.platform_id,
+                platform_name=event.platform_name,
+                is_success=True,
+                titles={title: info.to_dict() for title, info in title_data.items()},
+                worker_id=self.worker_id,
+            )
+        else:
+            result_event = DataCrawlShardEvent(
+                session_id=event.session_id,
+                platform_id=event.platform_id,
+                platform_name=event.platform_name,
+                is_success=False,
+                error_message=f"平台 {event.platform_id} 抓取失败",
+                circuit_state=circuit_state,
+                worker_id=self.worker_id,
+            )
+        return self.pipeline_repo.send_shard_result(result_event)
+    
+    def _fetch_shard(self, platform_id: str, platform_name: str):
+        """
+        抓取单个平台
+        
+        Returns:
+            (标题数据 {title: TitleRecord}，失败时为 None, 失败时该平台的熔断状态)
+        """
+        analyzer = create_news_analyzer(crawl_config=self.crawl_config, db_config=self.db_config)
+        data_fetcher = analyzer.data_fetcher
+        # 指纹由合并方统一比对，执行方不更新
+        results, _, _ = data_fetcher.crawl_websites([(platform_id, platform_name)], track_changes=False)
+        return results.get(platform_id), data_fetcher.last_circuit_states.get(platform_id, "")
+    
+    def open_shard_session(self, event: OperationCrawlShardSessionEvent) -> None:
+        """合并方：开始等待分片结果"""
+        if not self.shard_merger:
+            logger.warning(f"⚠️  未启用分片抓取，忽略分片会话: {event.session_id}")
+            return
+        self.shard_merger.open_session(
+            session_id=event.session_id,
+            trigger_source=event.trigger_source,
+            started_at=event.started_at,
+            deadline=event.deadline,
+            platforms=event.platforms,
+            shard_ids=event.shard_ids,
+            word_groups=event.word_groups,
+            filter_words=event.filter_words,
+        )
+    
+    def add_shard_result(self, event: DataCrawlShardEvent) -> None:
+        """合并方：记录分片结果（会话集齐后自动进入落盘/分析/发送）"""
+        if not self.shard_merger:
+            logger.warning(f"⚠️  未启用分片抓取，忽略分片结果: {event.session_id}/{event.platform_id}")
+            return
+        self.shard_merger.add_result(
+            session_id=event.session_id,
+            platform_id=event.platform_id,
+            is_success=event.is_success,
+            titles=event.titles,
+            circuit_state=event.circuit_state,
+        )
+    
+    def _complete_shard_session(self, session: ShardSession) -> None:
+        """合并完成：比对指纹后按单机抓取的流程落盘、分析并发送会话事件"""
+        fingerprint_store = get_fingerprint_store()
+        fingerprints = fingerprint_store.update(session.results)
+        cycle = CrawlCycle(
+            session_id=session.session_id,
+            started_at=session.started_at,
+            trigger_source=session.trigger_source,
+            platforms=session.platforms,
+            results=session.results,
+            id_to_name=session.id_to_name,
+            failed_ids=session.failed_ids,
+            word_groups=session.word_groups,
+            filter_words=session.filter_words,
+            fingerprints=fingerprints,
+            unchanged_ids=fingerprint_store.unchanged_ids(list(session.results.keys())),
+            circuit_states=session.circuit_states,
+        )
+        analyzer = create_news_analyzer(crawl_config=self.crawl_config, db_config=self.db_config)
+        analyzer.run_cycle(cycle)
+        logger.info(f"✅ 分片抓取会话处理完成: {session.session_id}")
+    
+    def close(self) -> None:
+        """停止分片合并器的截止时间检查线程，并处理完已合并的会话"""
+        if self.shard_merger:
+            self.shard_merger.stop()
+        if self._shard_worker:
+            self._shard_worker.stop()
+    
     def send_crawl_data(
         self,
         results: Dict,
@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Tuple
 from .cache_service import get_cache
 from .parser_service import ParserService
 from ..utils.errors import DataNotFoundError
+from ..utils.manifest import read_root_manifest
 
 
 class DataService:
@@ -214,14 +215,22 @@ class DataService:
         results = []
         platform_distribution = Counter()
 
+        # 本地历史库齐全时按索引检索整个日期范围，否则逐日解析
+        indexed = self.parser.history.search_titles(keyword, start_date, end_date, platforms)
+        if indexed is not None:
+            id_to_name = self.parser.history.platform_names()
+
         # 遍历日期范围
         current_date = start_date
         while current_date <= end_date:
             try:
-                all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(
-                    date=current_date,
-                    platform_ids=platforms
-                )
+                if indexed is not None:
+                    all_titles = indexed.get(current_date.strftime("%Y-%m-%d"), {})
+                else:
+                    all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(
+                        date=current_date,
+                        platform_ids=platforms
+                    )
 
                 # 搜索包含关键词的标题
                 for platform_id, titles in all_titles.items():
@@ -512,6 +521,17 @@ class DataService:
         if not output_dir.exists():
             return (None, None)
 
+        # 优先读取根清单
+        root_manifest = read_root_manifest(output_dir)
+        if root_manifest is not None:
+            available_dates = [
+                datetime.strptime(day["date_str"], "%Y%m%d")
+                for day in root_manifest.get("days", {}).values()
+            ]
+            if not available_dates:
+                return (None, None)
+            return (min(available_dates), max(available_dates))
+
         available_dates = []
 
         # 遍历日期文件夹
@@ -550,8 +570,18 @@ class DataService:
         latest_record = None
         total_news = 0
 
-        if output_dir.exists():
-            # 遍历日期文件夹
+        root_manifest = read_root_manifest(output_dir) if output_dir.exists() else None
+        if root_manifest is not None:
+            # 根清单记录了每天的日期与快照/报告字节数，无需遍历目录
+            for day in root_manifest.get("days", {}).values():
+                folder_date = datetime.strptime(day["date_str"], "%Y%m%d")
+                if oldest_record is None or folder_date < oldest_record:
+                    oldest_record = folder_date
+                if latest_record is None or folder_date > latest_record:
+                    latest_record = folder_date
+                total_storage += day.get("total_bytes", 0)
+        elif output_dir.exists():
+            # 无清单时遍历日期文件夹
             for date_folder in output_dir.iterdir():
                 if date_folder.is_dir():
                     # 解析日期
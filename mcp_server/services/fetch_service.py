@@ -0,0 +1,129 @@
+"""
+抓取服务
+
+为临时爬取提供共享的 HTTP 连接池（keep-alive），并发抓取 newsnow 平台数据。
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..utils.newsnow_client import HostRateLimiter, create_http_session, request_platform_json
+
+
+class FetchService:
+    """抓取服务类"""
+
+    def __init__(self, pool_size: int = 10):
+        """
+        初始化抓取服务
+
+        Args:
+            pool_size: 连接池大小
+        """
+        # 请求头、限速与重试退避与 crawl_server 共用 utils/newsnow_client.py
+        self._session = create_http_session(pool_size)
+
+    def fetch_platform(
+        self,
+        id_value: str,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        max_retries: int = 2,
+    ) -> Optional[Dict]:
+        """
+        抓取单个平台
+
+        Returns:
+            {title: {ranks, url, mobileUrl}}，失败返回 None
+        """
+        data_json = request_platform_json(
+            self._session, id_value, max_retries=max_retries, rate_limiter=rate_limiter
+        )
+        if data_json is None:
+            return None
+
+        try:
+            titles = {}
+            for index, item in enumerate(data_json.get("items", []), 1):
+                title = item["title"]
+                url_link = item.get("url", "")
+                mobile_url = item.get("mobileUrl", "")
+
+                if title in titles:
+                    titles[title]["ranks"].append(index)
+                else:
+                    titles[title] = {
+                        "ranks": [index],
+                        "url": url_link,
+                        "mobileUrl": mobile_url,
+                    }
+            return titles
+        except Exception as e:
+            print(f"处理 {id_value} 数据出错: {e}")
+        return None
+
+    def crawl(
+        self,
+        ids: List[Union[str, Tuple[str, str]]],
+        request_interval: int = 100,
+        max_workers: int = 4,
+    ) -> Tuple[Dict, Dict, List]:
+        """
+        并发抓取多个平台
+
+        Args:
+            ids: 平台列表，元素为平台ID 或 (平台ID, 名称)
+            request_interval: 请求间隔（毫秒）
+            max_workers: 最大并发请求数
+
+        Returns:
+            (results, id_to_name, failed_ids) 元组，平台顺序与 ids 一致
+        """
+        id_values = []
+        id_to_name = {}
+        for id_info in ids:
+            if isinstance(id_info, tuple):
+                id_value, name = id_info
+            else:
+                id_value = id_info
+                name = id_value
+            id_to_name[id_value] = name
+            id_values.append(id_value)
+
+        if not id_values:
+            return {}, id_to_name, []
+
+        rate_limiter = HostRateLimiter(request_interval)
+        max_workers = max(1, min(max_workers, len(id_values)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-fetch") as executor:
+            parsed_list = list(
+                executor.map(
+                    lambda id_value: self.fetch_platform(id_value, rate_limiter),
+                    id_values,
+                )
+            )
+
+        results = {}
+        failed_ids = []
+        for id_value, parsed in zip(id_values, parsed_list):
+            if parsed is None:
+                failed_ids.append(id_value)
+            else:
+                results[id_value] = parsed
+        return results, id_to_name, failed_ids
+
+
+# 全局抓取服务实例
+_global_fetch_service = None
+
+
+def get_fetch_service() -> FetchService:
+    """
+    获取全局抓取服务实例
+
+    Returns:
+        全局抓取服务实例
+    """
+    global _global_fetch_service
+    if _global_fetch_service is None:
+        _global_fetch_service = FetchService()
+    return _global_fetch_service
@@ -0,0 +1,198 @@
+"""
+本地历史库查询服务
+
+只读查询 crawl_server 写入的 output/history.db（SQLite，见 crawl_server/core/data/history_store.py），
+替代逐个解析快照文件。查询前与清单核对当天快照是否齐全（历史库未启用、补录未完成、
+或快照由其他途径写入时），不齐全时返回 None，由调用方回退为解析文件
+"""
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils.manifest import read_day_manifest
+from ..utils.snapshot import list_snapshot_files, snapshot_time_label
+
+HISTORY_DB_FILENAME = "history.db"
+HISTORY_SCHEMA_VERSION = 1
+
+
+class HistoryService:
+    """本地历史库查询服务"""
+
+    def __init__(self, output_dir: Path):
+        """
+        初始化查询服务
+
+        Args:
+            output_dir: 输出根目录
+        """
+        self.output_dir = Path(output_dir)
+        self.db_path = self.output_dir / HISTORY_DB_FILENAME
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """只读打开历史库，不存在或版本不符时返回 None"""
+        if not self.db_path.exists():
+            return None
+        try:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=10)
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.Error:
+            return None
+        if meta.get("schema_version") != str(HISTORY_SCHEMA_VERSION):
+            conn.close()
+            return None
+        return conn
+
+    @staticmethod
+    def _fts_enabled(conn: sqlite3.Connection) -> bool:
+        """历史库是否建立了标题全文索引"""
+        row = conn.execute("SELECT value FROM meta WHERE key = 'fts'").fetchone()
+        return bool(row) and row[0] == "1"
+
+    @staticmethod
+    def _date_folder(date: datetime) -> str:
+        return date.strftime("%Y年%m月%d日")
+
+    def _expected_times(self, date_folder: str) -> Set[str]:
+        """当天应有的快照时间标签（优先取清单，否则列出快照目录）"""
+        day_manifest = read_day_manifest(self.output_dir, date_folder)
+        if day_manifest is not None:
+            return set(day_manifest.get("snapshots", {}))
+        return {snapshot_time_label(path) for path in list_snapshot_files(self.output_dir / date_folder / "txt")}
+
+    def _covers(self, conn: sqlite3.Connection, dates: Iterable[datetime]) -> bool:
+        """历史库中这些日期的快照是否与文件一致"""
+        dates = list(dates)
+        stored: Dict[str, Set[str]] = {}
+        for date, time in conn.execute(
+            "SELECT date, time FROM snapshots WHERE date BETWEEN ? AND ?",
+            (min(dates).strftime("%Y-%m-%d"), max(dates).strftime("%Y-%m-%d")),
+        ):
+            stored.setdefault(date, set()).add(time)
+        return all(
+            stored.get(date.strftime("%Y-%m-%d"), set()) == self._expected_times(self._date_folder(date))
+            for date in dates
+        )
+
+    @staticmethod
+    def _platform_filter(platform_ids: Optional[List[str]]) -> Tuple[str, List[str]]:
+        if not platform_ids:
+            return "", []
+        return f" AND t.platform_id IN ({','.join('?' * len(platform_ids))})", list(platform_ids)
+
+    @staticmethod
+    def _merge_rows(rows, all_titles: Dict) -> None:
+        """按快照顺序合并观测记录（与逐个解析快照后合并的结果一致：排名依次追加，URL 取首次出现）"""
+        for platform_id, title, url, mobile_url, rank in rows:
+            platform_titles = all_titles.setdefault(platform_id, {})
+            info = platform_titles.get(title)
+            if info is None:
+                platform_titles[title] = {"ranks": [rank], "url": url, "mobileUrl": mobile_url}
+            else:
+                info["ranks"].append(rank)
+
+    def platform_names(self) -> Dict[str, str]:
+        """平台ID到名称的映射"""
+        conn = self._connect()
+        if conn is None:
+            return {}
+        with closing(conn):
+            return dict(conn.execute("SELECT id, name FROM platforms"))
+
+    def read_titles_for_date(
+        self,
+        date: datetime,
+        platform_ids: Optional[List[str]] = None
+    ) -> Optional[Tuple[Dict, Dict, Dict]]:
+        """
+        读取某天的所有标题（结果与 ParserService.read_all_titles_for_date 一致）
+
+        Returns:
+            (all_titles, id_to_name, all_timestamps)；历史库不可用或当天快照不齐全时返回 None
+        """
+        conn = self._connect()
+        if conn is None:
+            return None
+        with closing(conn):
+            if not self._covers(conn, [date]):
+                return None
+            day = date.strftime("%Y-%m-%d")
+            platform_sql, platform_args = self._platform_filter(platform_ids)
+
+            all_titles: Dict = {}
+            self._merge_rows(
+                conn.execute(
+                    "SELECT t.platform_id, t.title, COALESCE(o.url, t.url), COALESCE(o.mobile_url, t.mobile_url), o.rank"
+                    " FROM snapshots s"
+                    " JOIN observations o ON o.snapshot_id = s.id"
+                    " JOIN titles t ON t.id = o.title_id"
+                    f" WHERE s.date = ?{platform_sql}"
+                    " ORDER BY s.time, o.seq",
+                    [day, *platform_args],
+                ),
+                all_titles,
+            )
+            timestamps = dict(conn.execute("SELECT file, mtime FROM snapshots WHERE date = ? ORDER BY time", (day,)))
+            # 只包含当天（过滤后）出现过的平台，与逐个解析快照得到的 id_to_name 一致
+            day_platforms = list(all_titles)
+            id_to_name = dict(conn.execute(
+                f"SELECT id, name FROM platforms WHERE id IN ({','.join('?' * len(day_platforms))})",
+                day_platforms,
+            )) if day_platforms else {}
+        return all_titles, id_to_name, timestamps
+
+    def search_titles(
+        self,
+        keyword: str,
+        start_date: datetime,
+        end_date: datetime,
+        platform_ids: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Dict]]:
+        """
+        按关键词检索日期范围内的标题（不区分大小写的子串匹配，关键词不少于 3 个字符时走全文索引）
+
+        Returns:
+            {YYYY-MM-DD: {platform_id: {title: {ranks, url, mobileUrl}}}}（按日期合并，与逐日读取一致）；
+            历史库不可用或范围内快照不齐全时返回 None
+        """
+        conn = self._connect()
+        if conn is None:
+            return None
+        with closing(conn):
+            dates = []
+            current = start_date
+            while current <= end_date:
+                dates.append(current)
+                current += timedelta(days=1)
+            if not dates or not self._covers(conn, dates):
+                return None
+
+            if self._fts_enabled(conn) and len(keyword) >= 3:
+                candidate_sql = "SELECT rowid FROM titles_fts WHERE titles_fts MATCH ?"
+                candidate_arg = '"' + keyword.replace('"', '""') + '"'
+            else:
+                candidate_sql = "SELECT id FROM titles WHERE title LIKE ? ESCAPE '\\'"
+                escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                candidate_arg = f"%{escaped}%"
+            platform_sql, platform_args = self._platform_filter(platform_ids)
+
+            rows = conn.execute(
+                "SELECT s.date, t.platform_id, t.title, COALESCE(o.url, t.url), COALESCE(o.mobile_url, t.mobile_url), o.rank"
+                " FROM titles t"
+                " JOIN observations o ON o.title_id = t.id"
+                " JOIN snapshots s ON s.id = o.snapshot_id"
+                f" WHERE t.id IN ({candidate_sql}) AND s.date BETWEEN ? AND ?{platform_sql}"
+                " ORDER BY s.date, s.time, o.seq",
+                [candidate_arg, dates[0].strftime("%Y-%m-%d"), dates[-1].strftime("%Y-%m-%d"), *platform_args],
+            )
+
+            # LIKE 只对 ASCII 忽略大小写，这里按与逐条匹配相同的规则再过滤一次
+            keyword_lower = keyword.lower()
+            by_date: Dict[str, Dict] = {}
+            for date, platform_id, title, url, mobile_url, rank in rows:
+                if keyword_lower not in title.lower():
+                    continue
+                self._merge_rows([(platform_id, title, url, mobile_url, rank)], by_date.setdefault(date, {}))
+        return by_date
@@ -4,15 +4,19 @@
 提供txt格式新闻数据和YAML配置文件的解析功能。
 """
 
-import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
 import yaml
 
+from ..utils.archive import archive_path_for, member_exists, member_info
 from ..utils.errors import FileParseError, DataNotFoundError
+from ..utils.manifest import read_day_manifest
+from ..utils.snapshot import list_snapshot_files, read_snapshot_text, read_snapshot_titles
+from ..utils.snapshot_parser import clean_title, parse_snapshot_text
 from .cache_service import get_cache
+from .history_service import HistoryService
 
 
 class ParserService:
@@ -35,6 +39,9 @@ class ParserService:
         # 初始化缓存服务
         self.cache = get_cache()
 
+        # 本地历史库（存在且当天快照齐全时直接查询，不解析文件）
+        self.history = HistoryService(self.project_root / "output")
+
     @staticmethod
     def clean_title(title: str) -> str:
         """
@@ -46,18 +53,15 @@ class ParserService:
         Returns:
             清理后的标题
         """
-        # 移除多余空白
-        title = re.sub(r'\s+', ' ', title)
-        # 移除特殊字符
-        title = title.strip()
-        return title
+        return clean_title(title)
 
-    def parse_txt_file(self, file_path: Path) -> Tuple[Dict, Dict]:
+    def parse_txt_file(self, file_path: Path, platform_ids: Optional[List[str]] = None) -> Tuple[Dict, Dict]:
         """
         解析单个txt文件的标题数据
 
         Args:
             file_path: txt文件路径
+            platform_ids: 只解析这些平台（其他平台的标题行跳过），None 表示全部
 
         Returns:
             (titles_by_id, id_to_name) 元组
@@ -67,82 +71,24 @@ class ParserService:
         Raises:
             FileParseError: 文件解析错误
         """
-        if not file_path.exists():
+        if not member_exists(file_path):
             raise FileParseError(str(file_path), "文件不存在")
 
-        titles_by_id = {}
-        id_to_name = {}
-
+        wanted = set(platform_ids) if platform_ids else None
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                sections = content.split("\n\n")
-
-                for section in sections:
-                    if not section.strip() or "==== 以下ID请求失败 ====" in section:
-                        continue
-
-                    lines = section.strip().split("\n")
-                    if len(lines) < 2:
-                        continue
-
-                    # 解析header: id | name 或 id
-                    header_line = lines[0].strip()
-                    if " | " in header_line:
-                        parts = header_line.split(" | ", 1)
-                        source_id = parts[0].strip()
-                        name = parts[1].strip()
-                        id_to_name[source_id] = name
-                    else:
-                        source_id = header_line
-                        id_to_name[source_id] = source_id
-
-                    titles_by_id[source_id] = {}
-
-                    # 解析标题行
-                    for line in lines[1:]:
-                        if line.strip():
-                            try:
-                                title_part = line.strip()
-                                rank = None
-
-                                # 提取排名
-                                if ". " in title_part and title_part.split(". ")[0].isdigit():
-                                    rank_str, title_part = title_part.split(". ", 1)
-                                    rank = int(rank_str)
-
-                                # 提取 MOBILE URL
-                                mobile_url = ""
-                                if " [MOBILE:" in title_part:
-                                    title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
-                                    if mobile_part.endswith("]"):
-                                        mobile_url = mobile_part[:-1]
-
-                                # 提取 URL
-                                url = ""
-                                if " [URL:" in title_part:
-                                    title_part, url_part = title_part.rsplit(" [URL:", 1)
-                                    if url_part.endswith("]"):
-                                        url = url_part[:-1]
-
-                                title = self.clean_title(title_part.strip())
-                                ranks = [rank] if rank is not None else [1]
-
-                                titles_by_id[source_id][title] = {
-                                    "ranks": ranks,
-                                    "url": url,
-                                    "mobileUrl": mobile_url,
-                                }
-
-                            except Exception as e:
-                                # 忽略单行解析错误
-                                continue
-
+            # 二进制列式快照直接解码，无需逐行解析文本
+            decoded = read_snapshot_titles(file_path)
+            if decoded is not None:
+                titles_by_id, id_to_name = decoded
+                if wanted is not None:
+                    titles_by_id = {pid: titles for pid, titles in titles_by_id.items() if pid in wanted}
+                    id_to_name = {pid: id_to_name[pid] for pid in titles_by_id}
+                return titles_by_id, id_to_name
+
+            return parse_snapshot_text(read_snapshot_text(file_path), wanted)
         except Exception as e:
             raise FileParseError(str(file_path), str(e))
 
-        return titles_by_id, id_to_name
-
     def get_date_folder_name(self, date: datetime = None) -> str:
         """
         获取日期文件夹名称
@@ -193,11 +139,17 @@ class ParserService:
         if cached:
             return cached
 
-        # 缓存未命中，读取文件
+        # 缓存未命中，优先查询本地历史库
+        indexed = self.history.read_titles_for_date(date or datetime.now(), platform_ids)
+        if indexed is not None and indexed[0]:
+            self.cache.set(cache_key, indexed)
+            return indexed
+
+        # 读取文件
         date_folder = self.get_date_folder_name(date)
         txt_dir = self.project_root / "output" / date_folder / "txt"
 
-        if not txt_dir.exists():
+        if not txt_dir.exists() and not archive_path_for(txt_dir).exists():
             raise DataNotFoundError(
                 f"未找到 {date_folder} 的数据目录",
                 suggestion="请先运行爬虫或检查日期是否正确"
@@ -207,8 +159,16 @@ class ParserService:
         id_to_name = {}
         all_timestamps = {}
 
-        # 读取所有txt文件
-        txt_files = sorted(txt_dir.glob("*.txt"))
+        # 读取所有txt文件（有当日清单时按清单列出，并跳过不含目标平台的快照）
+        day_manifest = read_day_manifest(self.project_root / "output", date_folder)
+        if day_manifest is not None and day_manifest.get("snapshots"):
+            txt_files = [
+                txt_dir.parent / snapshot["file"]
+                for _, snapshot in sorted(day_manifest.get("snapshots", {}).items())
+                if not platform_ids or set(platform_ids) & set(snapshot.get("platforms", []))
+            ]
+        else:
+            txt_files = list_snapshot_files(txt_dir)
 
         if not txt_files:
             raise DataNotFoundError(
@@ -218,7 +178,7 @@ class ParserService:
 
         for txt_file in txt_files:
             try:
-                titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
+                titles_by_id, file_id_to_name = self.parse_txt_file(txt_file, platform_ids)
 
                 # 更新id_to_name
                 id_to_name.update(file_id_to_name)
@@ -240,7 +200,7 @@ class ParserService:
                             all_titles[platform_id][title] = info.copy()
 
                 # 记录文件时间戳
-                all_timestamps[txt_file.name] = txt_file.stat().st_mtime
+                all_timestamps[txt_file.name] = member_info(txt_file)[1] / 1e9
 
             except Exception as e:
                 # 忽略单个文件的解析错误，继续处理其他文件
@@ -124,12 +124,23 @@ class SearchTools:
             all_matches = []
             current_date = start_date
 
+            # 关键词模式：本地历史库齐全时按索引检索整个日期范围，否则逐日解析
+            indexed = None
+            if search_mode == "keyword":
+                history = self.data_service.parser.history
+                indexed = history.search_titles(query, start_date, end_date, platforms)
+                if indexed is not None:
+                    id_to_name = history.platform_names()
+
             while current_date <= end_date:
                 try:
-                    all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date,
-                        platform_ids=platforms
-                    )
+                    if indexed is not None:
+                        all_titles = indexed.get(current_date.strftime("%Y-%m-%d"), {})
+                    else:
+                        all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
+                            date=current_date,
+                            platform_ids=platforms
+                        )
 
                     # 根据搜索模式执行不同的搜索逻辑
                     if search_mode == "keyword":
@@ -8,6 +8,9 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from ..services.data_service import DataService
+from ..services.fetch_service import get_fetch_service
+from ..utils.snapshot import write_file_atomic, write_snapshot
+from ..utils.snapshot_parser import clean_title
 from ..utils.validators import validate_platforms
 from ..utils.errors import MCPError, CrawlTaskError
 
@@ -87,10 +90,7 @@ class SystemManagementTools:
             >>> print(result['saved_files'])
         """
         try:
-            import json
             import time
-            import random
-            import requests
             from datetime import datetime
             import pytz
             import yaml
@@ -142,84 +142,11 @@ class SystemManagementTools:
 
             print(f"开始临时爬取，平台: {[p.get('name', p['id']) for p in target_platforms]}")
 
-            # 爬取数据
-            results = {}
-            id_to_name = {}
-            failed_ids = []
-
-            for i, id_info in enumerate(ids):
-                if isinstance(id_info, tuple):
-                    id_value, name = id_info
-                else:
-                    id_value = id_info
-                    name = id_value
-
-                id_to_name[id_value] = name
-
-                # 构建请求URL
-                url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
-
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    "Accept": "application/json, text/plain, */*",
-                    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-                    "Connection": "keep-alive",
-                    "Cache-Control": "no-cache",
-                }
-
-                # 重试机制
-                max_retries = 2
-                retries = 0
-                success = False
-
-                while retries <= max_retries and not success:
-                    try:
-                        response = requests.get(url, headers=headers, timeout=10)
-                        response.raise_for_status()
-
-                        data_text = response.text
-                        data_json = json.loads(data_text)
-
-                        status = data_json.get("status", "未知")
-                        if status not in ["success", "cache"]:
-                            raise ValueError(f"响应状态异常: {status}")
-
-                        status_info = "最新数据" if status == "success" else "缓存数据"
-                        print(f"获取 {id_value} 成功（{status_info}）")
-
-                        # 解析数据
-                        results[id_value] = {}
-                        for index, item in enumerate(data_json.get("items", []), 1):
-                            title = item["title"]
-                            url_link = item.get("url", "")
-                            mobile_url = item.get("mobileUrl", "")
-
-                            if title in results[id_value]:
-                                results[id_value][title]["ranks"].append(index)
-                            else:
-                                results[id_value][title] = {
-                                    "ranks": [index],
-                                    "url": url_link,
-                                    "mobileUrl": mobile_url,
-                                }
-
-                        success = True
-
-                    except Exception as e:
-                        retries += 1
-                        if retries <= max_retries:
-                            wait_time = random.uniform(3, 5)
-                            print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
-                            time.sleep(wait_time)
-                        else:
-                            print(f"请求 {id_value} 失败: {e}")
-                            failed_ids.append(id_value)
-
-                # 请求间隔
-                if i < len(ids) - 1:
-                    actual_interval = request_interval + random.randint(-10, 20)
-                    actual_interval = max(50, actual_interval)
-                    time.sleep(actual_interval / 1000)
+            # 爬取数据（共享连接池，并发抓取，主机级请求间隔）
+            concurrency = config_data.get("crawler", {}).get("crawl_concurrency", 4)
+            results, id_to_name, failed_ids = get_fetch_service().crawl(
+                ids, request_interval=request_interval, max_workers=concurrency
+            )
 
             # 格式化返回数据
             news_data = []
@@ -260,18 +187,6 @@ class SystemManagementTools:
             # 如果需要持久化，调用保存逻辑
             if save_to_local:
                 try:
-                    import re
-
-                    # 辅助函数：清理标题
-                    def clean_title(title: str) -> str:
-                        """清理标题中的特殊字符"""
-                        if not isinstance(title, str):
-                            title = str(title)
-                        cleaned_title = title.replace("\n", " ").replace("\r", " ")
-                        cleaned_title = re.sub(r"\s+", " ", cleaned_title)
-                        cleaned_title = cleaned_title.strip()
-                        return cleaned_title
-
                     # 辅助函数：创建目录
                     def ensure_directory_exists(directory: str):
                         """确保目录存在"""
@@ -291,53 +206,53 @@ class SystemManagementTools:
                     ensure_directory_exists(str(html_dir))
                     html_file_path = html_dir / f"{time_filename}.html"
 
-                    # 保存 txt 文件（按照 main.py 的格式）
-                    with open(txt_file_path, "w", encoding="utf-8") as f:
-                        for id_value, title_data in results.items():
-                            # id | name 或 id
-                            name = id_to_name.get(id_value)
-                            if name and name != id_value:
-                                f.write(f"{id_value} | {name}\n")
+                    # 保存 txt 文件（按照 main.py 的格式，整体写入临时文件后重命名）
+                    lines = []
+                    for id_value, title_data in results.items():
+                        # id | name 或 id
+                        name = id_to_name.get(id_value)
+                        if name and name != id_value:
+                            lines.append(f"{id_value} | {name}\n")
+                        else:
+                            lines.append(f"{id_value}\n")
+
+                        # 按排名排序标题
+                        sorted_titles = []
+                        for title, info in title_data.items():
+                            cleaned = clean_title(title)
+                            if isinstance(info, dict):
+                                ranks = info.get("ranks", [])
+                                url = info.get("url", "")
+                                mobile_url = info.get("mobileUrl", "")
                             else:
-                                f.write(f"{id_value}\n")
-
-                            # 按排名排序标题
-                            sorted_titles = []
-                            for title, info in title_data.items():
-                                cleaned = clean_title(title)
-                                if isinstance(info, dict):
-                                    ranks = info.get("ranks", [])
-                                    url = info.get("url", "")
-                                    mobile_url = info.get("mobileUrl", "")
-                                else:
-                                    ranks = info if isinstance(info, list) else []
-                                    url = ""
-                                    mobile_url = ""
-
-                                rank = ranks[0] if ranks else 1
-                                sorted_titles.append((rank, cleaned, url, mobile_url))
-
-                            sorted_titles.sort(key=lambda x: x[0])
-
-                            for rank, cleaned, url, mobile_url in sorted_titles:
-                                line = f"{rank}. {cleaned}"
-                                if url:
-                                    line += f" [URL:{url}]"
-                                if mobile_url:
-                                    line += f" [MOBILE:{mobile_url}]"
-                                f.write(line + "\n")
-
-                            f.write("\n")
-
-                        if failed_ids:
-                            f.write("==== 以下ID请求失败 ====\n")
-                            for id_value in failed_ids:
-                                f.write(f"{id_value}\n")
+                                ranks = info if isinstance(info, list) else []
+                                url = ""
+                                mobile_url = ""
+
+                            rank = ranks[0] if ranks else 1
+                            sorted_titles.append((rank, cleaned, url, mobile_url))
+
+                        sorted_titles.sort(key=lambda x: x[0])
+
+                        for rank, cleaned, url, mobile_url in sorted_titles:
+                            line = f"{rank}. {cleaned}"
+                            if url:
+                                line += f" [URL:{url}]"
+                            if mobile_url:
+                                line += f" [MOBILE:{mobile_url}]"
+                            lines.append(line + "\n")
+
+                        lines.append("\n")
+
+                    if failed_ids:
+                        lines.append("==== 以下ID请求失败 ====\n")
+                        for id_value in failed_ids:
+                            lines.append(f"{id_value}\n")
+                    write_snapshot(txt_file_path, "".join(lines))
 
                     # 保存 html 文件（简化版）
                     html_content = self._generate_simple_html(results, id_to_name, failed_ids, now)
-                    with open(html_file_path, "w", encoding="utf-8") as f:
-                        f.write(html_content)
+                    write_file_atomic(html_file_path, html_content)
 
                     print(f"数据已保存到:")
                     print(f"  TXT: {txt_file_path}")
@@ -0,0 +1,115 @@
+"""
+日期目录归档读取
+
+读取 crawl_server 压缩历史日期时生成的归档（output/<日期>/txt.pack、html.pack，
+格式定义见 crawl_server/core/utils/day_archive.py）。按原路径访问：文件存在时直接读取，
+否则从同级归档中读取
+"""
+import json
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PACK_MAGIC = b"NFXP"
+PACK_SUFFIX = ".pack"
+
+_PACK_FOOTER = struct.Struct("<QI4s")
+
+# 归档索引缓存 {归档路径: (修改时间 ns, 索引)}
+_index_cache: Dict[str, Tuple[int, Dict[str, List[int]]]] = {}
+_index_cache_lock = threading.Lock()
+
+
+def archive_path_for(directory: Path) -> Path:
+    """目录对应的归档路径（output/<日期>/txt → output/<日期>/txt.pack）"""
+    directory = Path(directory)
+    return directory.parent / f"{directory.name}{PACK_SUFFIX}"
+
+
+def read_archive_index(archive_path: Path) -> Optional[Dict[str, List[int]]]:
+    """读取归档索引（{文件名: [偏移, 压缩长度, 原始长度, 修改时间 ns]}），归档不存在或无效时返回 None"""
+    try:
+        mtime_ns = archive_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    key = str(archive_path)
+    with _index_cache_lock:
+        cached = _index_cache.get(key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    try:
+        with open(archive_path, "rb") as f:
+            f.seek(-_PACK_FOOTER.size, os.SEEK_END)
+            index_offset, index_length, magic = _PACK_FOOTER.unpack(f.read(_PACK_FOOTER.size))
+            if magic != PACK_MAGIC:
+                return None
+            f.seek(index_offset)
+            index = json.loads(zlib.decompress(f.read(index_length)).decode("utf-8"))
+    except (OSError, ValueError, zlib.error, struct.error):
+        return None
+
+    with _index_cache_lock:
+        _index_cache[key] = (mtime_ns, index)
+    return index
+
+
+def list_members(directory: Path, predicate: Callable[[str], bool]) -> List[Path]:
+    """列出目录中的文件（包括已归档的成员），返回按原路径表示的列表（未排序）"""
+    directory = Path(directory)
+    names = set()
+    if directory.is_dir():
+        names.update(entry.name for entry in os.scandir(directory) if entry.is_file() and predicate(entry.name))
+    index = read_archive_index(archive_path_for(directory))
+    if index:
+        names.update(name for name in index if predicate(name))
+    return [directory / name for name in names]
+
+
+def member_exists(path: Path) -> bool:
+    """文件（或已归档的成员）是否存在"""
+    path = Path(path)
+    if path.exists():
+        return True
+    index = read_archive_index(archive_path_for(path.parent))
+    return bool(index) and path.name in index
+
+
+def read_member_bytes(path: Path) -> bytes:
+    """读取文件内容，文件已归档时从归档读取"""
+    path = Path(path)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        archive_path = archive_path_for(path.parent)
+        index = read_archive_index(archive_path)
+        if not index or path.name not in index:
+            raise
+        offset, length, _, _ = index[path.name]
+        with open(archive_path, "rb") as f:
+            f.seek(offset)
+            return zlib.decompress(f.read(length))
+
+
+def member_info(path: Path) -> Tuple[int, int]:
+    """
+    文件大小与修改时间（ns），已归档时取归档中的压缩长度与原修改时间
+
+    Raises:
+        FileNotFoundError: 文件与归档成员均不存在
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+    except FileNotFoundError:
+        index = read_archive_index(archive_path_for(path.parent))
+        if not index or path.name not in index:
+            raise
+        _, length, _, mtime_ns = index[path.name]
+        return length, mtime_ns
@@ -0,0 +1,162 @@
+"""
+newsnow 请求客户端
+
+crawl_server 与 mcp_server 共用的 newsnow 请求实现（请求头、连接池会话、主机限速、重试退避）。
+两个服务分别打包，本文件在 crawl_server/core/data/newsnow_client.py 与 mcp_server/utils/newsnow_client.py
+各有一份，内容完全相同，修改时同步两处（只依赖标准库和 requests）。
+
+- HostRateLimiter：单主机请求限速（所有平台共享 newsnow 同一主机）
+- create_http_session：带连接池和 keep-alive 的 requests 会话
+- request_platform_json：请求单个平台并解码响应，失败按退避时间重试
+"""
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
+    "Accept": "*/*",
+    "Referer": "https://newsnow.busiyi.world/",
+    "Connection": "keep-alive",
+    "DNT": "1",
+    "X-Requested-With": "XMLHttpRequest",
+}
+
+API_URL_TEMPLATE = "https://newsnow.busiyi.world/api/s?id={id_value}&latest"
+
+
+class HostRateLimiter:
+    """
+    单主机请求限速器（线程安全）
+
+    所有平台共享 newsnow 同一主机，并发抓取时仍需保证相邻两次请求的
+    发起时间间隔不小于 request_interval（毫秒，带随机抖动），与顺序抓取时的节奏一致。
+    """
+
+    def __init__(self, request_interval: int, min_interval: int = 50):
+        """
+        初始化限速器
+
+        Args:
+            request_interval: 请求间隔（毫秒）
+            min_interval: 抖动后允许的最小间隔（毫秒）
+        """
+        self.request_interval = request_interval
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot: Optional[float] = None
+
+    def _next_interval(self) -> float:
+        """计算下一次请求间隔（秒），保留原有的随机抖动"""
+        actual_interval = self.request_interval + random.randint(-10, 20)
+        actual_interval = max(self.min_interval, actual_interval)
+        return actual_interval / 1000
+
+    def reserve(self) -> float:
+        """
+        预约下一个请求时间槽
+
+        Returns:
+            需要等待的秒数（0 表示可立即发起请求）
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._next_slot is None or self._next_slot <= now:
+                slot = now
+            else:
+                slot = self._next_slot
+            self._next_slot = slot + self._next_interval()
+            return slot - now
+
+    def acquire(self) -> None:
+        """阻塞直到可以发起下一次请求"""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+def create_http_session(pool_size: int = 10) -> requests.Session:
+    """创建带连接池（keep-alive）和默认请求头的 requests 会话"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def calculate_retry_wait(retries: int, min_retry_wait: float, max_retry_wait: float) -> float:
+    """计算第 retries 次重试前的等待时间（秒）"""
+    base_wait = random.uniform(min_retry_wait, max_retry_wait)
+    additional_wait = (retries - 1) * random.uniform(1, 2)
+    return base_wait + additional_wait
+
+
+def check_response_status(data_json: Dict) -> str:
+    """校验 newsnow 响应状态，返回状态描述，异常状态抛出 ValueError"""
+    status = data_json.get("status", "未知")
+    if status not in ["success", "cache"]:
+        raise ValueError(f"响应状态异常: {status}")
+    return "最新数据" if status == "success" else "缓存数据"
+
+
+def request_platform_json(
+    session: requests.Session,
+    id_value: str,
+    max_retries: int = 2,
+    min_retry_wait: float = 3,
+    max_retry_wait: float = 5,
+    rate_limiter: Optional[HostRateLimiter] = None,
+    proxies: Optional[Dict[str, str]] = None,
+    allow_retry: Optional[Callable[[float], bool]] = None,
+    loads: Callable[[bytes], Any] = json.loads,
+) -> Optional[Dict]:
+    """
+    请求单个平台并解码响应（响应只解码一次），失败时按退避时间重试
+
+    Args:
+        session: requests 会话
+        id_value: 平台ID
+        max_retries: 最大重试次数
+        min_retry_wait: 最小重试等待（秒）
+        max_retry_wait: 最大重试等待（秒）
+        rate_limiter: 主机限速器（每次请求前获取时间槽，包括重试）
+        proxies: 代理配置
+        allow_retry: 重试前调用，参数为等待秒数，返回 False 时不再重试（如重试预算已用尽）
+        loads: 响应解码函数
+
+    Returns:
+        解码后的响应数据，失败返回 None
+    """
+    url = API_URL_TEMPLATE.format(id_value=id_value)
+    retries = 0
+    while retries <= max_retries:
+        try:
+            if rate_limiter:
+                rate_limiter.acquire()
+            response = session.get(url, proxies=proxies, timeout=10)
+            response.raise_for_status()
+
+            data_json = loads(response.content)
+            status_info = check_response_status(data_json)
+            print(f"获取 {id_value} 成功（{status_info}）")
+            return data_json
+
+        except Exception as e:
+            retries += 1
+            if retries <= max_retries:
+                wait_time = calculate_retry_wait(retries, min_retry_wait, max_retry_wait)
+                if allow_retry is None or allow_retry(wait_time):
+                    print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
+                    time.sleep(wait_time)
+                    continue
+                print(f"请求 {id_value} 失败: {e}. 本次抓取重试预算已用尽，不再重试")
+            else:
+                print(f"请求 {id_value} 失败: {e}")
+            return None
+    return None
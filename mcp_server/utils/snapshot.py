@@ -0,0 +1,199 @@
+"""
+快照文件读写
+
+与 crawl_server 的快照存储保持同一格式：快照位于 output/<日期>/txt/，
+按文件后缀区分后端（.txt 纯文本、.txt.gz gzip 压缩、.snap 二进制列式）。写入使用临时文件 + 重命名，
+读取方不会看到写了一半的文件；已归档日期的快照从 txt.pack 中读取
+"""
+import gzip
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .archive import list_members, read_member_bytes
+from .manifest import MANIFEST_FILENAME
+
+# 快照后缀（长后缀在前，优先匹配）
+SNAPSHOT_SUFFIXES = (".txt.gz", ".snap", ".txt")
+
+# 二进制列式快照（格式定义见 crawl_server/core/data/snapshot_binary.py）
+_BINARY_MAGIC = b"NFXS"
+_BINARY_VERSION = 1
+_FLAG_ZLIB = 0x01
+_FLAG_RAW = 0x02
+_HEADER = struct.Struct("<4sBBI")
+_U32 = struct.Struct("<I")
+_FAILED_SECTION_HEADER = "==== 以下ID请求失败 ===="
+
+
+class _BinaryReader:
+    """二进制快照正文顺序读取器"""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def u32(self) -> int:
+        value = _U32.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def u32_array(self, count: int) -> array:
+        values = array("I")
+        values.frombytes(self.data[self.pos:self.pos + count * 4])
+        if sys.byteorder != "little":
+            values.byteswap()
+        self.pos += count * 4
+        return values
+
+    def strings(self) -> List[str]:
+        count = self.u32()
+        offsets = self.u32_array(count + 1)
+        length = self.u32()
+        text = str(self.data[self.pos:self.pos + length], "utf-8")
+        self.pos += length
+        return [text[offsets[i]:offsets[i + 1]] for i in range(count)]
+
+
+def _read_binary(data: bytes) -> Tuple[bool, object]:
+    """解析二进制快照，返回 (是否为原文本, 原文本 或 列读取结果)"""
+    magic, version, flags, length = _HEADER.unpack_from(data, 0)
+    if magic != _BINARY_MAGIC or version != _BINARY_VERSION:
+        raise ValueError("不是有效的二进制快照")
+    body = bytes(data[_HEADER.size:_HEADER.size + length])
+    if flags & _FLAG_ZLIB:
+        body = zlib.decompress(body)
+    if flags & _FLAG_RAW:
+        return True, body.decode("utf-8")
+
+    reader = _BinaryReader(body)
+    reader.u32()
+    platform_ids = reader.strings()
+    platform_names = reader.strings()
+    row_count = reader.u32()
+    row_platform = reader.u32_array(row_count)
+    ranks = reader.u32_array(row_count)
+    titles = reader.strings()
+    urls = reader.strings()
+    mobile_urls = reader.strings()
+    failed_ids = reader.strings()
+    return False, (platform_ids, platform_names, row_platform, ranks, titles, urls, mobile_urls, failed_ids)
+
+
+def _binary_to_text(columns) -> str:
+    """列还原为快照文本"""
+    platform_ids, platform_names, row_platform, ranks, titles, urls, mobile_urls, failed_ids = columns
+    rows_by_platform: List[List[int]] = [[] for _ in platform_ids]
+    for row, platform_index in enumerate(row_platform):
+        rows_by_platform[platform_index].append(row)
+
+    parts = []
+    for platform_index, platform_id in enumerate(platform_ids):
+        name = platform_names[platform_index]
+        parts.append(f"{platform_id} | {name}\n" if name else f"{platform_id}\n")
+        for row in rows_by_platform[platform_index]:
+            line = f"{ranks[row]}. {titles[row]}" if ranks[row] else titles[row]
+            if urls[row]:
+                line += f" [URL:{urls[row]}]"
+            if mobile_urls[row]:
+                line += f" [MOBILE:{mobile_urls[row]}]"
+            parts.append(line + "\n")
+        parts.append("\n")
+
+    if failed_ids:
+        parts.append(f"{_FAILED_SECTION_HEADER}\n")
+        for failed_id in failed_ids:
+            parts.append(f"{failed_id}\n")
+    return "".join(parts)
+
+
+def snapshot_suffix(path) -> Optional[str]:
+    """快照文件的后端后缀，不是快照文件时返回 None"""
+    name = Path(path).name
+    for suffix in SNAPSHOT_SUFFIXES:
+        if name.endswith(suffix):
+            return suffix
+    return None
+
+
+def snapshot_time_label(path) -> str:
+    """快照文件的时间标签（去掉后缀的文件名）"""
+    name = Path(path).name
+    suffix = snapshot_suffix(name)
+    return name[: -len(suffix)] if suffix else Path(name).stem
+
+
+def read_snapshot_text(path) -> str:
+    """读取快照文本"""
+    data = read_member_bytes(path)
+    suffix = snapshot_suffix(path)
+    if suffix == ".snap":
+        is_raw, payload = _read_binary(data)
+        return payload if is_raw else _binary_to_text(payload)
+    if suffix == ".txt.gz":
+        data = gzip.decompress(data)
+    return data.decode("utf-8")
+
+
+def read_snapshot_titles(path) -> Optional[Tuple[Dict, Dict]]:
+    """
+    二进制快照直接解码为 (titles_by_id, id_to_name)
+
+    文本快照或保存原文本的二进制快照返回 None，由调用方解析文本
+    """
+    if snapshot_suffix(path) != ".snap":
+        return None
+    is_raw, payload = _read_binary(read_member_bytes(path))
+    if is_raw:
+        return None
+
+    platform_ids, platform_names, row_platform, ranks, titles, urls, mobile_urls, _ = payload
+    titles_by_id: Dict[str, Dict] = {}
+    id_to_name: Dict[str, str] = {}
+    for row, platform_index in enumerate(row_platform):
+        platform_id = platform_ids[platform_index]
+        platform_titles = titles_by_id.get(platform_id)
+        if platform_titles is None:
+            platform_titles = titles_by_id[platform_id] = {}
+            id_to_name[platform_id] = platform_names[platform_index] or platform_id
+        platform_titles[titles[row]] = {
+            "ranks": [ranks[row] or 1],
+            "url": urls[row],
+            "mobileUrl": mobile_urls[row],
+        }
+    return titles_by_id, id_to_name
+
+
+def list_snapshot_files(txt_dir: Path) -> List[Path]:
+    """列出快照目录下的快照文件（含已归档的快照，按时间标签排序）"""
+    files = list_members(txt_dir, lambda name: snapshot_suffix(name) is not None)
+    files.sort(key=lambda p: (snapshot_time_label(p), p.name))
+    return files
+
+
+def write_file_atomic(path: Path, content: str) -> None:
+    """原子写入文本文件（临时文件 + 重命名）"""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def write_snapshot(path: Path, content: str) -> None:
+    """
+    原子写入快照，并使当天与根目录的清单失效
+
+    清单由 crawl_server 维护，这里不重复实现写入逻辑：删除后由 crawl_server 下次访问时
+    从目录重建，其间读取方回退为遍历目录
+    """
+    write_file_atomic(path, content)
+    day_dir = path.parent.parent
+    for manifest_path in (day_dir / MANIFEST_FILENAME, day_dir.parent / MANIFEST_FILENAME):
+        try:
+            os.remove(manifest_path)
+        except OSError:
+            pass
@@ -0,0 +1,53 @@
+"""
+历史检索控制器
+
+查询本地历史库（output/history.db）的 JSON 接口
+"""
+from typing import Optional
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+
+from ..models.history_model import HistoryModel
+
+router = APIRouter(prefix="/api/history", tags=["history"])
+
+_history_model = HistoryModel()
+
+
+def _unavailable() -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"success": False, "error": "本地历史库不可用（需在 crawl_server 中开启 HISTORY_DB_ENABLED）"}
+    )
+
+
+@router.get("/days")
+async def list_days():
+    """列出历史库中的日期及快照数"""
+    days = _history_model.list_days()
+    if days is None:
+        return _unavailable()
+    return {"success": True, "days": days}
+
+
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, description="关键词"),
+    start: Optional[str] = Query(None, description="开始日期 YYYYMMDD"),
+    end: Optional[str] = Query(None, description="结束日期 YYYYMMDD"),
+    platforms: Optional[str] = Query(None, description="平台ID，逗号分隔"),
+    limit: int = Query(50, ge=1, le=1000),
+):
+    """按关键词与日期范围检索标题
+    
+    示例：/api/history/search?q=人工智能&start=20251101&end=20251126&platforms=weibo,zhihu
+    """
+    keyword = q.strip()
+    if not keyword:
+        # 只含空白的关键词会匹配所有标题
+        return JSONResponse(status_code=400, content={"success": False, "error": "关键词不能为空"})
+    platform_ids = [p.strip() for p in platforms.split(",") if p.strip()] if platforms else None
+    results = _history_model.search(keyword, start, end, platform_ids, limit)
+    if results is None:
+        return _unavailable()
+    return {"success": True, "total": len(results), "results": results}
@@ -8,7 +8,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import config
-from .controllers import root_controller, health_controller, report_controller
+from .controllers import root_controller, health_controller, report_controller, history_controller
 
 
 def _load_version():
@@ -47,6 +47,7 @@ def create_app() -> FastAPI:
     app.include_router(root_controller.router)
     app.include_router(health_controller.router)
     app.include_router(report_controller.router)
+    app.include_router(history_controller.router)
     
     return app
 
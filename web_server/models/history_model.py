@@ -0,0 +1,143 @@
+"""
+历史检索模型
+
+只读查询 crawl_server 写入的本地历史库 output/history.db（SQLite，HISTORY_DB_ENABLED 开启时生成），
+按关键词与日期范围检索标题
+"""
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..config import config
+
+HISTORY_DB_FILENAME = "history.db"
+HISTORY_SCHEMA_VERSION = 1
+
+
+class HistoryModel:
+    """历史检索模型"""
+    
+    def __init__(self, output_dir: Optional[str] = None):
+        self.db_path = Path(output_dir or config.output_path) / HISTORY_DB_FILENAME
+    
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """只读打开历史库，不存在或版本不符时返回 None"""
+        if not self.db_path.exists():
+            return None
+        try:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=10)
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.Error:
+            return None
+        if meta.get("schema_version") != str(HISTORY_SCHEMA_VERSION):
+            conn.close()
+            return None
+        return conn
+    
+    @staticmethod
+    def _format_date(date_str: Optional[str]) -> Optional[str]:
+        """YYYYMMDD 转为 YYYY-MM-DD，格式无效时返回 None"""
+        if not date_str or len(date_str) != 8 or not date_str.isdigit():
+            return None
+        return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
+    
+    def list_days(self) -> Optional[List[Dict]]:
+        """历史库中的日期及快照数，历史库不可用时返回 None"""
+        conn = self._connect()
+        if conn is None:
+            return None
+        with closing(conn):
+            rows = conn.execute("SELECT date, COUNT(*) FROM snapshots GROUP BY date ORDER BY date DESC")
+            return [{"date": date, "snapshot_count": count} for date, count in rows]
+    
+    def search(
+        self,
+        keyword: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        platforms: Optional[List[str]] = None,
+        limit: int = 50
+    ) -> Optional[List[Dict]]:
+        """按关键词检索标题（不区分大小写的子串匹配）
+        
+        Args:
+            keyword: 关键词
+            start_date: 开始日期 YYYYMMDD（可选）
+            end_date: 结束日期 YYYYMMDD（可选）
+            platforms: 平台ID列表（可选）
+            limit: 返回条数
+        
+        Returns:
+            每天每条标题一项（出现次数、排名、首次/末次出现时间），按日期倒序、出现次数降序；
+            历史库不可用时返回 None
+        """
+        conn = self._connect()
+        if conn is None:
+            return None
+        
+        with closing(conn):
+            fts_row = conn.execute("SELECT value FROM meta WHERE key = 'fts'").fetchone()
+            if fts_row and fts_row[0] == "1" and len(keyword) >= 3:
+                candidate_sql = "SELECT rowid FROM titles_fts WHERE titles_fts MATCH ?"
+                args: List = ['"' + keyword.replace('"', '""') + '"']
+            else:
+                candidate_sql = "SELECT id FROM titles WHERE title LIKE ? ESCAPE '\\'"
+                escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                args = [f"%{escaped}%"]
+            
+            where = [f"t.id IN ({candidate_sql})"]
+            start = self._format_date(start_date)
+            end = self._format_date(end_date)
+            if start:
+                where.append("s.date >= ?")
+                args.append(start)
+            if end:
+                where.append("s.date <= ?")
+                args.append(end)
+            if platforms:
+                where.append(f"t.platform_id IN ({','.join('?' * len(platforms))})")
+                args.extend(platforms)
+            
+            # 按 (日期, 标题, 快照时间, 序号) 读取观测记录，在 Python 中按天合并排名（保证排名按时间排列）
+            rows = conn.execute(
+                "SELECT s.date, t.id, t.platform_id, COALESCE(p.name, t.platform_id), t.title,"
+                " COALESCE(o.url, t.url), COALESCE(o.mobile_url, t.mobile_url),"
+                " s.time, o.rank"
+                " FROM titles t"
+                " JOIN observations o ON o.title_id = t.id"
+                " JOIN snapshots s ON s.id = o.snapshot_id"
+                " LEFT JOIN platforms p ON p.id = t.platform_id"
+                f" WHERE {' AND '.join(where)}"
+                " ORDER BY s.date, t.id, s.time, o.seq",
+                args,
+            )
+            
+            keyword_lower = keyword.lower()
+            merged: Dict[Tuple[str, int], Dict] = {}
+            for date, title_id, platform_id, platform_name, title, url, mobile_url, time, rank in rows:
+                item = merged.get((date, title_id))
+                if item is None:
+                    if keyword_lower not in title.lower():
+                        continue
+                    merged[(date, title_id)] = {
+                        "date": date,
+                        "platform": platform_id,
+                        "platform_name": platform_name,
+                        "title": title,
+                        "url": url,
+                        "mobileUrl": mobile_url,
+                        "ranks": [rank],
+                        "count": 1,
+                        "first_time": time,
+                        "last_time": time,
+                    }
+                else:
+                    item["ranks"].append(rank)
+                    item["count"] += 1
+                    item["last_time"] = time
+            
+            # 按日期倒序、出现次数降序（同日同次数保持标题顺序）
+            results = sorted(merged.values(), key=lambda item: item["count"], reverse=True)
+            results.sort(key=lambda item: item["date"], reverse=True)
+            return results[:limit]
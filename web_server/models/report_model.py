@@ -10,6 +10,8 @@ from typing import Optional
 from datetime import datetime
 
 from ..config import config
+from ..utils.archive import archive_path_for, list_members, member_exists, member_info, read_member_bytes
+from ..utils.manifest import read_day_manifest, read_root_manifest
 
 
 class ReportModel:
@@ -51,32 +53,43 @@ class ReportModel:
         minute = time_str[2:]
         filename = f"{hour}时{minute}分.html"
         
+        # 优先查根清单中该文件名最近一次出现的日期
+        root_manifest = read_root_manifest(self.output_dir)
+        if root_manifest is not None:
+            known = root_manifest.get("reports_by_name", {}).get(filename)
+            if not known:
+                return None
+            return self._read_report(self.output_dir / known["date_folder"] / "html" / filename)
+        
         target_file = None
         latest_mtime = 0
         
-        # 遍历所有日期目录
+        # 无清单时遍历所有日期目录
         for date_dir in self.output_dir.iterdir():
             if not date_dir.is_dir():
                 continue
             
-            html_dir = date_dir / "html"
-            if not html_dir.exists():
-                continue
-            
-            file_path = html_dir / filename
-            if file_path.exists():
-                mtime = file_path.stat().st_mtime
+            file_path = date_dir / "html" / filename
+            if member_exists(file_path):
+                mtime = member_info(file_path)[1]
                 # 如果有多个同名文件，返回最新的
                 if mtime > latest_mtime:
                     latest_mtime = mtime
                     target_file = file_path
         
-        if target_file and target_file.exists():
-            with open(target_file, "r", encoding="utf-8") as f:
-                return f.read()
+        if target_file:
+            return self._read_report(target_file)
         
         return None
     
+    @staticmethod
+    def _read_report(file_path: Path) -> Optional[str]:
+        """读取报告文件（已归档日期从 html.pack 中读取），不存在时返回 None"""
+        try:
+            return read_member_bytes(file_path).decode("utf-8")
+        except FileNotFoundError:
+            return None
+    
     def get_error_page(self) -> str:
         """获取 404 错误页面内容（保底方案）
         
@@ -136,12 +149,7 @@ class ReportModel:
         if not date_dir.exists():
             return None
         
-        summary_file = date_dir / "html" / "当日汇总.html"
-        if summary_file.exists():
-            with open(summary_file, "r", encoding="utf-8") as f:
-                return f.read()
-        
-        return None
+        return self._read_report(date_dir / "html" / "当日汇总.html")
     
     def get_report_by_date_and_time(self, date_str: str, time_str: str) -> Optional[str]:
         """根据日期和时间获取报告
@@ -162,7 +170,7 @@ class ReportModel:
             return None
         
         html_dir = date_dir / "html"
-        if not html_dir.exists():
+        if not html_dir.exists() and not archive_path_for(html_dir).exists():
             return None
         
         # 处理时间格式
@@ -178,12 +186,7 @@ class ReportModel:
         else:
             return None
         
-        file_path = html_dir / filename
-        if file_path.exists():
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
-        
-        return None
+        return self._read_report(html_dir / filename)
     
     def list_date_files(self, date_str: str) -> Optional[dict]:
         """列出指定日期目录下的文件
@@ -209,18 +212,38 @@ class ReportModel:
         if not date_dir.exists():
             return None
         
+        day_manifest = read_day_manifest(self.output_dir, date_folder)
+        if day_manifest is not None:
+            reports = sorted(
+                day_manifest.get("reports", {}).items(), key=lambda x: x[1]["mtime"], reverse=True
+            )
+            return {
+                "date_folder": date_folder,
+                "html_files": [
+                    {
+                        "name": name,
+                        "path": f"/report/{date_str}/{name}",
+                        "size": entry["bytes"],
+                        "mtime": datetime.fromtimestamp(entry["mtime"]).strftime("%Y-%m-%d %H:%M:%S")
+                    }
+                    for name, entry in reports
+                ]
+            }
+        
+        # 无清单时列出目录（含已归档的报告）
         html_dir = date_dir / "html"
-        if not html_dir.exists():
-            return {"date_folder": date_folder, "html_files": []}
+        files = [
+            (file_path, *member_info(file_path))
+            for file_path in list_members(html_dir, lambda name: name.endswith(".html"))
+        ]
         
         html_files = []
-        for file_path in sorted(html_dir.glob("*.html"), key=lambda x: x.stat().st_mtime, reverse=True):
-            stat = file_path.stat()
+        for file_path, size, mtime_ns in sorted(files, key=lambda x: x[2], reverse=True):
             html_files.append({
                 "name": file_path.name,
                 "path": f"/report/{date_str}/{file_path.name}",
-                "size": stat.st_size,
-                "mtime": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+                "size": size,
+                "mtime": datetime.fromtimestamp(mtime_ns / 1e9).strftime("%Y-%m-%d %H:%M:%S")
             })
         
         return {
@@ -243,6 +266,20 @@ class ReportModel:
         if not self.output_dir.exists():
             return []
         
+        root_manifest = read_root_manifest(self.output_dir)
+        if root_manifest is not None:
+            directories = [
+                {
+                    "date_folder": date_folder,
+                    "date_str": day["date_str"],
+                    "url": f"/report/{day['date_str']}",
+                    "mtime": day["updated_at"]
+                }
+                for date_folder, day in root_manifest.get("days", {}).items()
+            ]
+            directories.sort(key=lambda x: x["mtime"], reverse=True)
+            return directories
+        
         directories = []
         for item in self.output_dir.iterdir():
             if not item.is_dir():
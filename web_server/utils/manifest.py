@@ -0,0 +1,33 @@
+"""
+输出目录清单读取
+
+读取 crawl_server 写入的 output/manifest.json 与 output/<日期>/manifest.json，
+清单缺失或版本不符时返回 None，由调用方回退为遍历目录
+"""
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+
+
+def _read_manifest(path: Path) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+    return data
+
+
+def read_root_manifest(output_dir: Path) -> Optional[Dict]:
+    """读取根清单（按日期汇总）"""
+    return _read_manifest(Path(output_dir) / MANIFEST_FILENAME)
+
+
+def read_day_manifest(output_dir: Path, date_folder: str) -> Optional[Dict]:
+    """读取某天的清单（快照与报告）"""
+    return _read_manifest(Path(output_dir) / date_folder / MANIFEST_FILENAME)